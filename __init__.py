@@ -1,10 +0,0 @@
-# __init__.py
-"""
-Resolution Theorem Prover Package
-"""
-
-from .clause import Term, Literal, Clause
-from .unification import Unifier
-from .resolution import ResolutionProver
-
-__all__ = ['Term', 'Literal', 'Clause', 'Unifier', 'ResolutionProver']
\ No newline at end of file
@@ -0,0 +1,33 @@
+# answers.py
+"""
+回答文字
+目标子句可以带一个正的 $answer(x, ...) 文字，例如要找出所有既是海关官员又是毒贩的 x：
+    goal: ~CustomsOfficial(x) | ~DrugDealer(x) | $answer(x)
+$answer 不与任何文字归结，归结式只剩回答文字时就得到了一个回答：其中的项是 x 的一个绑定。
+只有一个回答文字的是确定回答；有多个回答文字的是析取回答（其中至少一个成立）
+"""
+
+from clause import Clause
+
+
+ANSWER_PREDICATE = '$answer'
+
+
+def answer_literals(clause):
+    """子句中的回答文字"""
+    return [literal for literal in clause.literals if literal.predicate == ANSWER_PREDICATE]
+
+
+def answer_names(literal):
+    """回答文字中各参数的名字（变量名，或非变量项的字符串形式），用作回答绑定的键"""
+    return [term.name if term.is_variable else str(term) for term in literal.terms]
+
+
+def is_answer_clause(literals):
+    """文字列表是否只剩回答文字"""
+    return bool(literals) and all(literal.predicate == ANSWER_PREDICATE for literal in literals)
+
+
+def answer_key(literals):
+    """回答的去重键：变量按出现顺序重命名后的文字集合（与变量名无关）"""
+    return frozenset(Clause(list(literals)).standardize_variables({'x': 0}).literals)
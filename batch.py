@@ -0,0 +1,145 @@
+# batch.py
+"""
+非交互批量运行
+在进程池中并行运行内置问题或子句文件，每个问题输出一行JSON结果
+"""
+
+import json
+import os
+import re
+import sys
+import time
+from budget import Budget
+from checkpoint import Checkpoint
+from clause_parser import load_clauses
+from problems import get_all_problems
+from relevance import RelevanceFilter
+from resolution import ResolutionProver
+
+
+def make_jobs(problem_ids=None, input_files=None):
+    """
+    根据问题ID和子句文件生成任务列表
+    问题ID 'all' 表示所有内置问题
+    """
+    problems = get_all_problems()
+    jobs = []
+    for problem_id in problem_ids or []:
+        if problem_id == 'all':
+            jobs.extend({'problem': pid, 'kind': 'builtin'} for pid in problems)
+        elif problem_id in problems:
+            jobs.append({'problem': problem_id, 'kind': 'builtin'})
+        else:
+            raise ValueError(f"未知问题: {problem_id}")
+    for filename in input_files or []:
+        jobs.append({'problem': filename, 'kind': 'file'})
+    return jobs
+
+
+def load_job_clauses(job):
+    """加载任务的子句"""
+    if job['kind'] == 'file':
+        return load_clauses(job['problem'])
+    return get_all_problems()[job['problem']]['builder']()
+
+
+def checkpoint_path(directory, job):
+    """任务的检查点文件路径：<目录>/<类型>-<问题名>.ckpt"""
+    name = re.sub(r'[^\w.-]', '_', os.path.basename(job['problem']))
+    return os.path.join(directory, f"{job['kind']}-{name}.ckpt")
+
+
+def run_job(job, settings):
+    """
+    在工作进程中运行单个任务
+    参数: settings 包含 selection, set_of_support, max_steps, tautology_mode, pair_filter, preprocess, horn, split, engine,
+          sorts, relevance, instrument、budget 和 checkpoint（{'directory', 'interval', 'resume'}）配置；resume 时从已有的检查点继续
+    返回: 可JSON序列化的结果字典
+    """
+    start_time = time.time()
+    record = {'problem': job['problem'], 'kind': job['kind']}
+    try:
+        checkpoint = settings.get('checkpoint')
+        path = checkpoint_path(checkpoint['directory'], job) if checkpoint else None
+        resume = path is not None and checkpoint.get('resume') and os.path.exists(path)
+        prover = ResolutionProver()
+        if resume:
+            # 检查点中已经有子句集和搜索配置，命令行给出的选项（例如更大的 max_steps）覆盖它们
+            prover.load_checkpoint(path)
+            record['resumed'] = True
+        prover.configure(
+            selection=settings.get('selection'),
+            set_of_support=settings.get('set_of_support'),
+            max_steps=settings.get('max_steps'),
+            tautology_mode=settings.get('tautology_mode'),
+            pair_filter=settings.get('pair_filter'),
+            preprocess=settings.get('preprocess') or None,
+            horn=settings.get('horn'),
+            splitting=settings.get('split') or None,
+            engine=settings.get('engine'),
+            sorts=settings.get('sorts') or None,
+            relevance=RelevanceFilter(**settings['relevance']) if settings.get('relevance') else None,
+            checkpoint=Checkpoint(path, checkpoint.get('interval')) if path is not None else None
+        )
+        prover.instrument = settings.get('instrument', False)
+        if not resume:
+            for clause in load_job_clauses(job):
+                prover.add_clause(clause)
+
+        budget_settings = settings.get('budget') or {}
+        budget = Budget(**budget_settings) if any(v is not None for v in budget_settings.values()) else None
+        result = prover.two_pointer_resolution(budget)
+        record.update(result.to_dict())
+        if prover.answer_names is not None:
+            record['answers'] = [{name: str(term) for name, term in answer.items()} for answer in prover.answers]
+    except Exception as e:
+        record.update({
+            'status': 'error',
+            'proved': False,
+            'reason': f"{type(e).__name__}: {e}",
+            'statistics': {}
+        })
+    record['wall_time'] = time.time() - start_time
+    return record
+
+
+def run_batch(jobs, settings, workers=None, output=None):
+    """
+    在进程池中并行运行任务，每完成一个任务立即写出一行JSON
+    参数: output 可写的文本流（默认标准输出）
+    返回: 结果字典列表（按完成顺序）
+    """
+    output = output if output is not None else sys.stdout
+    workers = workers or os.cpu_count() or 1
+    records = []
+
+    if workers == 1 or len(jobs) <= 1:
+        # 单个任务时不启动进程池
+        completed = (run_job(job, settings) for job in jobs)
+        for record in completed:
+            _emit(record, output)
+            records.append(record)
+        return records
+
+    import concurrent.futures
+
+    with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(run_job, job, settings) for job in jobs]
+        for future in concurrent.futures.as_completed(futures):
+            record = future.result()
+            _emit(record, output)
+            records.append(record)
+    return records
+
+
+def summarize(records):
+    """统计批量运行结果：{状态: 数量}"""
+    summary = {}
+    for record in records:
+        summary[record['status']] = summary.get(record['status'], 0) + 1
+    return summary
+
+
+def _emit(record, output):
+    output.write(json.dumps(record, ensure_ascii=False) + "\n")
+    output.flush()
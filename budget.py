@@ -0,0 +1,96 @@
+# budget.py
+"""
+推理资源预算
+限制墙钟时间、常驻内存和存活子句数，超出预算或被取消时由证明器返回 unknown 结果
+"""
+
+import os
+import time
+
+try:
+    import resource
+except ImportError:  # Windows 没有 resource 模块
+    resource = None
+
+
+def current_memory_usage():
+    """
+    获取当前进程的常驻内存（字节）
+    返回: 内存字节数，无法获取时返回 None
+    """
+    # Linux 下读取 /proc 得到当前 RSS
+    try:
+        with open('/proc/self/statm') as f:
+            pages = int(f.read().split()[1])
+        return pages * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError, AttributeError):
+        pass
+
+    # 其他类Unix系统只能拿到峰值RSS（macOS单位是字节，Linux是KB）
+    if resource is not None:
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if os.uname().sysname == 'Darwin' else peak * 1024
+
+    return None
+
+
+class Budget:
+    """推理资源预算（墙钟时间、常驻内存、存活子句数）"""
+
+    def __init__(self, time_limit=None, memory_limit=None, max_clauses=None,
+                 check_interval=64, memory_check_interval=16):
+        self.time_limit = time_limit  # 墙钟时间上限（秒）
+        self.memory_limit = memory_limit  # 常驻内存上限（字节）
+        self.max_clauses = max_clauses  # 存活子句数上限
+        self.check_interval = check_interval  # 每检查多少个子句对做一次时间检查
+        self.memory_check_interval = memory_check_interval  # 每多少次时间检查做一次内存检查
+        self.deadline = None
+        self.peak_memory = None
+        self.cancelled = False  # 由其他线程调用 cancel() 设置，推理在下一次预算检查时停止
+        self._checks = 0
+
+    def start(self):
+        """开始计时，在每次推理开始时调用"""
+        self.deadline = time.monotonic() + self.time_limit if self.time_limit is not None else None
+        self.peak_memory = None
+        self._checks = 0
+
+    def cancel(self):
+        """请求停止使用此预算的推理（线程安全，可以在推理开始前调用）"""
+        self.cancelled = True
+
+    def exceeded(self, live_clauses):
+        """
+        检查是否超出预算
+        返回: 超出的预算名称 ('cancelled', 'time', 'memory', 'clauses')，未超出返回 None
+        """
+        if self.cancelled:
+            return 'cancelled'
+
+        if self.max_clauses is not None and live_clauses > self.max_clauses:
+            return 'clauses'
+
+        if self.deadline is not None and time.monotonic() >= self.deadline:
+            return 'time'
+
+        if self.memory_limit is not None:
+            # 读取内存代价较高，只在部分检查中进行
+            if self._checks % self.memory_check_interval == 0:
+                usage = current_memory_usage()
+                if usage is not None:
+                    if self.peak_memory is None or usage > self.peak_memory:
+                        self.peak_memory = usage
+                    if usage > self.memory_limit:
+                        self._checks += 1
+                        return 'memory'
+            self._checks += 1
+
+        return None
+
+    def to_dict(self):
+        """导出预算配置"""
+        return {
+            'time_limit': self.time_limit,
+            'memory_limit': self.memory_limit,
+            'max_clauses': self.max_clauses
+        }
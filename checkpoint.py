@@ -0,0 +1,80 @@
+# checkpoint.py
+"""
+饱和搜索状态的检查点
+长时间的推理达到 max_steps、超出预算或进程被终止时，已经做过的工作不必丢弃：
+推理过程中定期（以及因步数或预算停止时）把完整的搜索状态写入压缩文件——子句集、本轮的新子句、
+去重集合、支持集、变量编号、计数器、回答、重写规则和当前迭代中的子句对位置；
+之后可以在同一台或另一台机器上用更大的预算恢复，继续同一次搜索而不是从头开始。
+索引和预筛选签名不保存，恢复时由子句重建。
+
+文件格式: MAGIC + zlib 压缩的 pickle（协议 4）。pickle 可以执行任意代码，只加载自己写出的检查点
+"""
+
+import os
+import pickle
+import time
+import zlib
+
+
+MAGIC = b'RPCK'
+FORMAT_VERSION = 2
+PICKLE_PROTOCOL = 4  # Python 3.4+ 都能读取，检查点可以在其他机器上恢复
+
+
+def read_checkpoint(path):
+    """
+    读取检查点文件
+    返回: 搜索状态字典；文件格式或版本不符时抛出 ValueError
+    """
+    with open(path, 'rb') as handle:
+        data = handle.read()
+    if not data.startswith(MAGIC):
+        raise ValueError(f"不是检查点文件: {path}")
+    state = pickle.loads(zlib.decompress(data[len(MAGIC):]))
+    if state.get('version') != FORMAT_VERSION:
+        raise ValueError(f"不支持的检查点版本: {state.get('version')}")
+    return state
+
+
+class Checkpoint:
+    """检查点文件和写入周期"""
+
+    PAIR_INTERVAL = 1024  # 迭代内每检查多少个子句对查看一次是否到了写入时间
+
+    def __init__(self, path, interval=60.0, level=6):
+        self.path = path
+        self.interval = interval  # 定期写入的间隔（秒），None 表示只在因步数或预算停止时写入
+        self.level = level  # zlib 压缩级别
+        self.last_write = None
+        self.statistics = {'checkpoint_writes': 0, 'checkpoint_bytes': 0, 'checkpoint_time': 0.0}
+
+    def start(self):
+        """开始计时，在每次推理开始时调用"""
+        self.last_write = time.monotonic()
+
+    def due(self):
+        """距离上次写入是否已经超过间隔"""
+        return self.interval is not None and time.monotonic() - self.last_write >= self.interval
+
+    def write(self, state):
+        """
+        写入搜索状态：先写临时文件再替换，写入过程中被终止也不会损坏已有的检查点
+        返回: 写入的字节数
+        """
+        start_time = time.perf_counter()
+        state = dict(state, version=FORMAT_VERSION)
+        data = MAGIC + zlib.compress(pickle.dumps(state, PICKLE_PROTOCOL), self.level)
+        temporary = f"{self.path}.tmp"
+        with open(temporary, 'wb') as handle:
+            handle.write(data)
+        os.replace(temporary, self.path)
+
+        self.last_write = time.monotonic()
+        self.statistics['checkpoint_writes'] += 1
+        self.statistics['checkpoint_bytes'] = len(data)
+        self.statistics['checkpoint_time'] += time.perf_counter() - start_time
+        return len(data)
+
+    def get_statistics(self):
+        """写入次数、最近一次的文件大小和累计写入耗时"""
+        return dict(self.statistics)
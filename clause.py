@@ -5,6 +5,7 @@ class Term:
         self.name = name
         self.is_variable = is_variable
         self.args = args if args is not None else []  # 函数参数
+        self._hash = None  # 缓存的哈希值（项创建后不再修改）
 
     def __str__(self):
         if self.args:
@@ -12,19 +13,31 @@ class Term:
         return self.name
 
     def __eq__(self, other):
+        if self is other:
+            return True
         if not isinstance(other, Term):
             return False
         return (self.name == other.name and
                 self.is_variable == other.is_variable and
+                hash(self) == hash(other) and
                 self.args == other.args)
 
     def __hash__(self):
-        """添加hash方法，使Term可哈希"""
-        return hash((
-            self.name,
-            self.is_variable,
-            tuple(self.args)  # 将args列表转换为元组
-        ))
+        """添加hash方法，使Term可哈希（结果缓存，重复查找不再递归计算）"""
+        if self._hash is None:
+            self._hash = hash((
+                self.name,
+                self.is_variable,
+                tuple(self.args)  # 将args列表转换为元组
+            ))
+        return self._hash
+
+    def __reduce__(self):
+        """
+        序列化为扁平的前序符号序列：深层嵌套的项不会超过 pickle 的递归深度，
+        也不保存哈希缓存（其他进程的字符串哈希种子可能不同）
+        """
+        return _build_term, (_flatten_term(self),)
 
     def copy(self):
         """创建项的深拷贝"""
@@ -47,6 +60,7 @@ class Literal:
         self.predicate = predicate  # 谓词名称
         self.terms = terms  # 参数列表
         self.negated = negated  # 是否为否定
+        self._atom = None  # 缓存的原子键（谓词, 参数元组），与符号无关
 
     def __str__(self):
         sign = "¬" if self.negated else ""
@@ -54,19 +68,28 @@ class Literal:
         return f"{sign}{self.predicate}({terms_str})"
 
     def __eq__(self, other):
+        if self is other:
+            return True
         if not isinstance(other, Literal):
             return False
-        return (self.predicate == other.predicate and
-                self.terms == other.terms and
-                self.negated == other.negated)
+        return (self.negated == other.negated and
+                self.atom() == other.atom())
 
     def __hash__(self):
         """添加hash方法，使Literal可哈希"""
-        return hash((
-            self.predicate,
-            tuple(self.terms),  # 将terms列表转换为元组
-            self.negated
-        ))
+        return hash((self.atom(), self.negated))
+
+    def atom(self):
+        """原子键 (谓词, 参数元组)，用于不区分符号的哈希查找"""
+        if self._atom is None:
+            self._atom = (self.predicate, tuple(self.terms))
+        return self._atom
+
+    def __getstate__(self):
+        """序列化时不保存原子键缓存（其中的项哈希会在接收进程中重新计算）"""
+        state = self.__dict__.copy()
+        state['_atom'] = None
+        return state
 
     def copy(self):
         """创建文字的深拷贝"""
@@ -86,6 +109,7 @@ class Clause:
         self.literals = literals if literals is not None else []
         self.source = source  # 记录来源，用于追踪推理过程
         self.id = id(self)  # 唯一标识符
+        self._variables = None  # 缓存的变量名集合
 
     def __str__(self):
         if not self.literals:
@@ -106,11 +130,29 @@ class Clause:
         """检查是否为空子句"""
         return len(self.literals) == 0
 
+    def variables(self):
+        """子句中出现的变量名集合（结果缓存）"""
+        if self._variables is None:
+            names = set()
+            for literal in self.literals:
+                for term in literal.terms:
+                    _collect_variables(term, names)
+            self._variables = frozenset(names)
+        return self._variables
+
     def standardize_variables(self, counter=None):
-        """标准化变量（修复版本）- 自动保留常量"""
+        """
+        标准化变量：变量按出现顺序重命名为 v{n}，n 从 counter['x'] 开始递增
+        传入共享的 counter 可以让不同子句的变量互不相交；常量和不含变量的项直接共享
+        重复的文字只保留第一个
+        """
         if counter is None:
             counter = {'x': 0}
 
+        # 不含变量的子句无需重建
+        if not self.variables():
+            return Clause(list(dict.fromkeys(self.literals)), self.source)
+
         # 创建变量映射表
         var_mapping = {}
         new_literals = []
@@ -121,7 +163,20 @@ class Clause:
                 new_terms.append(self._standardize_term(term, var_mapping, counter))
             new_literals.append(Literal(literal.predicate, new_terms, literal.negated))
 
-        return Clause(new_literals, self.source)
+        return Clause(list(dict.fromkeys(new_literals)), self.source)
+
+    def rename_apart(self, counter):
+        """
+        返回变量重命名为新编号后的文字列表（不创建新子句）
+        用于合一时把与另一子句共享变量名的子句临时分开
+        """
+        var_mapping = {}
+        return [
+            Literal(literal.predicate,
+                    [self._standardize_term(term, var_mapping, counter) for term in literal.terms],
+                    literal.negated)
+            for literal in self.literals
+        ]
 
     def _standardize_term(self, term, var_mapping, counter):
         """标准化单个项 - 自动保留常量"""
@@ -133,9 +188,39 @@ class Clause:
                 var_mapping[term.name] = Term(new_name, is_variable=True)
             return var_mapping[term.name]
         elif term.args:
-            # 递归处理函数参数
+            # 递归处理函数参数，参数没有变化时共享原项
             new_args = [self._standardize_term(arg, var_mapping, counter) for arg in term.args]
+            if all(new is old for new, old in zip(new_args, term.args)):
+                return term
             return Term(term.name, False, new_args)
         else:
-            # 常量和函数符号保持不变
-            return term.copy()
\ No newline at end of file
+            # 常量和函数符号保持不变（项不会被修改，直接共享）
+            return term
+
+
+def _collect_variables(term, names):
+    """收集项中的变量名"""
+    if term.is_variable:
+        names.add(term.name)
+    for arg in term.args:
+        _collect_variables(arg, names)
+
+
+def _flatten_term(term):
+    """项的前序符号序列 [(名称, 是否变量, 参数个数)]（非递归）"""
+    symbols = []
+    stack = [term]
+    while stack:
+        t = stack.pop()
+        symbols.append((t.name, t.is_variable, len(t.args)))
+        stack.extend(reversed(t.args))
+    return symbols
+
+
+def _build_term(symbols):
+    """从前序符号序列重建项（非递归）"""
+    stack = []
+    for name, is_variable, arity in reversed(symbols):
+        args = [stack.pop() for _ in range(arity)]
+        stack.append(Term(name, is_variable, args))
+    return stack[0]
@@ -0,0 +1,123 @@
+# clause_parser.py
+"""
+子句文件解析
+每行一个子句，格式与 Clause 的输出一致，例如:
+    ¬Hound(x) ∨ Howl(x)
+    goal: HasMouse(John)
+变量采用 Prover9 约定：以 u-z 小写字母开头的名字是变量，其余是常量或函数符号
+"""
+
+import re
+from clause import Term, Literal, Clause
+
+
+NEGATION_SIGNS = ('¬', '~', '-', '!')
+DISJUNCTION = re.compile(r'\s*(?:∨|\|)\s*')
+TOKEN = re.compile(r'\s*([A-Za-z0-9_$\']+|[(),])')
+
+
+class ClauseParseError(ValueError):
+    """子句文本格式错误"""
+
+
+def is_variable_name(name):
+    """按 Prover9 约定判断名字是否为变量"""
+    return 'u' <= name[0] <= 'z'
+
+
+def _tokenize(text):
+    tokens = []
+    pos = 0
+    text = text.strip()
+    while pos < len(text):
+        match = TOKEN.match(text, pos)
+        if not match:
+            raise ClauseParseError(f"无法解析: {text[pos:]!r}")
+        tokens.append(match.group(1))
+        pos = match.end()
+    return tokens
+
+
+def _parse_term(tokens, pos):
+    """解析项，返回 (Term, 下一个位置)"""
+    name = tokens[pos]
+    pos += 1
+    if pos < len(tokens) and tokens[pos] == '(':
+        args, pos = _parse_arguments(tokens, pos)
+        return Term(name, False, args), pos
+    return Term(name, is_variable=is_variable_name(name)), pos
+
+
+def _parse_arguments(tokens, pos):
+    """解析括号中的参数列表，pos 指向 '('"""
+    args = []
+    pos += 1
+    if pos < len(tokens) and tokens[pos] == ')':
+        return args, pos + 1
+    while True:
+        if pos >= len(tokens):
+            raise ClauseParseError("括号不匹配")
+        term, pos = _parse_term(tokens, pos)
+        args.append(term)
+        if pos >= len(tokens):
+            raise ClauseParseError("括号不匹配")
+        if tokens[pos] == ')':
+            return args, pos + 1
+        if tokens[pos] != ',':
+            raise ClauseParseError(f"参数之间缺少逗号: {tokens[pos]!r}")
+        pos += 1
+
+
+def parse_literal(text):
+    """解析单个文字，例如 ¬Has(x, y)"""
+    text = text.strip()
+    negated = False
+    while text and text[0] in NEGATION_SIGNS:
+        negated = not negated
+        text = text[1:].strip()
+
+    tokens = _tokenize(text)
+    if not tokens or tokens[0] in '(),':
+        raise ClauseParseError(f"缺少谓词: {text!r}")
+
+    terms = []
+    pos = 1
+    if pos < len(tokens) and tokens[pos] == '(':
+        terms, pos = _parse_arguments(tokens, pos)
+    if pos != len(tokens):
+        raise ClauseParseError(f"文字后有多余内容: {text!r}")
+    return Literal(tokens[0], terms, negated)
+
+
+def parse_clause(text):
+    """解析一行子句；以 'goal:' 开头的子句标记为目标（结论的否定）"""
+    text = text.strip()
+    source = None
+    if text.lower().startswith('goal:'):
+        source = 'goal'
+        text = text[len('goal:'):]
+
+    text = text.strip()
+    if text in ('□', ''):
+        return Clause([], source)
+    return Clause([parse_literal(part) for part in DISJUNCTION.split(text)], source)
+
+
+def parse_clauses(text):
+    """解析多行子句文本，忽略空行和 # 或 % 开头的注释"""
+    clauses = []
+    for line_number, line in enumerate(text.splitlines(), 1):
+        line = line.split('#', 1)[0].strip()
+        if not line or line.startswith('%'):
+            continue
+        try:
+            clauses.append(parse_clause(line))
+        except ClauseParseError as e:
+            raise ClauseParseError(f"第 {line_number} 行: {e}") from None
+    return clauses
+
+
+def load_clauses(filename):
+    """从文件读取子句"""
+    with open(filename, encoding='utf-8') as f:
+        return parse_clauses(f.read())
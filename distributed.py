@@ -0,0 +1,277 @@
+# distributed.py
+"""
+按谓词分片的分布式饱和
+每个谓词属于一个分片，每个工作进程只保存含有本分片谓词的子句，并只为本分片谓词建立文字索引；
+一对子句在谓词 P 上的归结只由 P 所在的分片完成，所以每个推理只做一次。
+本地协调器通过管道按轮次分发新子句、收集归结式，并做全局去重和终止判断
+"""
+
+import multiprocessing
+import time
+from budget import current_memory_usage
+from clause import Clause
+from result import ProofResult
+from resolution import ResolutionProver
+from unification import Unifier
+
+
+VARIABLE_BLOCK = 10 ** 12  # 每个分片重命名变量时使用的编号区间，不同进程生成的变量名互不相同
+DEADLINE_CHECK_INTERVAL = 64  # 工作进程每检查多少个文字对检查一次期限
+
+
+def assign_shards(clauses, shards):
+    """
+    按谓词出现次数贪心分片：出现多的谓词优先分配给当前负载最小的分片
+    返回: {谓词: 分片编号}
+    """
+    counts = {}
+    for clause in clauses:
+        for literal in clause.literals:
+            counts[literal.predicate] = counts.get(literal.predicate, 0) + 1
+
+    loads = [0] * shards
+    owner = {}
+    for predicate, count in sorted(counts.items(), key=lambda item: (-item[1], item[0])):
+        shard = loads.index(min(loads))
+        owner[predicate] = shard
+        loads[shard] += count
+    return owner
+
+
+class ShardState:
+    """工作进程中一个分片的子句和文字索引"""
+
+    def __init__(self, shard, predicates, tautology_mode='syntactic'):
+        self.shard = shard
+        self.predicates = frozenset(predicates)  # 本分片负责的谓词
+        self.clauses = []  # 含有本分片谓词的子句
+        self.index = {}  # (谓词, 是否否定) -> [(子句下标, 文字)]，只索引本分片的谓词
+        self.var_counter = {'x': (shard + 1) * VARIABLE_BLOCK}
+        self.checker = ResolutionProver()  # 只用来做重言式检测
+        self.checker.tautology_mode = tautology_mode
+        self.statistics = dict.fromkeys(('pairs', 'unifications', 'resolvents', 'tautologies'), 0)
+
+    def add_batch(self, clauses, deadline=None, limit=None):
+        """
+        加入一批新子句，每个新子句与分片内已有的子句（含批内更早的子句）在本分片的谓词上归结
+        参数: deadline 墙钟时间期限（time.time()）；limit 本轮最多产生的归结式数
+        返回: (归结式列表, 中止原因)，中止原因为 'empty'、'time'、'max_steps' 或 None
+        """
+        resolvents = []
+        statistics = self.statistics
+        checks = 0
+        for clause in clauses:
+            renamed = {}  # 已有子句下标 -> 重命名后的新子句文字
+            for k, literal in enumerate(clause.literals):
+                if literal.predicate not in self.predicates:
+                    continue
+                for position, other_literal in self.index.get((literal.predicate, not literal.negated), ()):
+                    checks += 1
+                    if deadline is not None and checks % DEADLINE_CHECK_INTERVAL == 0 and \
+                            time.time() >= deadline:
+                        return resolvents, 'time'
+
+                    other = self.clauses[position]
+                    literals2 = renamed.get(position)
+                    if literals2 is None:
+                        # 与已有子句共享变量名时重命名新子句
+                        literals2 = clause.literals
+                        if other.variables() and not other.variables().isdisjoint(clause.variables()):
+                            literals2 = clause.rename_apart(self.var_counter)
+                        renamed[position] = literals2
+
+                    statistics['pairs'] += 1
+                    substitution = Unifier.unify_literals(other_literal, literals2[k])
+                    if substitution is None:
+                        continue
+                    statistics['unifications'] += 1
+
+                    literals = ResolutionProver.resolvent_literals(
+                        other.literals, literals2, other_literal, literals2[k], substitution)
+                    if self.checker.is_tautology_literals(literals):
+                        statistics['tautologies'] += 1
+                        continue
+
+                    resolvent = Clause(literals, {'parent1': other.id, 'parent2': clause.id})
+                    resolvents.append(resolvent)
+                    statistics['resolvents'] += 1
+                    if not literals:
+                        return resolvents, 'empty'
+                    if limit is not None and len(resolvents) >= limit:
+                        return resolvents, 'max_steps'
+
+            # 处理完成后再登记，新子句不会与自身归结
+            position = len(self.clauses)
+            self.clauses.append(clause)
+            for literal in clause.literals:
+                if literal.predicate in self.predicates:
+                    self.index.setdefault((literal.predicate, literal.negated), []).append((position, literal))
+        return resolvents, None
+
+
+def _shard_worker(connection, shard, predicates, tautology_mode):
+    """工作进程主循环：接收 ('batch', 子句, 期限, 上限) 或 ('stop',)"""
+    state = ShardState(shard, predicates, tautology_mode)
+    try:
+        while True:
+            message = connection.recv()
+            if message[0] == 'stop':
+                break
+            _, clauses, deadline, limit = message
+            resolvents, stopped = state.add_batch(clauses, deadline, limit)
+            connection.send((resolvents, stopped, dict(state.statistics), len(state.clauses),
+                             current_memory_usage()))
+    except (EOFError, KeyboardInterrupt):
+        pass
+    finally:
+        connection.close()
+
+
+class DistributedProver:
+    """按谓词分片、多进程饱和的归结证明器（宽度优先，按轮次同步）"""
+
+    def __init__(self, workers=2, max_steps=2000, tautology_mode='syntactic'):
+        self.workers = workers  # 分片数（工作进程数）
+        self.max_steps = max_steps
+        self.tautology_mode = tautology_mode
+        self.clauses = []  # 输入子句
+        self.var_counter = {'x': 0}
+        self.steps = 0
+        self.rounds = 0
+        self.empty_clause = None
+        self.statistics = {}
+
+    def add_clause(self, clause):
+        """添加输入子句（变量用全局编号标准化）"""
+        self.clauses.append(clause.standardize_variables(self.var_counter))
+
+    def prove(self, budget=None):
+        """
+        运行分布式饱和
+        返回: ProofResult；budget 的时间限制同时作为工作进程的期限
+        """
+        start_time = time.time()
+        self.steps = 0
+        self.rounds = 0
+        self.empty_clause = None
+
+        owner = assign_shards(self.clauses, self.workers)
+        shard_predicates = [[] for _ in range(self.workers)]
+        for predicate, shard in owner.items():
+            shard_predicates[shard].append(predicate)
+        shard_info = [{'predicates': len(predicates), 'clauses': 0, 'peak_memory': None, 'statistics': {}}
+                      for predicates in shard_predicates]
+
+        if budget is not None:
+            budget.start()
+        deadline = start_time + budget.time_limit if budget is not None and budget.time_limit is not None else None
+
+        # 输入子句：全局去重后作为第一批新子句，协调器只保存去重键
+        next_id = 0
+        seen = set()
+        batch = []
+        for clause in self.clauses:
+            key = ResolutionProver.clause_key(clause.literals)
+            if key in seen:
+                continue
+            seen.add(key)
+            # 编号给副本，不修改 add_clause() 保存的子句
+            clause = Clause(clause.literals, clause.source)
+            clause.id = next_id
+            next_id += 1
+            batch.append(clause)
+            if clause.is_empty():
+                self.empty_clause = clause
+                return self._finish(ProofResult.PROVED, None, start_time, seen, shard_info)
+
+        context = multiprocessing.get_context()
+        connections = []
+        processes = []
+        try:
+            for shard, predicates in enumerate(shard_predicates):
+                parent, child = context.Pipe()
+                process = context.Process(target=_shard_worker, args=(child, shard, predicates, self.tautology_mode),
+                                          daemon=True)
+                process.start()
+                child.close()
+                connections.append(parent)
+                processes.append(process)
+
+            while batch:
+                self.rounds += 1
+                # 每个子句只发给拥有它的某个谓词的分片
+                parts = [[] for _ in range(self.workers)]
+                for clause in batch:
+                    for shard in {owner[literal.predicate] for literal in clause.literals}:
+                        parts[shard].append(clause)
+                # 每个分片最多用完剩余的全部步数，协调器按收到的顺序计数，超出共享上限的归结式丢弃
+                limit = self.max_steps - self.steps
+                for connection, part in zip(connections, parts):
+                    connection.send(('batch', part, deadline, limit))
+
+                # 收集所有分片的结果后再决定下一批
+                stop_reason = None
+                batch = []
+                for shard, connection in enumerate(connections):
+                    try:
+                        resolvents, stopped, statistics, clauses, memory = connection.recv()
+                    except EOFError:
+                        raise RuntimeError(f"分片 {shard} 的工作进程异常退出") from None
+                    info = shard_info[shard]
+                    info['clauses'] = clauses
+                    info['statistics'] = statistics
+                    if memory is not None and (info['peak_memory'] is None or memory > info['peak_memory']):
+                        info['peak_memory'] = memory
+
+                    for resolvent in resolvents:
+                        if self.steps >= self.max_steps:
+                            stop_reason = 'max_steps'
+                            break
+                        self.steps += 1
+                        if resolvent.is_empty():
+                            self.empty_clause = resolvent
+                            return self._finish(ProofResult.PROVED, None, start_time, seen, shard_info)
+                        key = ResolutionProver.clause_key(resolvent.literals)
+                        if key in seen:
+                            continue
+                        seen.add(key)
+                        resolvent.id = next_id
+                        next_id += 1
+                        batch.append(resolvent)
+                    if stopped is not None and stop_reason is None:
+                        stop_reason = stopped
+
+                if stop_reason is not None or self.steps >= self.max_steps:
+                    return self._finish(ProofResult.UNKNOWN, stop_reason or 'max_steps', start_time, seen, shard_info)
+                if budget is not None:
+                    exceeded = budget.exceeded(len(seen))
+                    if exceeded:
+                        return self._finish(ProofResult.UNKNOWN, exceeded, start_time, seen, shard_info)
+
+            return self._finish(ProofResult.SATURATED, None, start_time, seen, shard_info)
+        finally:
+            for connection in connections:
+                try:
+                    connection.send(('stop',))
+                except (BrokenPipeError, OSError):
+                    pass
+                connection.close()
+            for process in processes:
+                process.join(timeout=1)
+                if process.is_alive():
+                    process.terminate()
+
+    def _finish(self, status, reason, start_time, seen, shard_info):
+        """构造带分片统计的结果"""
+        duration = time.time() - start_time
+        self.statistics = {
+            'total_steps': self.steps,
+            'total_clauses': len(seen),
+            'rounds': self.rounds,
+            'workers': self.workers,
+            'shards': shard_info,
+            'duration': duration,
+            'resolvents_per_second': self.steps / duration if duration > 0 else 0.0,
+            'empty_clause_found': self.empty_clause is not None
+        }
+        return ProofResult(status, reason, dict(self.statistics))
@@ -0,0 +1,224 @@
+# events.py
+"""
+推理事件与观察者
+证明器核心不做任何输出，只向注册的观察者发送类型化事件
+"""
+
+import time
+from result import ProofResult
+
+
+class ProverEvent:
+    """推理事件基类"""
+
+    handler = 'on_event'  # 观察者中处理该事件的方法名
+
+
+class SearchStarted(ProverEvent):
+    """推理开始"""
+
+    handler = 'on_search_started'
+
+    def __init__(self, clauses):
+        self.clauses = clauses
+
+
+class ResolventProduced(ProverEvent):
+    """产生一个归结子句（计为一步）"""
+
+    handler = 'on_resolvent_produced'
+
+    def __init__(self, step, clause1, clause2, literal1, literal2, substitution, resolvent):
+        self.step = step
+        self.clause1 = clause1
+        self.clause2 = clause2
+        self.literal1 = literal1
+        self.literal2 = literal2
+        self.substitution = substitution
+        self.resolvent = resolvent
+
+
+class ClauseKept(ProverEvent):
+    """新子句被加入子句集"""
+
+    handler = 'on_clause_kept'
+
+    def __init__(self, clause):
+        self.clause = clause
+
+
+class ClauseDiscarded(ProverEvent):
+    """新子句被丢弃"""
+
+    handler = 'on_clause_discarded'
+
+    def __init__(self, clause, reason):
+        self.clause = clause
+        self.reason = reason  # 'tautology'、'duplicate'、'answer'（回答子句），或保留策略的 'weight'、'length'、'subsumed'
+
+
+class IterationDone(ProverEvent):
+    """一轮迭代完成"""
+
+    handler = 'on_iteration_done'
+
+    def __init__(self, iteration, new_clauses, total_clauses, steps, elapsed):
+        self.iteration = iteration
+        self.new_clauses = new_clauses
+        self.total_clauses = total_clauses
+        self.steps = steps
+        self.elapsed = elapsed
+
+
+class ProofFound(ProverEvent):
+    """推导出空子句"""
+
+    handler = 'on_proof_found'
+
+    def __init__(self, step, resolvent):
+        self.step = step
+        self.resolvent = resolvent
+
+
+class SearchFinished(ProverEvent):
+    """推理结束（任何结论）"""
+
+    handler = 'on_search_finished'
+
+    def __init__(self, result, max_steps):
+        self.result = result
+        self.max_steps = max_steps
+
+
+class ProverObserver:
+    """观察者基类，按事件类型分派到 on_* 方法，未覆盖的方法忽略事件"""
+
+    def notify(self, event):
+        getattr(self, event.handler, self.on_event)(event)
+
+    def on_event(self, event):
+        pass
+
+
+class ConsoleObserver(ProverObserver):
+    """控制台输出观察者（原来写在推理循环中的打印）"""
+
+    def __init__(self, detailed=False, progress_interval=10):
+        self.detailed = detailed  # 是否显示详细步骤
+        self.progress_interval = progress_interval  # 每隔多少次迭代输出进度
+
+    def on_search_started(self, event):
+        print(f"开始推理，初始子句数: {len(event.clauses)}")
+        if self.detailed:
+            print("初始子句:")
+            for i, clause in enumerate(event.clauses):
+                print(f"  {i}: {clause}")
+
+    def on_resolvent_produced(self, event):
+        if not self.detailed or not self.is_important(event.resolvent):
+            return
+        print(f"\n步骤 {event.step}: 重要归结")
+        print(f"  子句1: {event.clause1}")
+        print(f"  子句2: {event.clause2}")
+        print(f"  文字1: {event.literal1}")
+        print(f"  文字2: {event.literal2}")
+        if event.substitution:
+            subst_str = ", ".join(f"{k}→{v}" for k, v in event.substitution.items())
+            print(f"  替换: {subst_str}")
+        print(f"  结果: {event.resolvent}")
+
+    @staticmethod
+    def is_important(resolvent):
+        """判断是否为值得显示的重要归结步骤"""
+        if resolvent.is_empty() or len(resolvent.literals) <= 2:  # 空子句或短子句
+            return True
+        text = str(resolvent)
+        return (("SearchedBy" in text and any(c in text for c in ['o', 'd'])) or
+                ("DrugDealer" in text and 'o' in text))
+
+    def on_proof_found(self, event):
+        print(f"🎉 找到矛盾！在第 {event.step} 步推导出空子句")
+
+    def on_iteration_done(self, event):
+        print(f"迭代 {event.iteration}: 生成 {event.new_clauses} 个新子句，总子句数: {event.total_clauses}")
+        if (event.iteration + 1) % self.progress_interval == 0:
+            print(f"进度: {event.iteration + 1}次迭代, {event.steps}步, 耗时: {event.elapsed:.2f}秒")
+
+    def on_search_finished(self, event):
+        result = event.result
+        if result:
+            return
+        if result.status == ProofResult.SATURATED:
+            print(f"在 {result.statistics.get('total_steps', 0)} 步后未产生新子句，无法证明")
+        elif result.reason == 'max_steps':
+            print(f"达到最大步数限制 {event.max_steps}，未找到证明")
+        elif result.reason in ('time', 'memory', 'clauses'):
+            print(f"达到资源预算限制 ({result.reason})，结论未知")
+        else:
+            print(f"推理提前停止 ({result.reason})，结论未知")
+
+
+class HistoryRecorder(ProverObserver):
+    """推理历史记录观察者，把每一步写入 history 列表（默认为 prover.history）"""
+
+    def __init__(self, history):
+        self.history = history
+
+    def on_resolvent_produced(self, event):
+        self.history.append({
+            'step': event.step,
+            'clause1': str(event.clause1),
+            'clause2': str(event.clause2),
+            'literal1': str(event.literal1),
+            'literal2': str(event.literal2),
+            'substitution': event.substitution,
+            'resolvent': str(event.resolvent),
+            'is_empty': event.resolvent.is_empty()
+        })
+
+
+class MetricsObserver(ProverObserver):
+    """指标统计观察者，只计数不做字符串转换"""
+
+    def __init__(self):
+        self.counters = {
+            'resolvents': 0,
+            'kept': 0,
+            'discarded_tautology': 0,
+            'discarded_duplicate': 0,
+            'iterations': 0,
+            'proofs': 0
+        }
+        self.start_time = None
+        self.elapsed = 0.0
+
+    def on_search_started(self, event):
+        self.start_time = time.time()
+
+    def on_resolvent_produced(self, event):
+        self.counters['resolvents'] += 1
+
+    def on_clause_kept(self, event):
+        self.counters['kept'] += 1
+
+    def on_clause_discarded(self, event):
+        key = f"discarded_{event.reason}"
+        self.counters[key] = self.counters.get(key, 0) + 1
+
+    def on_iteration_done(self, event):
+        self.counters['iterations'] += 1
+
+    def on_proof_found(self, event):
+        self.counters['proofs'] += 1
+
+    def on_search_finished(self, event):
+        if self.start_time is not None:
+            self.elapsed = time.time() - self.start_time
+
+    def to_dict(self):
+        """导出指标"""
+        metrics = dict(self.counters)
+        metrics['elapsed'] = self.elapsed
+        if self.elapsed > 0:
+            metrics['resolvents_per_second'] = self.counters['resolvents'] / self.elapsed
+        return metrics
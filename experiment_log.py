@@ -4,18 +4,27 @@
 记录详细的推理过程并生成报告
 """
 
+import concurrent.futures
 import datetime
 import json
+import os
 import time
 from resolution import ResolutionProver
+from events import ProverObserver
 from problems import ProblemBuilder, get_all_problems
 
 
-class ExperimentLogger:
-    """实验记录器"""
+class ExperimentLogger(ProverObserver):
+    """实验记录器（作为观察者接收证明器的推理事件）"""
 
-    def __init__(self, verbose=True):
+    # 流式模式下内存中只保留的摘要字段
+    SUMMARY_FIELDS = ('problem_name', 'problem_description', 'start_time', 'end_time',
+                      'duration', 'result', 'status', 'reason', 'statistics')
+
+    def __init__(self, verbose=True, step_sample=1, compact=False):
         self.verbose = verbose
+        self.step_sample = step_sample  # 每隔多少步记录一次（空子句步骤总是记录）
+        self.compact = compact  # 紧凑模式只记录步号、归结式和替换，不转换父子句
         self.experiments = []
         self.current_experiment = None
 
@@ -53,6 +62,33 @@ class ExperimentLogger:
         if self.verbose and step_info.get('is_empty', False):
             print(f"🎉 步骤 {step_info['step']}: 推导出空子句!")
 
+    def on_resolvent_produced(self, event):
+        """观察者回调：按采样间隔记录证明器产生的归结子句"""
+        is_empty = event.resolvent.is_empty()
+        if event.step % self.step_sample != 0 and not is_empty:
+            return
+
+        substitution = event.substitution
+        if self.compact:
+            self.log_resolution_step({
+                'step': event.step,
+                'substitution': {k: str(v) for k, v in substitution.items()} if substitution else {},
+                'resolvent': str(event.resolvent),
+                'is_empty': is_empty
+            })
+            return
+
+        self.log_resolution_step({
+            'step': event.step,
+            'clause1': str(event.clause1),
+            'clause2': str(event.clause2),
+            'literal1': str(event.literal1),
+            'literal2': str(event.literal2),
+            'substitution': {k: str(v) for k, v in substitution.items()} if substitution else {},
+            'resolvent': str(event.resolvent),
+            'is_empty': is_empty
+        })
+
     def end_experiment(self, result, statistics, prover=None):
         """结束实验并记录结果"""
         end_time = datetime.datetime.now()
@@ -61,13 +97,15 @@ class ExperimentLogger:
 
         self.current_experiment.update({
             'end_time': end_time.isoformat(),
-            'result': result,
+            'result': bool(result),
+            'status': getattr(result, 'status', None),
+            'reason': getattr(result, 'reason', None),
             'statistics': statistics,
             'duration': duration
         })
 
-        # 如果提供了prover，记录完整历史
-        if prover and hasattr(prover, 'history'):
+        # 如果提供了prover且记录了历史，保存完整历史
+        if prover and getattr(prover, 'history', None):
             self.current_experiment['full_history'] = prover.history
 
         self.experiments.append(self.current_experiment)
@@ -100,30 +138,9 @@ class ExperimentLogger:
         clauses = problem_info['builder']()
         self.log_clauses(clauses)
 
-        # 创建证明器并设置回调
+        # 创建证明器并注册为观察者以捕获每一步
         prover = ResolutionProver()
-
-        # 重写历史记录方法以捕获每一步
-        original_resolve = prover.resolve
-
-        def logged_resolve(clause1, clause2, literal1, literal2, substitution):
-            result = original_resolve(clause1, clause2, literal1, literal2, substitution)
-
-            step_info = {
-                'step': prover.steps,
-                'clause1': str(clause1),
-                'clause2': str(clause2),
-                'literal1': str(literal1),
-                'literal2': str(literal2),
-                'substitution': {k: str(v) for k, v in substitution.items()} if substitution else {},
-                'resolvent': str(result),
-                'is_empty': result.is_empty()
-            }
-
-            self.log_resolution_step(step_info)
-            return result
-
-        prover.resolve = logged_resolve
+        prover.add_observer(self)
 
         # 添加子句并运行推理
         for clause in clauses:
@@ -152,30 +169,7 @@ class ExperimentLogger:
         report.append("")
 
         for i, exp in enumerate(self.experiments, 1):
-            report.append(f"实验 {i}: {exp['problem_name']}")
-            report.append(f"描述: {exp['problem_description']}")
-            report.append(f"开始时间: {exp['start_time']}")
-            report.append(f"持续时间: {exp['duration']:.3f} 秒")
-            report.append(f"结果: {'找到矛盾' if exp['result'] else '未找到矛盾'}")
-            report.append(f"推理步数: {exp['statistics']['total_steps']}")
-            report.append(f"总子句数: {exp['statistics']['total_clauses']}")
-
-            report.append("\n初始子句:")
-            for j, clause in enumerate(exp['clauses'], 1):
-                report.append(f"  {j:2d}. {clause}")
-
-            # 显示关键推理步骤（最后10步）
-            steps = exp['resolution_steps']
-            if steps:
-                report.append(f"\n关键推理步骤 (共 {len(steps)} 步):")
-                for step in steps[-10:]:  # 显示最后10步
-                    status = "★" if step['is_empty'] else " "
-                    report.append(f"  步骤 {step['step']}: {status} {step['resolvent']}")
-                    if step['substitution']:
-                        subst_str = ", ".join(f"{k}→{v}" for k, v in step['substitution'].items())
-                        report.append(f"        替换: {subst_str}")
-
-            report.append("\n" + "-" * 60)
+            report.append(self.format_experiment(i, exp))
 
         report_text = "\n".join(report)
 
@@ -186,6 +180,36 @@ class ExperimentLogger:
 
         return report_text
 
+    @staticmethod
+    def format_experiment(index, exp):
+        """格式化单个实验的文本报告段落"""
+        report = []
+        report.append(f"实验 {index}: {exp['problem_name']}")
+        report.append(f"描述: {exp['problem_description']}")
+        report.append(f"开始时间: {exp['start_time']}")
+        report.append(f"持续时间: {exp['duration']:.3f} 秒")
+        report.append(f"结果: {'找到矛盾' if exp['result'] else '未找到矛盾'}")
+        report.append(f"推理步数: {exp['statistics']['total_steps']}")
+        report.append(f"总子句数: {exp['statistics']['total_clauses']}")
+
+        report.append("\n初始子句:")
+        for j, clause in enumerate(exp['clauses'], 1):
+            report.append(f"  {j:2d}. {clause}")
+
+        # 显示关键推理步骤（最后10步）
+        steps = exp['resolution_steps']
+        if steps:
+            report.append(f"\n关键推理步骤 (共记录 {len(steps)} 步):")
+            for step in steps[-10:]:  # 显示最后10步
+                status = "★" if step['is_empty'] else " "
+                report.append(f"  步骤 {step['step']}: {status} {step['resolvent']}")
+                if step['substitution']:
+                    subst_str = ", ".join(f"{k}→{v}" for k, v in step['substitution'].items())
+                    report.append(f"        替换: {subst_str}")
+
+        report.append("\n" + "-" * 60)
+        return "\n".join(report)
+
     def generate_json_report(self, filename=None):
         """生成JSON格式的详细报告"""
         report = {
@@ -218,29 +242,81 @@ class ExperimentLogger:
                   f"耗时: {exp['duration']:.3f}s")
 
 
-def run_complete_experiment_suite():
-    """运行完整的实验套件"""
+def _run_experiment_job(problem_id, step_sample, compact):
+    """工作进程入口：运行单个问题的实验并返回实验记录"""
+    logger = ExperimentLogger(verbose=False, step_sample=step_sample, compact=compact)
+    try:
+        return logger.run_problem_experiment(problem_id)
+    except Exception as e:
+        return {'problem_id': problem_id, 'error': f"{type(e).__name__}: {e}"}
+
+
+def write_text_report_from_jsonl(jsonl_file, filename):
+    """逐行读取JSONL实验记录生成文本报告，不把所有实验载入内存"""
+    count = 0
+    with open(jsonl_file, encoding='utf-8') as source, open(filename, 'w', encoding='utf-8') as f:
+        f.write("Resolution Theorem Prover 实验报告\n")
+        f.write("=" * 60 + "\n")
+        f.write(f"生成时间: {datetime.datetime.now()}\n\n")
+        for line in source:
+            exp = json.loads(line)
+            if 'error' in exp:
+                continue
+            count += 1
+            f.write(ExperimentLogger.format_experiment(count, exp) + "\n")
+    print(f"📄 文本报告已保存: {filename}")
+    return count
+
+
+def run_complete_experiment_suite(workers=None, jsonl_file="experiment_report.jsonl",
+                                  text_file="experiment_report.txt", step_sample=10, compact=True):
+    """
+    运行完整的实验套件
+    实验在进程池中并行运行，每个实验完成后立即追加到JSONL文件，内存中只保留摘要
+    参数: step_sample 推理步骤采样间隔；compact 是否只记录紧凑的步骤信息
+    """
     print("开始运行完整实验套件")
     print("=" * 60)
 
-    logger = ExperimentLogger(verbose=True)
+    logger = ExperimentLogger(verbose=True, step_sample=step_sample, compact=compact)
 
     # 运行所有定义的问题
-    problems = get_all_problems()
-
-    for problem_id in problems:
-        try:
-            logger.run_problem_experiment(problem_id)
-            print("\n" + "-" * 50)
-        except Exception as e:
-            print(f"❌ 运行问题 {problem_id} 时出错: {e}")
-            import traceback
-            traceback.print_exc()
+    problems = list(get_all_problems())
+    workers = workers or os.cpu_count() or 1
+
+    with open(jsonl_file, 'w', encoding='utf-8') as output, \
+            concurrent.futures.ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = {
+            executor.submit(_run_experiment_job, problem_id, step_sample, compact): problem_id
+            for problem_id in problems
+        }
+        for future in concurrent.futures.as_completed(futures):
+            problem_id = futures[future]
+            try:
+                experiment = future.result()
+            except Exception as e:
+                experiment = {'problem_id': problem_id, 'error': f"{type(e).__name__}: {e}"}
+
+            if experiment is None:
+                continue
+            output.write(json.dumps(experiment, ensure_ascii=False) + "\n")
+            output.flush()
+
+            if 'error' in experiment:
+                print(f"❌ 运行问题 {problem_id} 时出错: {experiment['error']}")
+                continue
+
+            summary = {key: experiment.get(key) for key in ExperimentLogger.SUMMARY_FIELDS}
+            logger.experiments.append(summary)
+            status = "✅ 证明成功" if summary['result'] else "❌ 未找到证明"
+            print(f"🔬 {summary['problem_name']}: {status} "
+                  f"({summary['statistics']['total_steps']} 步, {summary['duration']:.3f} 秒)")
+
+    print(f"📊 JSONL报告已保存: {jsonl_file}")
 
     # 生成报告
     print("\n生成实验报告...")
-    logger.generate_text_report("experiment_report.txt")
-    logger.generate_json_report("experiment_report.json")
+    write_text_report_from_jsonl(jsonl_file, text_file)
 
     # 显示摘要
     logger.print_summary()
@@ -256,5 +332,5 @@ if __name__ == "__main__":
     # 提示用户查看详细结果
     print("\n📁 生成的文件:")
     print("  - experiment_report.txt (可读报告)")
-    print("  - experiment_report.json (详细数据)")
+    print("  - experiment_report.jsonl (详细数据，每行一个实验)")
     print("\n要查看详细推理过程，请运行 main.py 并选择相应问题")
\ No newline at end of file
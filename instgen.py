@@ -0,0 +1,334 @@
+# instgen.py
+"""
+基于实例生成的证明引擎（Inst-Gen）
+两两归结会在 Drug Dealer 这类含变量的公理上产生大量冗余的非基归结式。Inst-Gen 不做归结，而是：
+1. 把当前子句集中的所有变量代换为同一个特殊常量 ⊥，得到命题抽象，交给命题求解器（DPLL）判定；
+2. 抽象不可满足时原子句集不可满足（证明成功）；
+3. 抽象可满足时，按模型为每个子句选择一个为真的文字，选中文字中可合一的互补对
+   （用 Unifier.unify_literals）说明模型在某些实例上不成立，加入两个子句在最一般合一下的实例后回到 1；
+   没有这样的文字对时原子句集可满足（饱和）。
+生成的只是输入子句的实例，子句不会变宽；命题求解器保存上一轮的赋值方向，相邻两轮的模型和选择尽量不变，
+只需要检查选择发生变化的子句
+"""
+
+from clause import Clause, Term
+from preprocess import variant_key
+from unification import Unifier
+
+
+BOTTOM = Term('$bot')  # 命题抽象中代替所有变量的常量 ⊥
+
+
+def ground_term(term):
+    """把项中的变量代换为 ⊥"""
+    if term.is_variable:
+        return BOTTOM
+    if term.args:
+        return Term(term.name, False, [ground_term(arg) for arg in term.args])
+    return term
+
+
+class SatSolver:
+    """
+    命题求解器：双观察文字的单元传播 + 按时间顺序回溯的 DPLL
+    子句可以在两次求解之间增量加入；决策时沿用上一次模型中的赋值（phase saving）
+    """
+
+    def __init__(self):
+        self.clauses = []  # 至少两个文字的子句（前两个文字是观察文字）
+        self.watches = {}  # 文字 -> 观察它的子句下标列表
+        self.units = []  # 单元子句的文字
+        self.num_vars = 0
+        self.phase = [False]  # 变量上一次的赋值，新变量默认为假
+        self.empty = False  # 是否加入过空子句
+        self.statistics = dict.fromkeys(('sat_calls', 'decisions', 'propagations', 'conflicts'), 0)
+
+    def new_var(self):
+        """新建命题变量，返回编号（从 1 开始，负数表示否定）"""
+        self.num_vars += 1
+        self.phase.append(False)
+        return self.num_vars
+
+    def add_clause(self, literals):
+        """加入子句（命题文字列表），重言式被忽略"""
+        literals = list(dict.fromkeys(literals))
+        if any(-literal in literals for literal in literals):
+            return
+        if not literals:
+            self.empty = True
+        elif len(literals) == 1:
+            self.units.append(literals[0])
+        else:
+            index = len(self.clauses)
+            self.clauses.append(literals)
+            self.watches.setdefault(literals[0], []).append(index)
+            self.watches.setdefault(literals[1], []).append(index)
+
+    def solve(self):
+        """
+        判定当前子句集
+        返回: 可满足时返回模型（按变量编号的布尔列表，下标 0 不用），不可满足时返回 None
+        """
+        statistics = self.statistics
+        statistics['sat_calls'] += 1
+        if self.empty:
+            return None
+        clauses = self.clauses
+        watches = self.watches
+        value = [None] * (self.num_vars + 1)
+        trail = []
+        levels = []  # 每个决策: (决策前的 trail 长度, 决策文字, 是否已经翻转)
+
+        def literal_value(literal):
+            v = value[literal] if literal > 0 else value[-literal]
+            if v is None or literal > 0:
+                return v
+            return not v
+
+        for literal in self.units:
+            current = literal_value(literal)
+            if current is False:
+                return None
+            if current is None:
+                value[abs(literal)] = literal > 0
+                trail.append(literal)
+
+        head = 0
+        cursor = 1  # 决策时从这个变量开始查找未赋值的变量
+        while True:
+            # 单元传播：trail 中每个新赋值的文字使其否定为假，检查观察该否定的子句
+            conflict = False
+            while head < len(trail) and not conflict:
+                false_literal = -trail[head]
+                head += 1
+                watching = watches.get(false_literal)
+                if not watching:
+                    continue
+                i = 0
+                while i < len(watching):
+                    clause = clauses[watching[i]]
+                    if clause[0] == false_literal:
+                        clause[0], clause[1] = clause[1], clause[0]
+                    first_value = literal_value(clause[0])
+                    if first_value is True:
+                        i += 1
+                        continue
+                    for k in range(2, len(clause)):
+                        if literal_value(clause[k]) is not False:
+                            # 换一个不为假的文字观察
+                            clause[1], clause[k] = clause[k], clause[1]
+                            watches.setdefault(clause[1], []).append(watching[i])
+                            watching[i] = watching[-1]
+                            watching.pop()
+                            break
+                    else:
+                        if first_value is False:
+                            conflict = True
+                            break
+                        value[abs(clause[0])] = clause[0] > 0
+                        trail.append(clause[0])
+                        statistics['propagations'] += 1
+                        i += 1
+
+            if conflict:
+                statistics['conflicts'] += 1
+                # 回溯到最近一个还没有翻转的决策并翻转它
+                while levels:
+                    start, decision, flipped = levels.pop()
+                    for literal in trail[start:]:
+                        value[abs(literal)] = None
+                    del trail[start:]
+                    if not flipped:
+                        levels.append((start, -decision, True))
+                        value[abs(decision)] = decision < 0
+                        trail.append(-decision)
+                        head = start
+                        cursor = 1
+                        break
+                else:
+                    return None
+                continue
+
+            while cursor <= self.num_vars and value[cursor] is not None:
+                cursor += 1
+            if cursor > self.num_vars:
+                for var in range(1, self.num_vars + 1):
+                    self.phase[var] = value[var]
+                return value
+            statistics['decisions'] += 1
+            decision = cursor if self.phase[cursor] else -cursor
+            levels.append((len(trail), decision, False))
+            value[cursor] = decision > 0
+            trail.append(decision)
+
+    def get_statistics(self):
+        """求解次数、决策数、传播数和冲突数"""
+        return dict(self.statistics)
+
+
+class InstGen:
+    """实例生成引擎：命题抽象 + 模型引导的实例化"""
+
+    def __init__(self, clauses, var_counter=None, max_steps=None, budget=None):
+        self.var_counter = var_counter if var_counter is not None else {'x': 0}
+        self.max_steps = max_steps  # 最多生成的实例数
+        self.budget = budget
+        self.solver = SatSolver()
+        self.atoms = {}  # 基原子 -> 命题变量
+        self.clauses = []  # 输入子句和生成的实例（变量互不相同）
+        self.ground = []  # 每个子句的命题抽象（与文字一一对应的命题文字）
+        self.keys = set()  # 子句的变体键
+        self.selected = []  # 每个子句选中的文字下标
+        self.index = {}  # (谓词, 是否否定) -> 选中该类文字的子句下标集合
+        self.statistics = dict.fromkeys(('rounds', 'instances', 'duplicate_instances', 'unifications_succeeded',
+                                         'unifications_failed'), 0)
+        for clause in clauses:
+            self.add(clause)
+
+    def add(self, clause):
+        """
+        加入子句（只差变量名的子句只加入一次）并把它的命题抽象交给求解器
+        返回: 是否是新子句
+        """
+        key = variant_key(clause)
+        if key in self.keys:
+            return False
+        self.keys.add(key)
+        self.clauses.append(clause)
+        self.selected.append(None)
+        ground = []
+        for literal in clause.literals:
+            atom = (literal.predicate, tuple(ground_term(term) for term in literal.terms))
+            var = self.atoms.get(atom)
+            if var is None:
+                var = self.atoms[atom] = self.solver.new_var()
+            ground.append(-var if literal.negated else var)
+        self.ground.append(ground)
+        self.solver.add_clause(ground)
+        return True
+
+    def prove(self):
+        """
+        交替判定命题抽象和生成实例
+        返回: 'proved'（抽象不可满足）、'saturated'（选中文字之间没有冲突，子句集可满足）、
+              'max_steps' 或预算超出的原因
+        """
+        budget = self.budget
+        while True:
+            self.statistics['rounds'] += 1
+            model = self.solver.solve()
+            if model is None:
+                return 'proved'
+            changed = self.select(model)
+            outcome = self.generate(changed)
+            if outcome is not None:
+                return outcome
+            if budget is not None:
+                reason = budget.exceeded(len(self.clauses))
+                if reason:
+                    return reason
+
+    def select(self, model):
+        """
+        为每个子句选择一个在模型中为真的文字（原来的选择仍然为真时保留）
+        返回: 选择发生变化的子句下标集合
+        """
+        changed = set()
+        for position, ground in enumerate(self.ground):
+            current = self.selected[position]
+            if current is not None and model[abs(ground[current])] == (ground[current] > 0):
+                continue
+            choice = next(k for k, literal in enumerate(ground) if model[abs(literal)] == (literal > 0))
+            literals = self.clauses[position].literals
+            if current is not None:
+                self.index[(literals[current].predicate, literals[current].negated)].discard(position)
+            self.index.setdefault((literals[choice].predicate, literals[choice].negated), set()).add(position)
+            self.selected[position] = choice
+            changed.add(position)
+        return changed
+
+    def generate(self, changed):
+        """
+        检查选择变化的子句与其他子句的选中文字：可合一的互补对生成两个子句在最一般合一下的实例
+        返回: None 表示继续下一轮；没有新实例时返回 'saturated'，超出步数或预算时返回原因
+        """
+        statistics = self.statistics
+        budget = self.budget
+        check_interval = budget.check_interval if budget is not None else None
+        produced = 0
+        for position in sorted(changed):
+            clause1 = self.clauses[position]
+            literal1 = clause1.literals[self.selected[position]]
+            for other in sorted(self.index.get((literal1.predicate, not literal1.negated), ())):
+                # 两个子句的选择都变化时只检查一次
+                if other in changed and other < position:
+                    continue
+                unifications = statistics['unifications_succeeded'] + statistics['unifications_failed']
+                if budget is not None and unifications and unifications % check_interval == 0:
+                    reason = budget.exceeded(len(self.clauses))
+                    if reason:
+                        return reason
+                clause2 = self.clauses[other]
+                substitution = Unifier.unify_literals(literal1, clause2.literals[self.selected[other]])
+                if substitution is None:
+                    statistics['unifications_failed'] += 1
+                    continue
+                statistics['unifications_succeeded'] += 1
+                for clause in (clause1, clause2):
+                    literals = [Unifier.apply_substitution_to_literal(literal, substitution)
+                                for literal in clause.literals]
+                    instance = Clause(literals, {'instance_of': clause.id, 'substitution': substitution})
+                    if self.add(instance.standardize_variables(self.var_counter)):
+                        produced += 1
+                        statistics['instances'] += 1
+                        if self.max_steps is not None and statistics['instances'] >= self.max_steps:
+                            return 'max_steps'
+                    else:
+                        statistics['duplicate_instances'] += 1
+        return None if produced else 'saturated'
+
+    def get_statistics(self):
+        """轮数、实例数、合一次数、命题原子数和求解器统计"""
+        statistics = dict(self.statistics)
+        statistics['ground_atoms'] = len(self.atoms)
+        statistics.update(self.solver.get_statistics())
+        return statistics
+
+
+def benchmark_instgen(max_steps=3000, time_limit=5.0):
+    """
+    比较两两归结和实例生成：内置问题、去掉目标的毒贩问题公理（可满足）和传递闭包链
+    返回: {工作负载: {'resolution': {...}, 'instgen': {...}}}，每项包含状态、耗时、推理步数和最终子句数
+    """
+    from budget import Budget
+    from problems import ProblemBuilder, get_all_problems
+    from resolution import ResolutionProver
+
+    workloads = {name: info['builder'] for name, info in get_all_problems().items()}
+    workloads['drug_dealer_axioms'] = lambda: [clause for clause in ProblemBuilder.create_drug_dealer_optimized()
+                                               if clause.source != 'goal']
+    workloads['transitive_chain'] = lambda: ProblemBuilder.create_transitive_chain(12)
+    report = {}
+    for name, builder in workloads.items():
+        report[name] = {}
+        for engine in ResolutionProver.ENGINES:
+            prover = ResolutionProver()
+            prover.configure(max_steps=max_steps, engine=engine)
+            for clause in builder():
+                prover.add_clause(clause)
+            result = prover.two_pointer_resolution(Budget(time_limit=time_limit))
+            statistics = result.statistics
+            report[name][engine] = {
+                'status': result.status,
+                'duration': statistics['duration'],
+                'steps': statistics['total_steps'],
+                'clauses': statistics['total_clauses']
+            }
+    return report
+
+
+if __name__ == "__main__":
+    for name, engines in benchmark_instgen().items():
+        for engine, row in engines.items():
+            print(f"{name:<20} {engine:<10} {row['status']:<9} {row['duration']:.4f}s  "
+                  f"步数 {row['steps']:<6} 子句 {row['clauses']}")
@@ -0,0 +1,163 @@
+# instrumentation.py
+"""
+推理性能分析工具
+分阶段计时器、cProfile 包装、采样分析器和冷启动基准
+分析器依赖的标准库模块在使用时才导入，证明器导入 PhaseTimer 时不需要加载它们
+"""
+
+import os
+import sys
+
+
+class PhaseTimer:
+    """分阶段计时与调用计数（只在证明器开启 instrument 时使用）"""
+
+    PHASES = ('screening', 'unification', 'resolvent', 'tautology', 'dedup')
+
+    def __init__(self):
+        self.times = dict.fromkeys(self.PHASES, 0.0)
+        self.calls = dict.fromkeys(self.PHASES, 0)
+
+    def add(self, phase, elapsed):
+        """累加一次阶段耗时"""
+        self.times[phase] += elapsed
+        self.calls[phase] += 1
+
+    def to_dict(self):
+        """导出各阶段耗时和调用次数"""
+        return {
+            phase: {'time': self.times[phase], 'calls': self.calls[phase]}
+            for phase in self.times
+        }
+
+
+class SamplingProfiler:
+    """采样分析器：后台线程定期记录目标线程当前执行的函数"""
+
+    def __init__(self, interval=0.001):
+        import collections
+        import threading
+
+        self.interval = interval  # 采样间隔（秒）
+        self.samples = collections.Counter()
+        self.total_samples = 0
+        self._target = None
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        """开始对当前线程采样"""
+        import threading
+
+        self._target = threading.get_ident()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """停止采样"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self._target)
+            if frame is None:
+                continue
+            code = frame.f_code
+            self.samples[(code.co_filename, code.co_firstlineno, code.co_name)] += 1
+            self.total_samples += 1
+
+    def report(self, limit=20):
+        """生成采样报告文本"""
+        lines = [f"采样数: {self.total_samples} (间隔 {self.interval * 1000:.1f}ms)"]
+        for (filename, lineno, name), count in self.samples.most_common(limit):
+            share = count / self.total_samples * 100 if self.total_samples else 0
+            lines.append(f"  {share:5.1f}%  {name}  ({filename}:{lineno})")
+        return "\n".join(lines)
+
+
+def profile_call(func, mode='cprofile', output=None, limit=20):
+    """
+    在分析器下运行 func
+    参数: mode 'cprofile' 或 'sample'；output 为 cProfile 统计文件路径（可用 pstats/snakeviz 查看）
+    返回: (func 的返回值, 报告文本)
+    """
+    if mode == 'cprofile':
+        import cProfile
+        import io
+        import pstats
+
+        profiler = cProfile.Profile()
+        profiler.enable()
+        try:
+            value = func()
+        finally:
+            profiler.disable()
+        if output:
+            profiler.dump_stats(output)
+        stream = io.StringIO()
+        pstats.Stats(profiler, stream=stream).sort_stats('cumulative').print_stats(limit)
+        return value, stream.getvalue()
+
+    if mode == 'sample':
+        profiler = SamplingProfiler()
+        profiler.start()
+        try:
+            value = func()
+        finally:
+            profiler.stop()
+        report = profiler.report(limit)
+        if output:
+            with open(output, 'w', encoding='utf-8') as f:
+                f.write(report)
+        return value, report
+
+    raise ValueError(f"未知的分析模式: {mode}")
+
+
+STARTUP_BUDGET = 0.1  # 冷启动预算（秒）：导入证明器并证明一个小问题比空解释器多花的时间
+STARTUP_STATEMENT = "from resolution import prove; prove('P(a)\\ngoal: ¬P(x)')"
+HEAVY_MODULES = ('numpy', 'cProfile', 'pstats', 'asyncio', 'multiprocessing', 'concurrent.futures', 'json')
+
+
+def measure_cold_start(statement=STARTUP_STATEMENT, runs=5, cwd=None):
+    """
+    在新的解释器中反复执行 statement，测量冷启动耗时
+    返回: {'median': 中位数, 'baseline': 空解释器中位数, 'overhead': 两者之差, 'heavy_modules': 被导入的重量级模块}
+    """
+    import statistics
+    import subprocess
+    import time
+
+    probe = (f"{statement}\nimport sys\n"
+             f"print(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))")
+    cwd = cwd or os.path.dirname(os.path.abspath(__file__))
+
+    def timed(code):
+        start = time.perf_counter()
+        completed = subprocess.run([sys.executable, "-c", code], cwd=cwd, capture_output=True,
+                                   text=True, check=True)
+        return time.perf_counter() - start, completed.stdout.strip()
+
+    baseline = statistics.median(timed("pass")[0] for _ in range(runs))
+    samples = [timed(probe) for _ in range(runs)]
+    median = statistics.median(elapsed for elapsed, _ in samples)
+    heavy = samples[-1][1]
+    return {
+        'median': median,
+        'baseline': baseline,
+        'overhead': median - baseline,
+        'heavy_modules': heavy.split(',') if heavy else []
+    }
+
+
+if __name__ == "__main__":
+    # 冷启动基准：超出预算或导入了重量级模块时以非零状态退出
+    report = measure_cold_start()
+    print(f"冷启动: {report['median'] * 1000:.1f}ms (空解释器 {report['baseline'] * 1000:.1f}ms, "
+          f"额外 {report['overhead'] * 1000:.1f}ms, 预算 {STARTUP_BUDGET * 1000:.0f}ms)")
+    if report['heavy_modules']:
+        print(f"启动时导入了重量级模块: {', '.join(report['heavy_modules'])}")
+    sys.exit(0 if report['overhead'] <= STARTUP_BUDGET and not report['heavy_modules'] else 1)
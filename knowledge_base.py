@@ -0,0 +1,307 @@
+# knowledge_base.py
+"""
+增量知识库（记录推导依赖的子句存储）
+事实不断到达或失效时不必每次重建 ResolutionProver：
+- 每个子句记录它的推导依据（一对父子句 id），同一个子句的多种推导都会记录
+- 加入子句时只把新子句放入待处理队列，给定子句只与已处理的子句归结，已有子句之间的归结不会重做；
+  队列中文字少的子句优先，新事实和查询目标不会排在之前没有处理完的长子句后面
+- 撤销输入子句时按真值维护（TMS）的方式删除依赖它的子句：沿依赖关系找到受影响的子句，
+  仍能由其余输入子句经某个推导依据推出的子句保留，其余删除，不需要重新推理
+- 每次更新记录耗时，统计中给出每个事实的平均和最大更新延迟
+"""
+
+import heapq
+import time
+from clause import Clause
+from preprocess import variant_key
+from resolution import ResolutionProver
+from result import ProofResult
+from unification import Unifier
+
+
+UPDATE_KINDS = ('add', 'retract')
+
+
+class Node:
+    """存储中的一个子句及其推导依据"""
+
+    __slots__ = ('clause', 'premise', 'justifications', 'dependents', 'processed')
+
+    def __init__(self, clause):
+        self.clause = clause
+        self.premise = False  # 是否是输入子句
+        self.justifications = []  # 推导依据：(父子句 id, 父子句 id)
+        self.dependents = set()  # 以它为父子句的子句 id
+        self.processed = False  # 是否已经作为给定子句与已处理的子句归结
+
+
+class KnowledgeBase:
+    """支持增量加入和撤销子句的归结知识库"""
+
+    def __init__(self, max_steps=2000, tautology_mode='syntactic'):
+        self.max_steps = max_steps  # 每次更新最多产生的归结式数，超出时剩余的子句留在队列中
+        self.nodes = {}  # 子句 id -> Node
+        self.keys = {}  # 子句去重键 -> 子句 id
+        self.premises = {}  # 输入子句的变体键 -> 子句 id
+        self.index = {}  # (谓词, 是否否定) -> {子句 id: [文字]}，只索引已处理的子句
+        self.agenda = []  # 待处理子句的堆 (文字数, 子句 id)
+        self.var_counter = {'x': 0}
+        self.next_id = 0
+        self.checker = ResolutionProver()  # 只用来做重言式检测
+        self.checker.tautology_mode = tautology_mode
+        self.statistics = dict.fromkeys(('resolvents', 'tautologies', 'justifications', 'removed'), 0)
+        self.updates = {kind: {'updates': 0, 'facts': 0, 'time': 0.0, 'latency_max': 0.0}
+                        for kind in UPDATE_KINDS}
+
+    @property
+    def consistent(self):
+        """知识库中是否没有推出空子句"""
+        return frozenset() not in self.keys
+
+    def clauses(self):
+        """当前存储的所有子句（输入子句和推出的子句）"""
+        return [node.clause for node in self.nodes.values()]
+
+    def add(self, clauses, budget=None):
+        """
+        加入输入子句（通常是新事实）并饱和它们的推论；已经加入的子句（只差变量名）被忽略
+        参数: clauses 子句或子句列表
+        返回: 更新报告 {'status', 'facts', 'added', 'derived', 'latency'}，status 为 'proved'（知识库不一致）、
+              'saturated'、'max_steps' 或预算超出的原因
+        """
+        start_time = time.perf_counter()
+        clauses = [clauses] if isinstance(clauses, Clause) else list(clauses)
+        if budget is not None:
+            budget.start()
+        created = self.next_id
+        added = self._add_premises(clauses)
+        status = self._saturate(budget)
+        report = {'status': status, 'facts': len(clauses), 'added': len(added),
+                  'derived': self.next_id - created - len(added)}
+        return self._record('add', report, start_time)
+
+    def retract(self, clauses):
+        """
+        撤销输入子句，删除只能由它们推出的子句
+        参数: clauses 子句或子句列表（与加入时只差变量名即可）
+        返回: 更新报告 {'facts', 'removed', 'latency'}，removed 包括被撤销的子句本身
+        """
+        start_time = time.perf_counter()
+        clauses = [clauses] if isinstance(clauses, Clause) else list(clauses)
+        roots = []
+        for clause in clauses:
+            node_id = self.premises.pop(variant_key(clause), None)
+            if node_id is None:
+                raise ValueError(f"知识库中没有这个输入子句: {clause}")
+            self.nodes[node_id].premise = False
+            roots.append(node_id)
+        removed = self._withdraw(roots)
+        return self._record('retract', {'facts': len(clauses), 'removed': len(removed)}, start_time)
+
+    def ask(self, goals, budget=None):
+        """
+        查询：临时加入目标子句（结论的否定）并饱和，推出空子句即证明成功；
+        结束后撤销目标子句和依赖它们的推论，知识库中只保留与目标无关的推理结果。
+        知识库本身不一致时任何查询都证明成功
+        返回: ProofResult
+        """
+        start_time = time.time()
+        if budget is not None:
+            budget.start()
+        created = self.next_id
+        added = self._add_premises(goals)
+        status = self._saturate(budget)
+        derived = self.next_id - created - len(added)
+        for node_id in added:
+            self.premises.pop(variant_key(self.nodes[node_id].clause), None)
+            self.nodes[node_id].premise = False
+        removed = self._withdraw(added)
+
+        statistics = {
+            'derived': derived,
+            'removed': len(removed),
+            'total_clauses': len(self.nodes),
+            'pending': len(self.agenda),
+            'duration': time.time() - start_time
+        }
+        if status == 'proved':
+            return ProofResult(ProofResult.PROVED, None, statistics)
+        if status == 'saturated':
+            return ProofResult(ProofResult.SATURATED, None, statistics)
+        return ProofResult(ProofResult.UNKNOWN, status, statistics)
+
+    def _add_premises(self, clauses):
+        """登记输入子句，返回新登记的子句 id 列表"""
+        added = []
+        for clause in clauses:
+            key = variant_key(clause)
+            if key in self.premises:
+                continue
+            standardized = clause.standardize_variables(self.var_counter)
+            node_id = self.keys.get(ResolutionProver.clause_key(standardized.literals))
+            if node_id is None:
+                node_id = self._store(standardized)
+            self.nodes[node_id].premise = True
+            self.premises[key] = node_id
+            added.append(node_id)
+        return added
+
+    def _store(self, clause):
+        """存储新子句并放入待处理队列"""
+        clause.id = self.next_id
+        self.next_id += 1
+        self.nodes[clause.id] = Node(clause)
+        self.keys[ResolutionProver.clause_key(clause.literals)] = clause.id
+        heapq.heappush(self.agenda, (len(clause.literals), clause.id))
+        return clause.id
+
+    def _derive(self, literals, parent1, parent2):
+        """
+        记录一次推导：新子句被存储，已有的子句只增加一条推导依据
+        返回: 是否产生了新子句
+        """
+        justification = (parent1, parent2)
+        node_id = self.keys.get(ResolutionProver.clause_key(literals))
+        if node_id is not None:
+            node = self.nodes[node_id]
+            if node_id not in justification and justification not in node.justifications:
+                node.justifications.append(justification)
+                self.nodes[parent1].dependents.add(node_id)
+                self.nodes[parent2].dependents.add(node_id)
+                self.statistics['justifications'] += 1
+            return False
+
+        node_id = self._store(Clause(literals, {'parent1': parent1, 'parent2': parent2}))
+        self.nodes[node_id].justifications.append(justification)
+        self.nodes[parent1].dependents.add(node_id)
+        self.nodes[parent2].dependents.add(node_id)
+        return True
+
+    def _saturate(self, budget=None):
+        """
+        给定子句循环：队列中的子句依次与已处理的子句归结，处理完后加入索引
+        返回: 'proved'、'saturated'、'max_steps' 或预算超出的原因
+        """
+        produced = 0
+        check_interval = budget.check_interval if budget is not None else None
+        while self.agenda:
+            if not self.consistent:
+                return 'proved'
+            _, given_id = heapq.heappop(self.agenda)
+            given = self.nodes[given_id].clause
+            given_variables = given.variables()
+            stopped = None
+            for k, literal in enumerate(given.literals):
+                for other_id, other_literals in self.index.get((literal.predicate, not literal.negated), {}).items():
+                    other = self.nodes[other_id].clause
+                    literals2 = given.literals
+                    if given_variables and not given_variables.isdisjoint(other.variables()):
+                        literals2 = given.rename_apart(self.var_counter)
+                    for other_literal in other_literals:
+                        substitution = Unifier.unify_literals(other_literal, literals2[k])
+                        if substitution is None:
+                            continue
+                        literals = ResolutionProver.resolvent_literals(
+                            other.literals, literals2, other_literal, literals2[k], substitution)
+                        if self.checker.is_tautology_literals(literals):
+                            self.statistics['tautologies'] += 1
+                            continue
+                        produced += 1
+                        self.statistics['resolvents'] += 1
+                        if self._derive(literals, other_id, given_id) and not literals:
+                            stopped = 'proved'
+                        elif self.max_steps is not None and produced >= self.max_steps:
+                            stopped = 'max_steps'
+                        elif budget is not None and produced % check_interval == 0:
+                            stopped = budget.exceeded(len(self.nodes))
+                        if stopped:
+                            break
+                    if stopped:
+                        break
+                if stopped:
+                    break
+            if stopped:
+                # 没有处理完的给定子句放回队列，下次更新时重新处理（重复的推导只增加推导依据）
+                heapq.heappush(self.agenda, (len(given.literals), given_id))
+                return stopped
+
+            self.nodes[given_id].processed = True
+            for literal in given.literals:
+                self.index.setdefault((literal.predicate, literal.negated), {}).setdefault(
+                    given_id, []).append(literal)
+        return 'saturated' if self.consistent else 'proved'
+
+    def _withdraw(self, roots):
+        """
+        删除失去支持的子句：受影响的子句（roots 及依赖它们的子句）中，
+        输入子句、或者有一条父子句都不受影响或已经重新得到支持的推导依据的子句保留
+        返回: 删除的子句 id 集合
+        """
+        affected = set(roots)
+        order = list(roots)
+        for node_id in order:
+            for dependent in self.nodes[node_id].dependents:
+                if dependent not in affected:
+                    affected.add(dependent)
+                    order.append(dependent)
+
+        # 只从有根的支持出发传播，依赖关系中的环不会互相支持
+        supported = set()
+        changed = True
+        while changed:
+            changed = False
+            for node_id in order:
+                if node_id in supported:
+                    continue
+                node = self.nodes[node_id]
+                if node.premise or any(all(parent not in affected or parent in supported for parent in justification)
+                                       for justification in node.justifications):
+                    supported.add(node_id)
+                    changed = True
+
+        removed = affected - supported
+        for node_id in removed:
+            node = self.nodes.pop(node_id)
+            del self.keys[ResolutionProver.clause_key(node.clause.literals)]
+            if node.processed:
+                for literal in node.clause.literals:
+                    self.index[(literal.predicate, literal.negated)].pop(node_id, None)
+            for justification in node.justifications:
+                for parent in justification:
+                    if parent in self.nodes:
+                        self.nodes[parent].dependents.discard(node_id)
+        for node_id in supported:
+            node = self.nodes[node_id]
+            node.justifications = [justification for justification in node.justifications
+                                   if not removed.intersection(justification)]
+            node.dependents -= removed
+        if removed:
+            self.agenda = [entry for entry in self.agenda if entry[1] not in removed]
+            heapq.heapify(self.agenda)
+        self.statistics['removed'] += len(removed)
+        return removed
+
+    def _record(self, kind, report, start_time):
+        """记录一次更新的耗时"""
+        latency = time.perf_counter() - start_time
+        report['latency'] = latency
+        updates = self.updates[kind]
+        updates['updates'] += 1
+        updates['facts'] += report['facts']
+        updates['time'] += latency
+        if report['facts']:
+            updates['latency_max'] = max(updates['latency_max'], latency / report['facts'])
+        return report
+
+    def get_statistics(self):
+        """存储规模、推理计数和每个事实的更新延迟"""
+        statistics = dict(self.statistics)
+        statistics['clauses'] = len(self.nodes)
+        statistics['premises'] = len(self.premises)
+        statistics['pending'] = len(self.agenda)
+        statistics['consistent'] = self.consistent
+        for kind, updates in self.updates.items():
+            statistics[f'{kind}_updates'] = updates['updates']
+            statistics[f'{kind}_latency_mean'] = updates['time'] / updates['facts'] if updates['facts'] else 0.0
+            statistics[f'{kind}_latency_max'] = updates['latency_max']
+        return statistics
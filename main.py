@@ -1,12 +1,22 @@
 # main.py
 from clause import Term, Literal, Clause
 from resolution import ResolutionProver
+from result import ProofResult
+from events import ConsoleObserver, HistoryRecorder
 from problems import ProblemBuilder, get_all_problems
 from unification import Unifier
-
-
-def run_optimized_problem(problem_name, clauses, show_steps=False):
-    """运行优化的问题证明过程"""
+import argparse
+import os
+import sys
+import time
+
+
+def run_optimized_problem(problem_name, clauses, show_steps=False, instrument=False,
+                          profile=None, profile_output=None):
+    """
+    运行优化的问题证明过程
+    参数: instrument 记录分阶段耗时；profile 分析模式 ('cprofile' 或 'sample')；profile_output 分析结果文件
+    """
     print(f"\n{'=' * 50}")
     print(f"开始解决 {problem_name} 问题")
     print(f"{'=' * 50}")
@@ -21,20 +31,27 @@ def run_optimized_problem(problem_name, clauses, show_steps=False):
     for i, clause in enumerate(prover.clauses):
         print(f"{i + 1:2d}. {clause}")
 
-    # 设置是否显示详细步骤
-    prover.show_detailed_steps = show_steps
+    # 控制台输出和历史记录通过观察者完成，是否显示详细步骤由控制台观察者决定
+    prover.add_observer(ConsoleObserver(detailed=show_steps))
+    prover.add_observer(HistoryRecorder(prover.history))
+    prover.instrument = instrument
 
     # 执行优化的归结推理
     print(f"\n开始归结推理...")
-    import time
     start_time = time.time()
-    result = prover.two_pointer_resolution()
+    if profile:
+        from instrumentation import profile_call
+        result, profile_report = profile_call(prover.two_pointer_resolution, profile, profile_output)
+    else:
+        result = prover.two_pointer_resolution()
     end_time = time.time()
 
     # 输出结果
     print(f"\n{'=' * 30}")
     if result:
         print(f"✅ {problem_name}: 定理得证！")
+    elif result.status == ProofResult.UNKNOWN:
+        print(f"⏱️  {problem_name}: 资源耗尽，结论未知 ({result.reason})")
     else:
         print(f"❌ {problem_name}: 无法证明定理")
     print(f"{'=' * 30}")
@@ -47,6 +64,25 @@ def run_optimized_problem(problem_name, clauses, show_steps=False):
     print(f"总生成子句数: {stats['total_clauses']}")
     print(f"推理耗时: {duration:.3f}秒")
     print(f"是否找到空子句: {stats['empty_clause_found']}")
+    print(f"子句对: 检查 {stats['pairs_examined']}，剪枝 {stats['pairs_pruned']}")
+    print(f"合一: 成功 {stats['unifications_succeeded']}，失败 {stats['unifications_failed']} "
+          f"(成功率 {stats['unification_success_rate']:.1%})")
+    print(f"新子句: 保留 {stats['clauses_retained']}，重言式 {stats['discarded_tautology']}，"
+          f"重复 {stats['discarded_duplicate']}")
+    print(f"重言式检查: {stats['tautology_checks']} 次 (命中率 {stats['tautology_hit_rate']:.1%})")
+
+    # 分阶段耗时
+    if 'phases' in stats:
+        print("\n分阶段耗时:")
+        for phase, info in stats['phases'].items():
+            print(f"  {phase:12s} {info['time'] * 1000:9.2f}ms  {info['calls']:8d}次")
+
+    # 性能分析报告
+    if profile:
+        print(f"\n性能分析 ({profile}):")
+        print(profile_report)
+        if profile_output:
+            print(f"分析结果已保存: {profile_output}")
 
     # 性能评估
     if stats['total_steps'] < 100:
@@ -106,8 +142,10 @@ def ask_show_steps():
             print("请输入 y 或 n")
 
 
-def main():
+def main(instrument=False, profile=None, profile_output=None):
     """主函数"""
+    options = {'instrument': instrument, 'profile': profile, 'profile_output': profile_output}
+
     print("=" * 70)
     print("        Resolution Theorem Prover - 最终优化版本")
     print("=" * 70)
@@ -132,18 +170,18 @@ def main():
 
         if choice == '1':
             show_steps = ask_show_steps()
-            clauses = ProblemBuilder.create_howling_hounds_optimized()
-            run_optimized_problem("Howling Hounds", clauses, show_steps)
+            clauses = ProblemBuilder.create_howling_hounds_optimized(verbose=True)
+            run_optimized_problem("Howling Hounds", clauses, show_steps, **options)
 
         elif choice == '2':
             show_steps = ask_show_steps()
-            clauses = ProblemBuilder.create_drug_dealer_optimized()
-            run_optimized_problem("Drug Dealer (优化版)", clauses, show_steps)
+            clauses = ProblemBuilder.create_drug_dealer_optimized(verbose=True)
+            run_optimized_problem("Drug Dealer (优化版)", clauses, show_steps, **options)
 
         elif choice == '3':
             show_steps = ask_show_steps()
-            clauses = ProblemBuilder.create_simple_test()
-            run_optimized_problem("简单测试", clauses, show_steps)
+            clauses = ProblemBuilder.create_simple_test(verbose=True)
+            run_optimized_problem("简单测试", clauses, show_steps, **options)
 
         elif choice == '4':
             demo_optimized_unification()
@@ -157,8 +195,8 @@ def main():
             for problem_id, problem_info in problems.items():
                 print(f"\n{'=' * 60}")
                 print(f"运行: {problem_info['name']}")
-                clauses = problem_info['builder']()
-                prover, result = run_optimized_problem(problem_info['name'], clauses, show_steps)
+                clauses = problem_info['builder'](verbose=True)
+                prover, result = run_optimized_problem(problem_info['name'], clauses, show_steps, **options)
                 results.append((problem_info['name'], result, prover.steps))
 
             # 显示总结
@@ -179,5 +217,114 @@ def main():
         input("\n按Enter键继续...")
 
 
+def parse_arguments(argv=None):
+    """解析命令行参数；给出问题ID或子句文件时进入批量模式，否则进入交互菜单"""
+    parser = argparse.ArgumentParser(
+        description="Resolution Theorem Prover",
+        epilog=f"内置问题: {', '.join(get_all_problems())}，'all' 表示全部"
+    )
+    parser.add_argument("problems", nargs="*", help="批量模式：要运行的问题ID")
+    parser.add_argument("-i", "--input", action="append", default=[], metavar="FILE",
+                        help="批量模式：子句文件（可重复）")
+    parser.add_argument("-o", "--output", help="批量模式：结果JSONL文件（默认标准输出）")
+    parser.add_argument("-j", "--workers", type=int, help="批量模式：并行进程数（默认CPU核数）")
+
+    strategy = parser.add_argument_group("搜索策略")
+    strategy.add_argument("--selection", choices=ResolutionProver.SELECTION_STRATEGIES, help="子句选择启发式")
+    strategy.add_argument("--sos", action="store_true", default=None, help="启用支持集策略")
+    strategy.add_argument("--max-steps", type=int, help="最大推理步数")
+    strategy.add_argument("--tautology-mode", choices=["syntactic", "extended"],
+                          help="重言式检测：syntactic 完全互补，extended 还丢弃可合一的互补文字（不完备）")
+    strategy.add_argument("--pair-filter", choices=ResolutionProver.PAIR_FILTERS,
+                          help="子句对筛选：scan 逐对检查，bitset 位集签名批量预筛选（安装 NumPy 时向量化）")
+    strategy.add_argument("--preprocess", action="store_true",
+                          help="推理前删除重复、被包含、含纯文字和被阻塞的输入子句")
+    strategy.add_argument("--horn", nargs="?", const="rete", choices=ResolutionProver.HORN_ENGINES,
+                          help="输入是 Horn 子句集时改用 rete 前向链接（默认）或 sld 表格化反向链接")
+    strategy.add_argument("--engine", choices=ResolutionProver.ENGINES,
+                          help="证明引擎：resolution 两两归结（默认），instgen 命题抽象 + 模型引导的实例生成")
+    strategy.add_argument("--sorts", action="store_true",
+                          help="推断参数位置和常量的类型，在合一前剪掉类型不同的等式文字对")
+    strategy.add_argument("--split", nargs="?", type=int, const=2, metavar="N",
+                          help="把不共享变量的文字组（至少 N 个文字，默认 2）拆成命名子句，减小子句宽度")
+    strategy.add_argument("--relevance", action="store_true", help="先只用与目标相关的公理推理（SInE），失败时回退到全部公理")
+    strategy.add_argument("--relevance-depth", type=int, help="相关性过滤的最大选择层数（默认不限）")
+    strategy.add_argument("--relevance-tolerance", type=float, default=1.5, help="相关性过滤的触发容差（默认 1.5）")
+
+    budget = parser.add_argument_group("资源预算")
+    budget.add_argument("--time-limit", type=float, help="每个问题的墙钟时间上限（秒）")
+    budget.add_argument("--memory-limit", type=float, help="常驻内存上限（MB）")
+    budget.add_argument("--max-clauses", type=int, help="存活子句数上限")
+
+    checkpoint = parser.add_argument_group("检查点")
+    checkpoint.add_argument("--checkpoint-dir", metavar="DIR",
+                            help="批量模式：把每个问题的搜索状态写入此目录（定期以及因步数或预算停止时）")
+    checkpoint.add_argument("--checkpoint-interval", type=float, default=60.0,
+                            help="定期写入检查点的间隔（秒，默认 60）")
+    checkpoint.add_argument("--resume", action="store_true",
+                            help="从 --checkpoint-dir 中已有的检查点继续搜索（可以配合更大的 --max-steps）")
+
+    analysis = parser.add_argument_group("性能分析")
+    analysis.add_argument("--instrument", action="store_true", help="记录并显示分阶段耗时")
+    analysis.add_argument("--profile", choices=["cprofile", "sample"], help="交互模式：对每次推理运行性能分析")
+    analysis.add_argument("--profile-output", help="性能分析结果文件（cProfile 为 .prof 统计文件）")
+    return parser.parse_args(argv)
+
+
+def run_batch_mode(args):
+    """批量模式：并行运行问题并输出JSON Lines，返回进程退出码"""
+    # 批量模块（进程池、JSON）只在批量模式下导入，交互模式启动更快
+    from batch import make_jobs, run_batch, summarize
+
+    try:
+        jobs = make_jobs(args.problems, args.input)
+    except ValueError as e:
+        print(f"❌ {e}", file=sys.stderr)
+        return 2
+    if args.checkpoint_dir:
+        os.makedirs(args.checkpoint_dir, exist_ok=True)
+    settings = {
+        'selection': args.selection,
+        'set_of_support': args.sos,
+        'max_steps': args.max_steps,
+        'tautology_mode': args.tautology_mode,
+        'pair_filter': args.pair_filter,
+        'preprocess': args.preprocess,
+        'horn': args.horn,
+        'split': args.split,
+        'engine': args.engine,
+        'sorts': args.sorts,
+        'relevance': {'depth': args.relevance_depth, 'tolerance': args.relevance_tolerance} if args.relevance else None,
+        'instrument': args.instrument,
+        'checkpoint': {
+            'directory': args.checkpoint_dir,
+            'interval': args.checkpoint_interval,
+            'resume': args.resume
+        } if args.checkpoint_dir else None,
+        'budget': {
+            'time_limit': args.time_limit,
+            'memory_limit': int(args.memory_limit * 2 ** 20) if args.memory_limit else None,
+            'max_clauses': args.max_clauses
+        }
+    }
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as output:
+            records = run_batch(jobs, settings, args.workers, output)
+    else:
+        records = run_batch(jobs, settings, args.workers)
+
+    return 1 if summarize(records).get('error') else 0
+
+
+def cli(argv=None):
+    """命令行入口（安装后的 resolution-prover 命令）"""
+    args = parse_arguments(argv)
+    if args.problems or args.input:
+        return run_batch_mode(args)
+    main(instrument=args.instrument, profile=args.profile, profile_output=args.profile_output)
+    return 0
+
+
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    sys.exit(cli())
\ No newline at end of file
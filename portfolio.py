@@ -0,0 +1,163 @@
+# portfolio.py
+"""
+策略组合运行器
+在多个进程中并行运行不同配置的 ResolutionProver，采用最先得到的确定结论
+"""
+
+import datetime
+import json
+import multiprocessing
+import os
+import queue
+import time
+from resolution import ResolutionProver
+from result import ProofResult
+
+
+# 默认策略组合：选择启发式 × 支持集策略 × 步数限制
+DEFAULT_CONFIGURATIONS = [
+    {'name': 'fifo', 'selection': 'fifo', 'set_of_support': False, 'max_steps': 2000},
+    {'name': 'fifo-sos', 'selection': 'fifo', 'set_of_support': True, 'max_steps': 2000},
+    {'name': 'shortest', 'selection': 'shortest', 'set_of_support': False, 'max_steps': 5000},
+    {'name': 'shortest-sos', 'selection': 'shortest', 'set_of_support': True, 'max_steps': 5000},
+    {'name': 'lightest', 'selection': 'lightest', 'set_of_support': False, 'max_steps': 5000},
+    {'name': 'lightest-sos', 'selection': 'lightest', 'set_of_support': True, 'max_steps': 5000},
+]
+
+
+def _run_configuration(config, clauses, budget, result_queue):
+    """子进程入口：按配置运行证明器并把结果放入队列"""
+    prover = ResolutionProver()
+    prover.configure(
+        selection=config.get('selection'),
+        set_of_support=config.get('set_of_support'),
+        max_steps=config.get('max_steps')
+    )
+    for clause in clauses:
+        prover.add_clause(clause)
+
+    result = prover.two_pointer_resolution(budget)
+
+    result_queue.put((config['name'], result))
+
+
+class PortfolioRunner:
+    """策略组合运行器"""
+
+    def __init__(self, configurations=None, budget=None, processes=None, record_file=None):
+        self.configurations = configurations if configurations is not None else DEFAULT_CONFIGURATIONS
+        self.budget = budget  # 每个配置使用的资源预算
+        self.processes = processes or os.cpu_count() or 1  # 同时运行的最大进程数
+        self.record_file = record_file  # 记录每次运行胜出配置的JSONL文件
+
+        names = [config['name'] for config in self.configurations]
+        if len(set(names)) != len(names):
+            raise ValueError("策略配置名称必须唯一")
+
+    def run(self, clauses, problem_name=None):
+        """
+        并行运行所有配置
+        返回: {'result': ProofResult, 'winner': 配置名或None, 'results': {配置名: ProofResult}, 'duration': 秒}
+        """
+        start_time = time.time()
+        result_queue = multiprocessing.Queue()
+        pending = list(self.configurations)
+        running = {}  # 配置名 -> 进程
+        results = {}
+        winner = None
+
+        try:
+            while pending or running:
+                # 启动新进程直到达到并行上限
+                while pending and len(running) < self.processes:
+                    config = pending.pop(0)
+                    process = multiprocessing.Process(
+                        target=_run_configuration,
+                        args=(config, clauses, self.budget, result_queue),
+                        daemon=True
+                    )
+                    process.start()
+                    running[config['name']] = process
+
+                try:
+                    name, result = result_queue.get(timeout=0.1)
+                except queue.Empty:
+                    # 检查是否有进程异常退出（没有放入结果）
+                    for name, process in list(running.items()):
+                        if not process.is_alive() and process.exitcode != 0:
+                            results[name] = ProofResult(ProofResult.UNKNOWN, 'crashed')
+                            del running[name]
+                    continue
+
+                results[name] = result
+                running.pop(name).join()
+
+                # 第一个确定的结论胜出
+                if result.is_definitive:
+                    winner = name
+                    break
+        finally:
+            # 取消其余仍在运行的配置
+            for process in running.values():
+                process.terminate()
+            for process in running.values():
+                process.join()
+
+        for config in self.configurations:
+            if config['name'] not in results:
+                results[config['name']] = ProofResult(ProofResult.UNKNOWN, 'cancelled')
+
+        if winner is not None:
+            final_result = results[winner]
+        else:
+            final_result = ProofResult(ProofResult.UNKNOWN, 'portfolio_exhausted')
+
+        outcome = {
+            'result': final_result,
+            'winner': winner,
+            'results': results,
+            'duration': time.time() - start_time
+        }
+
+        if self.record_file:
+            self.record(outcome, problem_name)
+
+        return outcome
+
+    def record(self, outcome, problem_name=None):
+        """把一次运行的胜出配置追加到记录文件（JSON Lines）"""
+        record = {
+            'time': datetime.datetime.now().isoformat(),
+            'problem': problem_name,
+            'winner': outcome['winner'],
+            'status': outcome['result'].status,
+            'duration': outcome['duration'],
+            'configurations': {
+                name: {
+                    'status': result.status,
+                    'reason': result.reason,
+                    'steps': result.statistics.get('total_steps'),
+                    'duration': result.statistics.get('duration')
+                }
+                for name, result in outcome['results'].items()
+            }
+        }
+        with open(self.record_file, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+
+def summarize_records(record_file):
+    """
+    统计记录文件中各配置的胜出次数，用于调优默认策略
+    返回: {配置名: 胜出次数}，按次数降序
+    """
+    wins = {}
+    with open(record_file, encoding='utf-8') as f:
+        for line in f:
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            winner = record.get('winner')
+            if winner is not None:
+                wins[winner] = wins.get(winner, 0) + 1
+    return dict(sorted(wins.items(), key=lambda item: item[1], reverse=True))
@@ -0,0 +1,188 @@
+# prefilter.py
+"""
+子句对位集预筛选
+每个子句有四组位集签名：(谓词, 符号) 位、含变量文字的 (谓词, 符号) 位、基文字的 (谓词, 符号) 位和基原子的哈希位
+一对子句只有在签名与对方的互补签名按位与非零时才可能归结，筛选后的子句对才交给合一
+筛选只会多保留子句对（哈希冲突），不会漏掉可以归结的子句对
+安装了 NumPy 时按块做向量化按位与，否则用 Python 整数位运算
+NumPy 导入较慢，只在第一次需要向量化时导入
+"""
+
+
+WORD_BITS = 64
+ATOM_WORDS = 2  # 基原子哈希位集的字数（128位，哈希冲突只会多保留子句对）
+NUMPY_MIN_CLAUSES = 64  # 子句数少于此值时 Python 位运算更快
+BLOCK_CELLS = 1 << 20  # 向量化时每块处理的 行×列×字 上限，控制临时数组大小
+
+
+_numpy = None  # None 表示还没有尝试导入，False 表示不可用
+_EVEN_MASKS = {}
+
+
+def load_numpy():
+    """按需导入 NumPy（可选依赖），不可用时返回 None"""
+    global _numpy
+    if _numpy is None:
+        try:
+            import numpy
+        except ImportError:
+            numpy = False
+        _numpy = numpy
+    return _numpy or None
+
+
+def _is_ground(term):
+    """项中不含变量"""
+    return not term.is_variable and all(_is_ground(arg) for arg in term.args)
+
+
+def _complement(bits):
+    """交换每对相邻位：(谓词, 肯定) 占偶数位 2k，(谓词, 否定) 占奇数位 2k+1"""
+    even = bits & _even_mask(bits.bit_length() // WORD_BITS + 1)
+    return (even << 1) | ((bits ^ even) >> 1)
+
+
+def _even_mask(words):
+    """words 个字长的 0x5555... 掩码（按字数缓存）"""
+    mask = _EVEN_MASKS.get(words)
+    if mask is None:
+        mask = _EVEN_MASKS[words] = int('01' * (words * WORD_BITS // 2), 2)
+    return mask
+
+
+class PairFilter:
+    """
+    子句对预筛选器
+    签名按子句 id 缓存，谓词位在第一次遇到时分配，同一个筛选器可以在多次迭代中复用
+    """
+
+    def __init__(self, use_numpy=None):
+        if use_numpy and load_numpy() is None:
+            raise ImportError("预筛选的向量化模式需要 NumPy")
+        self.use_numpy = use_numpy  # None 表示子句足够多且 NumPy 可用时自动使用
+        self.backend = 'python'  # 最近一次筛选使用的实现
+        self.predicate_bits = {}  # 谓词 -> 位编号（肯定为 2k，否定为 2k+1）
+        self.signatures = {}  # 子句 id -> (谓词位, 含变量文字位, 基文字位, 基原子位, 对应的四个互补位集)
+        self.candidates = 0  # 通过筛选的子句对数
+        self.rejected = 0  # 被筛掉的子句对数
+
+    def _predicate_bit(self, predicate, negated):
+        index = self.predicate_bits.get(predicate)
+        if index is None:
+            index = self.predicate_bits[predicate] = len(self.predicate_bits)
+        return 1 << (2 * index + negated)
+
+    def signature(self, clause):
+        """计算（或取缓存的）子句签名"""
+        cached = self.signatures.get(clause.id)
+        if cached is not None:
+            return cached
+
+        predicates = nonground = ground = atoms = complement_atoms = 0
+        atom_bits = ATOM_WORDS * WORD_BITS
+        for literal in clause.literals:
+            bit = self._predicate_bit(literal.predicate, literal.negated)
+            predicates |= bit
+            if not all(_is_ground(term) for term in literal.terms):
+                nonground |= bit
+            else:
+                ground |= bit
+                # 基文字只能与含变量的互补文字或完全相同的互补基原子归结
+                atom = literal.atom()
+                atoms |= 1 << (hash((atom, literal.negated)) % atom_bits)
+                complement_atoms |= 1 << (hash((atom, not literal.negated)) % atom_bits)
+
+        cached = (predicates, nonground, ground, atoms,
+                  _complement(predicates), _complement(nonground), _complement(ground), complement_atoms)
+        self.signatures[clause.id] = cached
+        return cached
+
+    def discard(self, clause):
+        """删除子句的签名缓存（子句被删除后它的 id 可能被新对象复用）"""
+        self.signatures.pop(clause.id, None)
+
+    def candidate_pairs(self, clauses):
+        """
+        返回可能归结的子句对下标 (i, j)，i < j，按 (i, j) 的字典序排列（与逐对扫描的顺序一致）
+        子句对 (i, j) 保留当且仅当:
+            谓词[i] & 互补含变量[j] 或 含变量[i] & 互补谓词[j] 非零，
+            或者 基文字[i] & 互补基文字[j] 与 基原子[i] & 互补基原子[j] 都非零
+        """
+        signatures = [self.signature(clause) for clause in clauses]
+        n = len(signatures)
+        if n >= NUMPY_MIN_CLAUSES and self.use_numpy is not False and load_numpy() is not None:
+            self.backend = 'numpy'
+            pairs = self._candidate_pairs_numpy(signatures)
+        else:
+            self.backend = 'python'
+            pairs = self._candidate_pairs_python(signatures)
+        self.candidates += len(pairs)
+        self.rejected += n * (n - 1) // 2 - len(pairs)
+        return pairs
+
+    @staticmethod
+    def _candidate_pairs_python(signatures):
+        pairs = []
+        for i, (predicates, nonground, ground, atoms, _, _, _, _) in enumerate(signatures):
+            for j in range(i + 1, len(signatures)):
+                _, _, _, _, complement_predicates, complement_nonground, complement_ground, complement_atoms = \
+                    signatures[j]
+                if predicates & complement_nonground or nonground & complement_predicates or \
+                        (ground & complement_ground and atoms & complement_atoms):
+                    pairs.append((i, j))
+        return pairs
+
+    def _candidate_pairs_numpy(self, signatures):
+        np = load_numpy()
+        n = len(signatures)
+        words = max(1, (2 * len(self.predicate_bits) + WORD_BITS - 1) // WORD_BITS)
+        columns = list(zip(*signatures))
+        (predicates, nonground, ground, atoms,
+         complement_predicates, complement_nonground, complement_ground, complement_atoms) = (
+            _to_words(column, ATOM_WORDS if k in (3, 7) else words) for k, column in enumerate(columns))
+
+        block = max(1, BLOCK_CELLS // n)
+        pairs = []
+        for start in range(0, n - 1, block):
+            stop = min(n - 1, start + block)
+            # 只比较 j > start 的列，块内再用上三角掩码去掉 j <= i
+            rows = slice(start, stop)
+            cols = slice(start + 1, n)
+            hit = (_and_any(predicates, complement_nonground, rows, cols) |
+                   _and_any(nonground, complement_predicates, rows, cols))
+            hit |= (_and_any(ground, complement_ground, rows, cols) &
+                    _and_any(atoms, complement_atoms, rows, cols))
+            hit &= np.arange(start + 1, n)[None, :] > np.arange(start, stop)[:, None]
+            ii, jj = np.nonzero(hit)
+            pairs.extend(zip((ii + start).tolist(), (jj + start + 1).tolist()))
+        return pairs
+
+    def get_statistics(self):
+        """筛选统计"""
+        total = self.candidates + self.rejected
+        return {
+            'prefilter_backend': self.backend,
+            'prefilter_candidates': self.candidates,
+            'prefilter_rejected': self.rejected,
+            'prefilter_reject_rate': self.rejected / total if total else 0.0
+        }
+
+
+def _to_words(bitsets, words):
+    """把 Python 整数位集转换为 (字数, 子句数) 的 uint64 数组，每个字是一行连续内存"""
+    np = load_numpy()
+    mask = (1 << WORD_BITS) - 1
+    return np.array([[(bits >> (WORD_BITS * w)) & mask for bits in bitsets] for w in range(words)],
+                    dtype=np.uint64).reshape(words, len(bitsets))
+
+
+def _and_any(left, right, rows, cols):
+    """
+    left[:, rows] 与 right[:, cols] 两两按位与后是否非零，返回 (行数, 列数) 的布尔矩阵
+    逐字做二维广播再按位或，避免在很短的字维度上归约
+    """
+    combined = None
+    for w in range(left.shape[0]):
+        part = left[w, rows, None] & right[w, None, cols]
+        combined = part if combined is None else combined | part
+    return combined != 0
@@ -0,0 +1,168 @@
+# preprocess.py
+"""
+子句集预处理
+在推理开始前删除不可能参与反驳的冗余子句，每一步都保持可满足性不变：
+- duplicates: 删除重复子句（只差变量重命名的子句视为相同）
+- subsumption: 删除被其他输入子句包含的子句
+- pure_literal: 删除含纯文字的子句（谓词只以一种符号出现，没有可以与之归结的文字）
+- blocked: 删除被阻塞的子句（在某个文字上与所有子句的归结式都是重言式）
+等式谓词与内建的自反性可以归结，回答文字 $answer 用于提取回答，纯文字和阻塞检查不考虑这两种文字
+"""
+
+import time
+from answers import ANSWER_PREDICATE
+from rewriting import EQUALITY_PREDICATE
+from subsumption import clause_features, subsumes
+from unification import Unifier
+
+
+PASSES = ('duplicates', 'subsumption', 'pure_literal', 'blocked')
+
+
+def variant_key(clause):
+    """与变量名无关的子句键：变量按出现顺序重命名后的文字集合"""
+    return frozenset(clause.standardize_variables({'x': 0}).literals)
+
+
+def _complementary_pair(literals):
+    """文字列表中是否有同一原子的肯定和否定"""
+    positive = set()
+    negative = set()
+    for literal in literals:
+        (negative if literal.negated else positive).add(literal.atom())
+    return not positive.isdisjoint(negative)
+
+
+class Preprocessor:
+    """可配置的预处理流水线"""
+
+    def __init__(self, passes=PASSES, blocked_rounds=3):
+        for name in passes:
+            if name not in PASSES:
+                raise ValueError(f"未知的预处理步骤: {name}")
+        self.passes = tuple(passes)  # 按顺序执行的步骤
+        self.blocked_rounds = blocked_rounds  # 阻塞子句消除最多重复几轮（删除子句后其他子句可能变为被阻塞）
+
+    def run(self, clauses, support=None, var_counter=None):
+        """
+        对子句列表依次执行各步骤
+        参数: support 支持集子句 id 集合（会被就地更新）；var_counter 变量编号，阻塞检查时用于重命名
+        返回: (保留的子句列表, {步骤: {'removed': 删除数, 'time': 耗时}})
+        """
+        support = support if support is not None else set()
+        var_counter = var_counter if var_counter is not None else {'x': 0}
+        statistics = {}
+        for name in self.passes:
+            start_time = time.perf_counter()
+            before = len(clauses)
+            if name == 'duplicates':
+                clauses = self.remove_duplicates(clauses, support)
+            elif name == 'subsumption':
+                clauses = self.remove_subsumed(clauses, support)
+            elif name == 'pure_literal':
+                clauses = self.remove_pure(clauses)
+            else:
+                clauses = self.remove_blocked(clauses, var_counter)
+            statistics[name] = {'removed': before - len(clauses), 'time': time.perf_counter() - start_time}
+
+        kept = {clause.id for clause in clauses}
+        support.intersection_update(kept)
+        return clauses, statistics
+
+    @staticmethod
+    def remove_duplicates(clauses, support):
+        """删除重复子句，保留第一次出现的子句（被删除的目标子句把支持集身份交给保留的子句）"""
+        first = {}
+        kept = []
+        for clause in clauses:
+            key = variant_key(clause)
+            original = first.get(key)
+            if original is None:
+                first[key] = clause
+                kept.append(clause)
+            elif clause.id in support:
+                support.add(original.id)
+        return kept
+
+    @staticmethod
+    def remove_subsumed(clauses, support):
+        """删除被其他子句包含的子句（短子句先检查；被包含的目标子句由包含它的子句继承支持集身份）"""
+        order = sorted(clauses, key=lambda clause: len(clause.literals))
+        features = {clause.id: clause_features(clause.literals) for clause in clauses}
+        kept = []
+        removed = set()
+        for clause in order:
+            subsumer = None
+            for other in kept:
+                if features[other.id] <= features[clause.id] and subsumes(other.literals, clause.literals):
+                    subsumer = other
+                    break
+            if subsumer is None:
+                kept.append(clause)
+            else:
+                removed.add(clause.id)
+                if clause.id in support:
+                    support.add(subsumer.id)
+        return [clause for clause in clauses if clause.id not in removed]
+
+    @staticmethod
+    def remove_pure(clauses):
+        """反复删除含纯文字的子句，直到没有纯文字"""
+        while True:
+            polarities = set()
+            for clause in clauses:
+                for literal in clause.literals:
+                    polarities.add((literal.predicate, literal.negated))
+
+            def is_pure(literal):
+                return literal.predicate not in (EQUALITY_PREDICATE, ANSWER_PREDICATE) and \
+                    (literal.predicate, not literal.negated) not in polarities
+
+            kept = [clause for clause in clauses if not any(is_pure(literal) for literal in clause.literals)]
+            if len(kept) == len(clauses):
+                return kept
+            clauses = kept
+
+    def remove_blocked(self, clauses, var_counter):
+        """删除被阻塞的子句，最多重复 blocked_rounds 轮"""
+        for _ in range(self.blocked_rounds):
+            index = {}  # (谓词, 是否否定) -> [(子句, 文字)]
+            for clause in clauses:
+                for literal in clause.literals:
+                    index.setdefault((literal.predicate, literal.negated), []).append((clause, literal))
+
+            blocked = set()
+            for clause in clauses:
+                renamed = clause.rename_apart(var_counter)
+                for literal in renamed:
+                    if literal.predicate not in (EQUALITY_PREDICATE, ANSWER_PREDICATE) and \
+                            self.blocks(renamed, literal, index.get((literal.predicate, not literal.negated), ()),
+                                        blocked):
+                        blocked.add(clause.id)
+                        break
+            if not blocked:
+                break
+            clauses = [clause for clause in clauses if clause.id not in blocked]
+        return clauses
+
+    @staticmethod
+    def blocks(literals, literal, partners, removed):
+        """
+        检查 literal 是否阻塞子句 literals（literals 与其他子句的变量已经分开）
+        对每个与 literal 可合一的互补文字 L'，要求归结式在不考虑 L' 所在子句中与 L' 同谓词同符号的文字时
+        仍是重言式：这样同时与多个这类文字归结（因子化）得到的归结式也都是重言式
+        """
+        rest = [other for other in literals if other is not literal]
+        for clause, partner in partners:
+            if clause.id in removed:
+                continue
+            substitution = Unifier.unify_literals(literal, partner)
+            if substitution is None:
+                continue
+            apply = Unifier.apply_substitution_to_literal
+            resolvent = [apply(other, substitution) for other in rest]
+            resolvent.extend(apply(other, substitution) for other in clause.literals
+                             if other.predicate != partner.predicate or other.negated != partner.negated)
+            if not _complementary_pair(resolvent):
+                return False
+        return True
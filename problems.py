@@ -1,7 +1,7 @@
 # problems.py
 """
 一阶逻辑问题定义 - 高度优化版本
-确保在合理步数内完成推理
+确保在合理步数内完成推理；构建问题时默认不输出，交互界面传入 verbose=True 显示子句
 """
 
 from clause import Term, Literal, Clause
@@ -11,9 +11,10 @@ class ProblemBuilder:
     """问题构建器，高度优化问题建模"""
 
     @staticmethod
-    def create_howling_hounds_optimized():
+    def create_howling_hounds_optimized(verbose=False):
         """高度优化的Howling Hounds问题"""
-        print("构建高度优化的 Howling Hounds 问题...")
+        if verbose:
+            print("构建高度优化的 Howling Hounds 问题...")
 
         # 使用最少的变量和简单的常量名
         x = Term("x", is_variable=True)
@@ -46,18 +47,17 @@ class ProblemBuilder:
         clauses.append(Clause([Literal("Hound", [animal])]))
 
         # 要证明结论的否定: John有老鼠
-        clauses.append(Clause([Literal("HasMouse", [john])]))
-
-        print(f"构建完成，共 {len(clauses)} 个子句")
-        for i, clause in enumerate(clauses, 1):
-            print(f"{i}. {clause}")
+        clauses.append(Clause([Literal("HasMouse", [john])], source='goal'))
 
+        if verbose:
+            print_clauses(clauses)
         return clauses
 
     @staticmethod
-    def create_drug_dealer_optimized():
+    def create_drug_dealer_optimized(verbose=False):
         """优化的Drug dealer问题 - 修复版本"""
-        print("\n构建优化的 Drug Dealer 问题...")
+        if verbose:
+            print("\n构建优化的 Drug Dealer 问题...")
 
         clauses = []
 
@@ -116,18 +116,17 @@ class ProblemBuilder:
         clauses.append(Clause([
             Literal("CustomsOfficial", [x], negated=True),
             Literal("DrugDealer", [x], negated=True)
-        ]))
-
-        print(f"构建完成，共 {len(clauses)} 个子句")
-        for i, clause in enumerate(clauses, 1):
-            print(f"{i}. {clause}")
+        ], source='goal'))
 
+        if verbose:
+            print_clauses(clauses)
         return clauses
 
     @staticmethod
-    def create_simple_test():
+    def create_simple_test(verbose=False):
         """创建简单测试用例"""
-        print("构建简单测试用例...")
+        if verbose:
+            print("构建简单测试用例...")
 
         clauses = []
 
@@ -135,11 +134,84 @@ class ProblemBuilder:
         clauses.append(Clause([Literal("P", [])]))
 
         # ¬P
-        clauses.append(Clause([Literal("P", [], negated=True)]))
+        clauses.append(Clause([Literal("P", [], negated=True)], source='goal'))
+
+        if verbose:
+            print(f"构建完成，共 {len(clauses)} 个子句")
+        return clauses
+
+    @staticmethod
+    def create_transitive_chain(length=20, verbose=False):
+        """
+        创建 Horn 子句集：长度为 length 的链上的可达关系，目标是链首到链尾可达
+        推出的 Path 事实约为 length² / 2 个，用于比较前向链接和归结的吞吐量
+        """
+        x = Term("x", is_variable=True)
+        y = Term("y", is_variable=True)
+        z = Term("z", is_variable=True)
+        nodes = [Term(f"n{i}") for i in range(length + 1)]
+
+        clauses = [Clause([Literal("Edge", [nodes[i], nodes[i + 1]])]) for i in range(length)]
+        # Edge(x, y) → Path(x, y)
+        clauses.append(Clause([Literal("Edge", [x, y], negated=True), Literal("Path", [x, y])]))
+        # Edge(x, y) ∧ Path(y, z) → Path(x, z)
+        clauses.append(Clause([
+            Literal("Edge", [x, y], negated=True),
+            Literal("Path", [y, z], negated=True),
+            Literal("Path", [x, z])
+        ]))
+        clauses.append(Clause([Literal("Path", [nodes[0], nodes[length]], negated=True)], source='goal'))
 
-        print(f"构建完成，共 {len(clauses)} 个子句")
+        if verbose:
+            print_clauses(clauses)
         return clauses
 
+    @staticmethod
+    def create_pet_registry(dogs=6, verbose=False):
+        """
+        创建带等式的多类型子句集：狗的主人 owner(d) 是人，品种 breed(d) 是品种，都用 Equal 登记，
+        目标是 O0 养了猎犬。两类等式共用 Equal 谓词，用于测量类型检查的剪枝率
+        """
+        x = Term("x", is_variable=True)
+        y = Term("y", is_variable=True)
+        z = Term("z", is_variable=True)
+        hound = Term("Hound")
+        breeds = [hound, Term("Terrier")]
+
+        clauses = []
+        for i in range(dogs):
+            dog = Term(f"D{i}")
+            clauses.append(Clause([Literal("Dog", [dog])]))
+            # Dog(d) → Equal(owner(d), O) / Equal(breed(d), B)（带条件的等式不作为重写规则）
+            clauses.append(Clause([Literal("Dog", [dog], negated=True),
+                                   Literal("Equal", [Term("owner", False, [dog]), Term(f"O{i % 3}")])]))
+            clauses.append(Clause([Literal("Dog", [dog], negated=True),
+                                   Literal("Equal", [Term("breed", False, [dog]), breeds[i % 2]])]))
+        # Equal(owner(x), y) → Owns(y, x)
+        clauses.append(Clause([Literal("Equal", [Term("owner", False, [x]), y], negated=True),
+                               Literal("Owns", [y, x])]))
+        # Equal(breed(x), z) → HasBreed(x, z)
+        clauses.append(Clause([Literal("Equal", [Term("breed", False, [x]), z], negated=True),
+                               Literal("HasBreed", [x, z])]))
+        # Owns(y, x) ∧ HasBreed(x, Hound) → HoundOwner(y)
+        clauses.append(Clause([
+            Literal("Owns", [y, x], negated=True),
+            Literal("HasBreed", [x, hound], negated=True),
+            Literal("HoundOwner", [y])
+        ]))
+        clauses.append(Clause([Literal("HoundOwner", [Term("O0")], negated=True)], source='goal'))
+
+        if verbose:
+            print_clauses(clauses)
+        return clauses
+
+
+def print_clauses(clauses):
+    """打印构建完成的子句列表"""
+    print(f"构建完成，共 {len(clauses)} 个子句")
+    for i, clause in enumerate(clauses, 1):
+        print(f"{i}. {clause}")
+
 
 def get_all_problems():
     """获取所有优化的问题"""
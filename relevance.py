@@ -0,0 +1,92 @@
+# relevance.py
+"""
+面向目标的公理选择（SInE 风格的相关性过滤）
+大知识库中很多公理的符号与目标没有任何联系，先只保留从目标符号出发可以到达的公理再做饱和：
+符号 s 触发公理 A，当且仅当 s 出现在 A 中，并且 s 的出现次数不超过 A 中最少见符号出现次数的 tolerance 倍；
+从目标子句的符号出发逐层选择被触发的公理，被选公理的符号再作为下一层的触发符号
+"""
+
+import time
+
+
+def clause_symbols(clause):
+    """子句中的符号集合：谓词名和非变量项的名字（函数符号和常量）"""
+    symbols = set()
+    for literal in clause.literals:
+        symbols.add(literal.predicate)
+        stack = list(literal.terms)
+        while stack:
+            term = stack.pop()
+            if not term.is_variable:
+                symbols.add(term.name)
+            stack.extend(term.args)
+    return symbols
+
+
+class RelevanceFilter:
+    """SInE 公理选择配置"""
+
+    def __init__(self, depth=None, tolerance=1.5, fallback=True):
+        self.depth = depth  # 最多选择多少层，None 表示直到不再有新公理
+        self.tolerance = tolerance  # 触发容差（>= 1），越大选择的公理越多
+        self.fallback = fallback  # 在选出的公理上没有找到证明时，是否用完整子句集重新推理
+
+    def to_dict(self):
+        """导出过滤配置"""
+        return {'depth': self.depth, 'tolerance': self.tolerance, 'fallback': self.fallback}
+
+    def select(self, clauses, goal_ids):
+        """
+        选择与目标相关的子句
+        参数: clauses 子句列表；goal_ids 目标子句的 id 集合（目标子句总是保留）
+        返回: (选出的子句列表（保持原顺序）, 统计字典)
+        """
+        start_time = time.perf_counter()
+        symbols = [clause_symbols(clause) for clause in clauses]
+
+        # 每个符号出现在多少个子句中
+        occurrences = {}
+        for names in symbols:
+            for symbol in names:
+                occurrences[symbol] = occurrences.get(symbol, 0) + 1
+
+        # 符号 -> 它触发的公理下标
+        triggers = {}
+        for k, (clause, names) in enumerate(zip(clauses, symbols)):
+            if clause.id in goal_ids or not names:
+                continue
+            threshold = self.tolerance * min(occurrences[symbol] for symbol in names)
+            for symbol in names:
+                if occurrences[symbol] <= threshold:
+                    triggers.setdefault(symbol, []).append(k)
+
+        selected = [clause.id in goal_ids or not names for clause, names in zip(clauses, symbols)]
+        seen = set()
+        for k, chosen in enumerate(selected):
+            if chosen:
+                seen.update(symbols[k])
+        frontier = set(seen)
+
+        depth = 0
+        while frontier and (self.depth is None or depth < self.depth):
+            depth += 1
+            reached = set()
+            for symbol in frontier:
+                for k in triggers.get(symbol, ()):
+                    if not selected[k]:
+                        selected[k] = True
+                        reached.update(symbols[k])
+            frontier = reached - seen
+            seen |= reached
+            if not reached:
+                depth -= 1
+                break
+
+        chosen = [clause for clause, keep in zip(clauses, selected) if keep]
+        statistics = {
+            'relevance_input_clauses': len(clauses),
+            'relevance_selected_clauses': len(chosen),
+            'relevance_depth': depth,
+            'relevance_selection_time': time.perf_counter() - start_time
+        }
+        return chosen, statistics
@@ -1,65 +1,329 @@
 # resolution.py
 from clause import Clause, Literal
 from unification import Unifier
-import copy
+from result import ProofResult
+from instrumentation import PhaseTimer
+from prefilter import PairFilter
+from retention import ClauseRetention
+from answers import answer_key, answer_literals, answer_names, is_answer_clause
+from rewriting import RuleSet, Demodulator, EQUALITY_PREDICATE
+from events import (SearchStarted, ResolventProduced, ClauseKept, ClauseDiscarded,
+                    IterationDone, ProofFound, SearchFinished)
+import itertools
+import os
+from operator import itemgetter
 import time
 
 
+def prove(clauses, budget=None, **options):
+    """
+    轻量的一次性证明入口
+    参数: clauses Clause 列表，或子句文本（每行一个子句，格式见 clause_parser）；options 传给 configure()
+    返回: ProofResult
+    """
+    if isinstance(clauses, str):
+        from clause_parser import parse_clauses
+        clauses = parse_clauses(clauses)
+    prover = ResolutionProver()
+    prover.configure(**options)
+    for clause in clauses:
+        prover.add_clause(clause)
+    return prover.two_pointer_resolution(budget)
+
+
+def _literal_shape(literal):
+    """
+    文字的形状和变量名序列：形状是前序的 (符号, 参数个数) 序列，变量记为 ('', -1)
+    返回: (形状元组, 按出现顺序的变量名元组)
+    """
+    shape = [literal.negated, literal.predicate]
+    names = []
+    stack = list(reversed(literal.terms))
+    while stack:
+        term = stack.pop()
+        if term.is_variable:
+            shape.append('')
+            shape.append(-1)
+            names.append(term.name)
+        else:
+            shape.append(term.name)
+            shape.append(len(term.args))
+            stack.extend(reversed(term.args))
+    return tuple(shape), tuple(names)
+
+
 class ResolutionProver:
     """Two-Pointer Resolution定理证明器"""
 
+    SELECTION_STRATEGIES = ('fifo', 'shortest', 'lightest')  # 子句选择启发式
+    PAIR_FILTERS = ('scan', 'bitset')  # 子句对筛选方式
+    HORN_ENGINES = ('rete', 'sld')  # Horn 子句集的求解引擎：前向链接 / 带表格化的反向链接
+    ENGINES = ('resolution', 'instgen')  # 一般子句集的证明引擎：两两归结 / 实例生成（Inst-Gen）
+    BUDGET_REASONS = ('time', 'memory', 'clauses', 'cancelled')  # 预算耗尽导致的 unknown 原因
+
+    # 推理计数器：子句对检查/剪枝、文字对检查、合一成功/失败、重言式检查、子句保留/丢弃
+    COUNTERS = ('pairs_examined', 'pairs_pruned', 'literal_pairs_examined', 'unifications_succeeded',
+                'unifications_failed', 'tautology_checks', 'renamings', 'clauses_retained', 'discarded_tautology',
+                'discarded_duplicate')
+
     def __init__(self):
         self.clauses = []  # 子句集
         self.steps = 0  # 推理步数计数器
         self.history = []  # 推理历史记录
         self.max_steps = 2000  # 增加最大推理步数
-        self.show_detailed_steps = False  # 是否显示详细步骤
+        self.observers = []  # 推理事件观察者（控制台输出、实验记录、指标统计等）
+        self.budget = None  # 资源预算（时间、内存、子句数），None表示不限制
+        self.iterations = 0  # 已完成的迭代次数
+        self.elapsed = 0.0  # 最近一次推理耗时
+        self.selection = 'fifo'  # 子句遍历顺序: 'fifo' 按加入顺序, 'shortest' 文字少的优先, 'lightest' 符号少的优先
+        self.set_of_support = False  # 支持集策略：只归结至少一个子句来自目标的子句对
+        self.support = set()  # 支持集中子句的id
+        self.var_counter = {'x': 0}  # 全局变量编号，保证每个子句的变量范围互不相交
+        self.rewrite_rules = RuleSet()  # 等式重写规则（带项索引）
+        self.demodulator = Demodulator(self.rewrite_rules)
+        self.equality_rules = False  # 是否把可定向的单元等式 Equal(s, t) 作为重写规则（没有调解，不完备）
+        self.instrument = False  # 是否记录分阶段耗时（关闭时只有整数计数器）
+        self.tautology_mode = 'syntactic'  # 重言式检测: 'syntactic' 完全互补, 'extended' 可合一互补（不完备）
+        self.pair_filter = 'scan'  # 子句对筛选: 'scan' 逐对检查互补谓词, 'bitset' 位集签名批量预筛选（有 NumPy 时向量化）
+        self.prefilter = None  # 最近一次推理使用的 PairFilter
+        self.retention_policy = None  # 子句保留策略（retention.RetentionPolicy），None 表示保留所有新子句
+        self.retention = None  # 最近一次推理的保留状态和统计
+        self.splitting = None  # 子句拆分：被命名的分量至少有几个文字，None 表示不拆分
+        self.splitter = None  # 最近一次推理的拆分名字缓存和统计（splitting.ClauseSplitter）
+        self.sort_inference = False  # 是否推断类型，在合一前剪掉类型不同的等式文字对
+        self.sorts = None  # 最近一次推理推断出的类型和剪枝统计（sorts.SortSignature）
+        self.relevance_filter = None  # 目标相关性过滤（relevance.RelevanceFilter），None 表示使用全部子句
+        self.relevance = None  # 最近一次推理的相关性过滤统计
+        self.preprocessor = None  # 输入子句预处理流水线（preprocess.Preprocessor），None 表示不做预处理
+        self.preprocessing = None  # 最近一次推理各预处理步骤删除的子句数和耗时
+        self.horn_engine = None  # 输入是 Horn 子句集时改用的引擎: 'rete' 前向链接, 'sld' 表格化反向链接
+        self.rete = None  # 最近一次推理使用的 ReteNetwork
+        self.sld = None  # 最近一次推理使用的 TabledSLD
+        self.horn_rejection = None  # 最近一次推理没有使用 Horn 引擎的原因
+        self.engine = 'resolution'  # 不使用 Horn 引擎时的证明引擎
+        self.instgen = None  # 最近一次推理使用的 InstGen
+        self.instgen_rejection = None  # 最近一次推理没有使用实例生成引擎的原因
+        self.counters = dict.fromkeys(self.COUNTERS, 0)  # 最近一次推理的计数器
+        self.phase_timer = None  # 最近一次推理的分阶段计时器
+        self.empty_clause = None  # 推导出的空子句
+        self.answer_names = None  # 目标子句中回答文字 $answer(...) 的参数名，None 表示不提取回答
+        self.answers = []  # 最近一次推理得到的确定回答 {参数名: 项}
+        self.disjunctive_answers = []  # 最近一次推理得到的析取回答（回答列表，其中至少一个成立）
+        self.result = None  # 最近一次推理的结果
+        self.checkpoint = None  # 搜索状态检查点（checkpoint.Checkpoint），None 表示不写检查点
+        self.resume_state = None  # load_checkpoint() 恢复的迭代位置，下一次推理从这里继续
+
+    def add_clause(self, clause, goal=None):
+        """
+        添加子句到子句集
+        参数: goal 是否为目标（结论否定）子句，默认根据 clause.source == 'goal' 判断
+        """
+        # 可定向的正单元等式作为重写规则，不再参与归结
+        if self.equality_rules and self.add_equation_clause(clause):
+            return
 
-    def add_clause(self, clause):
-        """添加子句到子句集"""
-        # 标准化变量后添加
-        standardized_clause = clause.standardize_variables()
+        # 带回答文字的目标子句：记录回答参数名，所有目标的回答文字参数个数必须相同
+        literals = answer_literals(clause)
+        if literals:
+            names = answer_names(literals[0])
+            if self.answer_names is not None and len(names) != len(self.answer_names):
+                raise ValueError(f"回答文字的参数个数不一致: {clause}")
+            if self.answer_names is None:
+                self.answer_names = names
+
+        # 使用全局变量编号标准化，不同输入子句的变量互不相交
+        standardized_clause = clause.standardize_variables(self.var_counter)
         self.clauses.append(standardized_clause)
 
+        if goal is None:
+            goal = clause.source == 'goal'
+        if goal:
+            self.support.add(standardized_clause.id)
+
+    def add_rewrite_rule(self, lhs, rhs):
+        """添加有向重写规则 lhs -> rhs（调用者保证规则集终止）"""
+        return self.rewrite_rules.add_rule(lhs, rhs)
+
+    def add_equation_clause(self, clause):
+        """
+        尝试把正单元等式子句 Equal(s, t) 定向为重写规则
+        返回: 是否作为规则添加
+        """
+        if len(clause.literals) != 1:
+            return False
+        literal = clause.literals[0]
+        if literal.negated or literal.predicate != EQUALITY_PREDICATE or len(literal.terms) != 2:
+            return False
+        return self.rewrite_rules.add_equation(literal.terms[0], literal.terms[1]) is not None
+
+    def normalize_clauses(self):
+        """
+        用重写规则把子句集中的项化简为范式
+        化简后恒真的子句被删除；在推理开始时调用，之后新归结式在生成时化简
+        """
+        if not len(self.rewrite_rules):
+            return
+        normalized = []
+        for clause in self.clauses:
+            literals = self.demodulator.normalize_literals(clause.literals)
+            if literals is None:
+                continue
+            if literals != clause.literals:
+                new_clause = Clause(literals, clause.source)
+                if clause.id in self.support:
+                    self.support.add(new_clause.id)
+                clause = new_clause
+            normalized.append(clause)
+        self.clauses = normalized
+
+    def fork(self):
+        """
+        复制输入状态（子句集、支持集、变量编号、重写规则和搜索配置）
+        同一组公理只需添加和标准化一次，之后每个查询在副本上添加目标子句并推理
+        """
+        other = ResolutionProver()
+        other.clauses = list(self.clauses)
+        other.support = set(self.support)
+        other.var_counter = dict(self.var_counter)
+        other.answer_names = self.answer_names
+        other.rewrite_rules = self.rewrite_rules.copy()
+        other.demodulator = Demodulator(other.rewrite_rules)
+        for name in ('max_steps', 'budget', 'selection', 'set_of_support', 'equality_rules', 'instrument',
+                     'tautology_mode', 'pair_filter', 'retention_policy', 'splitting', 'sort_inference', 'relevance_filter',
+                     'preprocessor', 'horn_engine', 'engine'):
+            setattr(other, name, getattr(self, name))
+        return other
+
+    def configure(self, selection=None, set_of_support=None, max_steps=None, tautology_mode=None,
+                  pair_filter=None, retention=None, relevance=None, preprocess=None, horn=None, checkpoint=None,
+                  splitting=None, engine=None, sorts=None, equality_rules=None):
+        """设置搜索策略参数"""
+        if selection is not None:
+            if selection not in self.SELECTION_STRATEGIES:
+                raise ValueError(f"未知的选择启发式: {selection}")
+            self.selection = selection
+        if set_of_support is not None:
+            self.set_of_support = set_of_support
+        if max_steps is not None:
+            self.max_steps = max_steps
+        if tautology_mode is not None:
+            if tautology_mode not in ('syntactic', 'extended'):
+                raise ValueError(f"未知的重言式检测模式: {tautology_mode}")
+            self.tautology_mode = tautology_mode
+        if pair_filter is not None:
+            if pair_filter not in self.PAIR_FILTERS:
+                raise ValueError(f"未知的子句对筛选方式: {pair_filter}")
+            self.pair_filter = pair_filter
+        if retention is not None:
+            self.retention_policy = retention
+        if relevance is not None:
+            self.relevance_filter = relevance
+        if preprocess is not None:
+            # True 表示使用默认的全部预处理步骤
+            if preprocess is True:
+                from preprocess import Preprocessor
+                preprocess = Preprocessor()
+            self.preprocessor = preprocess
+        if horn is not None:
+            # True 表示前向链接；False 关闭 Horn 引擎
+            horn = 'rete' if horn is True else horn or None
+            if horn is not None and horn not in self.HORN_ENGINES:
+                raise ValueError(f"未知的 Horn 引擎: {horn}")
+            self.horn_engine = horn
+        if engine is not None:
+            if engine not in self.ENGINES:
+                raise ValueError(f"未知的证明引擎: {engine}")
+            self.engine = engine
+        if sorts is not None:
+            self.sort_inference = bool(sorts)
+        if equality_rules is not None:
+            self.equality_rules = equality_rules
+        if splitting is not None:
+            # True 表示只命名至少两个文字的分量；整数给出分量的最少文字数；False 关闭拆分
+            self.splitting = 2 if splitting is True else splitting or None
+        if checkpoint is not None:
+            # 文件路径表示使用默认写入间隔；False 关闭检查点
+            if isinstance(checkpoint, (str, os.PathLike)):
+                from checkpoint import Checkpoint
+                checkpoint = Checkpoint(checkpoint)
+            self.checkpoint = checkpoint or None
+
+    @staticmethod
+    def clause_weight(clause):
+        """子句权重：谓词和项中符号的总数"""
+        def term_weight(term):
+            return 1 + sum(term_weight(arg) for arg in term.args)
+
+        return sum(1 + sum(term_weight(term) for term in lit.terms) for lit in clause.literals)
+
+    def selection_order(self):
+        """按选择启发式返回子句的遍历顺序（下标列表）"""
+        n = len(self.clauses)
+        if self.selection == 'shortest':
+            return sorted(range(n), key=lambda k: len(self.clauses[k].literals))
+        if self.selection == 'lightest':
+            return sorted(range(n), key=lambda k: self.clause_weight(self.clauses[k]))
+        return range(n)
+
     def resolve(self, clause1, clause2, literal1, literal2, substitution):
         """
         执行归结操作
         返回: 归结结果子句
         """
-        # 应用替换到两个子句
-        clause1_sub = Unifier.apply_substitution_to_clause(clause1, substitution)
-        clause2_sub = Unifier.apply_substitution_to_clause(clause2, substitution)
+        literals = self.resolvent_literals(clause1.literals, clause2.literals, literal1, literal2, substitution)
+        return self.make_resolvent(literals, clause1, clause2, literal1, literal2, substitution)
 
-        # 移除互补文字并合并子句
-        new_literals = []
+    @staticmethod
+    def resolvent_literals(literals1, literals2, literal1, literal2, substitution):
+        """
+        计算归结式的文字（不创建子句）
+        literals1/literals2 是两个父子句的文字（literals2 可能是合一时重命名后的文字）
+        替换只应用一次，未改变的文字和子项直接共享；用字典按哈希去重并保持顺序
+        替换后与被归结文字相同的其他文字一并删除（相当于先合并相同文字），否则 P(a) ∨ P(a) 永远得不到 P(a)
+        """
+        apply = Unifier.apply_substitution_to_literal
+        unique_literals = {}
 
-        # 添加 clause1 中除 literal1 外的所有文字
-        for lit in clause1_sub.literals:
-            if lit != literal1:
-                new_literals.append(lit.copy())
+        # 添加 clause1 中除 literal1 及其替换后副本外的所有文字
+        resolved1 = apply(literal1, substitution)
+        for lit in literals1:
+            if lit is not literal1:
+                new_lit = apply(lit, substitution)
+                if new_lit != resolved1:
+                    unique_literals[new_lit] = None
 
-        # 添加 clause2 中除 literal2 外的所有文字
-        for lit in clause2_sub.literals:
-            if lit != literal2:
-                new_literals.append(lit.copy())
+        # 添加 clause2 中除 literal2 及其替换后副本外的所有文字
+        resolved2 = apply(literal2, substitution)
+        for lit in literals2:
+            if lit is not literal2:
+                new_lit = apply(lit, substitution)
+                if new_lit != resolved2:
+                    unique_literals[new_lit] = None
 
-        # 去除重复文字
-        unique_literals = []
-        for lit in new_literals:
-            if lit not in unique_literals:
-                unique_literals.append(lit)
+        return list(unique_literals)
 
-        # 创建归结子句并记录来源
-        result_clause = Clause(unique_literals)
-        result_clause.source = {
+    @staticmethod
+    def make_resolvent(literals, clause1, clause2, literal1, literal2, substitution):
+        """创建归结子句并记录来源（文字和替换按引用记录）"""
+        return Clause(literals, {
             'parent1': clause1.id,
             'parent2': clause2.id,
-            'literal1': str(literal1),
-            'literal2': str(literal2),
-            'substitution': copy.deepcopy(substitution)
-        }
+            'literal1': literal1,
+            'literal2': literal2,
+            'substitution': substitution
+        })
 
-        return result_clause
+    @staticmethod
+    def clause_key(literals):
+        """
+        子句去重键：与文字顺序和变量名都无关
+        文字按去掉变量名的符号序列排序后，变量按第一次出现的顺序编号；
+        同一个推理在重命名后重复产生的子句（只差变量名）得到相同的键
+        """
+        shapes = sorted((_literal_shape(literal) for literal in literals), key=itemgetter(0))
+        numbers = {}
+        return frozenset((shape, tuple(numbers.setdefault(name, len(numbers)) for name in names))
+                         for shape, names in shapes)
 
     def has_complementary_predicates(self, clause1, clause2):
         """快速检查两个子句是否有互补的谓词"""
@@ -69,136 +333,758 @@ class ResolutionProver:
 
     def is_tautology(self, clause):
         """检查子句是否是重言式（包含P和¬P）"""
-        # 简化的重言式检查，只检查完全相同的文字
-        positive_lits = set()
-        negative_lits = set()
-
-        for lit in clause.literals:
-            # 创建规范化的文字表示
-            lit_repr = (lit.predicate, tuple(str(term) for term in lit.terms))
+        return self.is_tautology_literals(clause.literals)
 
+    def is_tautology_literals(self, literals):
+        """
+        检查文字列表是否构成重言式
+        直接比较原子键的哈希，不做字符串转换；extended 模式还会丢弃含可合一互补文字的子句
+        """
+        # 同一原子既肯定又否定则是重言式
+        positive_atoms = set()
+        negative_atoms = set()
+        for lit in literals:
             if lit.negated:
-                negative_lits.add(lit_repr)
+                negative_atoms.add(lit.atom())
             else:
-                positive_lits.add(lit_repr)
+                positive_atoms.add(lit.atom())
 
-        # 如果存在相同的文字既肯定又否定，则是重言式
-        return bool(positive_lits & negative_lits)
+        if positive_atoms.isdisjoint(negative_atoms):
+            return self.tautology_mode == 'extended' and self.has_unifiable_complements(literals)
+        return True
 
-    def two_pointer_resolution(self):
+    @staticmethod
+    def has_unifiable_complements(literals):
+        """
+        检查是否存在重命名变量后可合一的互补文字对
+        注意：这样的子句不一定是重言式，丢弃它们会牺牲完备性来换取速度
+        """
+        for i, lit1 in enumerate(literals):
+            for lit2 in literals[i + 1:]:
+                if lit1.predicate != lit2.predicate or lit1.negated == lit2.negated:
+                    continue
+                renamed = Unifier.rename_literal(lit2, "'")
+                if Unifier.unify_literals(lit1, renamed) is not None:
+                    return True
+        return False
+
+    def two_pointer_resolution(self, budget=None):
         """
         优化的two-pointer resolution算法
-        返回: 如果找到矛盾返回True，否则返回False
+        参数: budget 资源预算，未提供时使用 self.budget
+        返回: ProofResult，找到矛盾时为真；预算耗尽时状态为 unknown 并附带部分统计
+        推理过程不做任何输出，通过事件通知已注册的观察者
+        """
+        budget = budget if budget is not None else self.budget
+        if budget is not None:
+            budget.start()
+        if self.relevance_filter is not None and self.support and self.resume_state is None:
+            return self.relevance_resolution(budget)
+        self.relevance = None
+        return self.saturate(budget)
+
+    def relevance_resolution(self, budget=None):
+        """
+        先只在与目标相关的子句上推理，没有找到证明时（除非预算已经耗尽）回退到完整子句集
+        两次推理共用同一个预算和步数上限；结果统计中包含过滤前后的子句数和各阶段耗时。
+        不回退时子集饱和不能说明完整子句集不可证明，结果为 unknown（原因 'relevance'）
+        """
+        clauses, support = self.clauses, set(self.support)
+        selected, statistics = self.relevance_filter.select(clauses, support)
+        statistics['relevance_fallback'] = False
+        self.relevance = statistics
+
+        if len(selected) == len(clauses):
+            result = self.saturate(budget)
+        else:
+            self.clauses = selected
+            result = self.saturate(budget)
+            statistics['relevance_filtered_time'] = self.elapsed
+            statistics['relevance_filtered_steps'] = self.steps
+            if not result:
+                self.clauses, self.support = clauses, support
+                if self.relevance_filter.fallback and result.reason not in self.BUDGET_REASONS:
+                    statistics['relevance_fallback'] = True
+                    max_steps = self.max_steps
+                    self.max_steps = max(max_steps - self.steps, 0)
+                    try:
+                        result = self.saturate(budget)
+                    finally:
+                        self.max_steps = max_steps
+                    self.steps += statistics['relevance_filtered_steps']
+                    result.statistics['total_steps'] = self.steps
+                    statistics['relevance_full_time'] = self.elapsed
+                elif result.status == ProofResult.SATURATED:
+                    result = self.result = ProofResult(ProofResult.UNKNOWN, 'relevance', result.statistics)
+        result.statistics.update(statistics)
+        return result
+
+    def saturate(self, budget=None):
+        """
+        在当前子句集上运行归结（预算已经由调用者启动），回答收集在 self.answers 中
+        返回: ProofResult
+        """
+        search = self._search(budget)
+        while True:
+            try:
+                next(search)
+            except StopIteration as stop:
+                return stop.value
+
+    def find_answers(self, budget=None, limit=None):
+        """
+        回答查询：目标子句带有 $answer(x, ...) 文字时，每推出一个新的确定回答就立即生成 {参数名: 项}
+        回答按变体去重；得到 limit 个回答后停止（结果原因为 'answer_limit'），
+        饱和说明已经列出所有回答。结束后的 ProofResult 在 self.result 中；不使用相关性过滤
+        """
+        budget = budget if budget is not None else self.budget
+        if budget is not None:
+            budget.start()
+        self.relevance = None
+        yield from self._search(budget, limit)
+
+    def _search(self, budget=None, answer_limit=None):
         """
-        self.steps = 0
-        self.history = []
+        归结主循环（生成器）：每得到一个新的确定回答生成一次，结束时返回 ProofResult
+        load_checkpoint() 之后调用时从检查点的迭代位置继续
+        """
+        resume, self.resume_state = self.resume_state, None
+        self.history.clear()  # 保留列表对象，HistoryRecorder 可能持有它
+        self.empty_clause = None
+        answer_mode = self.answer_names is not None
         start_time = time.time()
 
-        # 使用集合来快速检查重复子句
-        clause_set = set(str(clause) for clause in self.clauses)
+        # 没有观察者时不构造任何事件对象
+        observers = self.observers
+        emit = self._emit
+
+        if budget is not None:
+            check_interval = budget.check_interval
+        pairs_checked = 0
+        checkpoint = self.checkpoint
+        if checkpoint is not None:
+            checkpoint.start()
+
+        clause_key = self.clause_key
+        if resume is None:
+            self.steps = 0
+            self.iterations = 0
+            self.answers = []
+            self.disjunctive_answers = []
+            answer_keys = set()
+
+            # 子句集中的项保持重写范式
+            self.normalize_clauses()
+            self.preprocessing = None
+            if self.preprocessor is not None:
+                self.clauses, self.preprocessing = self.preprocessor.run(self.clauses, self.support, self.var_counter)
+
+            # 使用集合来快速检查重复子句（按文字集合的哈希）
+            clause_set = set(clause_key(clause.literals) for clause in self.clauses)
+        else:
+            # 从检查点继续：子句集、计数器和回答已经由 load_checkpoint() 恢复
+            answer_keys = resume['answer_keys']
+            clause_set = resume['clause_set']
+        demodulator = self.demodulator if len(self.rewrite_rules) else None
+
+        if observers:
+            emit(SearchStarted(self.clauses))
+
+        # 没有目标子句时支持集策略不生效
+        use_support = self.set_of_support and bool(self.support)
+
+        var_counter = self.var_counter
+
+        # 计数器始终开启；分阶段计时只在 instrument 为真时进行
+        if resume is None:
+            self.counters = dict.fromkeys(self.COUNTERS, 0)
+        counters = self.counters
+        timer = self.phase_timer = PhaseTimer() if self.instrument else None
+        perf = time.perf_counter
+
+        # Horn 子句集用前向链接或反向链接求解，不做两两归结
+        self.rete = self.sld = self.horn_rejection = None
+        if self.horn_engine is not None and resume is None:
+            if demodulator is not None:
+                self.horn_rejection = 'rewrite_rules'
+            elif answer_mode:
+                self.horn_rejection = 'answer_literals'
+            else:
+                # Horn 引擎只在启用时导入，保持 import resolution 的冷启动开销
+                from rete import horn_obstacle
+                self.horn_rejection = horn_obstacle(self.clauses, range_restricted=self.horn_engine == 'rete')
+            if self.horn_rejection is None:
+                self.prefilter = self.retention = self.splitter = None
+                if self.horn_engine == 'sld':
+                    return self.backward_chain(budget, start_time)
+                return self.forward_chain(budget, start_time)
+
+        # 实例生成引擎不处理重写规则和回答文字，也不从检查点继续
+        self.instgen = self.instgen_rejection = None
+        if self.engine == 'instgen':
+            if resume is not None:
+                self.instgen_rejection = 'resume'
+            elif demodulator is not None:
+                self.instgen_rejection = 'rewrite_rules'
+            elif answer_mode:
+                self.instgen_rejection = 'answer_literals'
+            else:
+                self.prefilter = self.retention = self.splitter = None
+                return self.instance_generation(budget, start_time)
+
+        # 位集预筛选器的签名按子句 id 缓存，每次推理新建（推理期间子句对象都存活，id 不会复用）
+        prefilter = self.prefilter = PairFilter() if self.pair_filter == 'bitset' else None
+
+        # 类型推断：只有等式按类型分开时才需要检查（普通谓词的互补文字类型自动相同）
+        sorts = self.sorts = None
+        if self.sort_inference:
+            from sorts import infer_sorts
+            self.sorts = infer_sorts(self.clauses, [(rule.lhs, rule.rhs) for rule in self.rewrite_rules.rules])
+            if self.sorts.polymorphic_equality:
+                sorts = self.sorts
+
+        # 子句拆分：输入子句和新子句中不共享变量的文字组用命题符号代替（在 Horn 检查之后，拆分会引入正文字）
+        if resume is not None:
+            splitter = self.splitter = resume['splitter']
+        elif self.splitting is not None:
+            from splitting import ClauseSplitter
+            splitter = self.splitter = ClauseSplitter(self.splitting)
+            self.split_clauses(splitter, clause_set)
+        else:
+            splitter = self.splitter = None
 
-        print(f"开始推理，初始子句数: {len(self.clauses)}")
+        # 保留策略：丢弃超过上限或被包含的新子句，定期删除被包含的旧子句并压缩索引
+        if resume is not None:
+            retention = self.retention = resume['retention']
+        else:
+            retention = self.retention = (
+                ClauseRetention(self.retention_policy) if self.retention_policy is not None else None)
+            if retention is not None:
+                for clause in self.clauses:
+                    retention.track(clause)
 
-        # 显示初始子句
-        if self.show_detailed_steps:
-            print("初始子句:")
-            for i, clause in enumerate(self.clauses):
-                print(f"  {i}: {clause}")
+        # 输入子句化简后可能已经是空子句（例如 ¬Equal(t, t)）
+        for clause in self.clauses:
+            if clause.is_empty():
+                self.empty_clause = clause
+                if observers:
+                    emit(ProofFound(0, clause))
+                return self._finish(ProofResult.PROVED, None, start_time, budget)
 
         iteration = 0
+        position = None  # 恢复时本轮迭代中下一个要检查的子句对
+        resumed_pair = None  # 恢复时停在其中的子句对 (i, j, 已处理的文字对数, 重命名后的文字)
+        if resume is not None:
+            iteration, position = resume['iteration'], resume['position']
+
+        def stop(reason, pair=None):
+            """因步数、预算或回答上限停止：写入检查点（pair 是下次从哪里继续）后结束"""
+            if checkpoint is not None:
+                checkpoint.write(self.checkpoint_state(iteration, pair, new_clauses, clause_set, answer_keys))
+            return self._finish(ProofResult.UNKNOWN, reason, start_time, budget)
+
+        def after(literal1, literal2):
+            """当前子句对处理到 (literal1, literal2) 时的继续位置"""
+            k1 = next(k for k, literal in enumerate(clause1.literals) if literal is literal1)
+            k2 = next(k for k, literal in enumerate(literals2) if literal is literal2)
+            return i, j, k1 * len(literals2) + k2 + 1, literals2
+
         while self.steps < self.max_steps:
             new_clauses = []
             n = len(self.clauses)
-            found_contradiction = False
+            order = self.selection_order()
+
+            if prefilter is not None:
+                # 按选择顺序批量计算候选子句对，没有互补可能的子句对不进入循环
+                ordered = [self.clauses[k] for k in order]
+                if timer is not None:
+                    t0 = perf()
+                    pairs = prefilter.candidate_pairs(ordered)
+                    timer.add('screening', perf() - t0)
+                else:
+                    pairs = prefilter.candidate_pairs(ordered)
+                if position is None:
+                    # 从检查点继续的迭代在写入检查点之前已经计数
+                    total_pairs = n * (n - 1) // 2
+                    counters['pairs_examined'] += total_pairs
+                    counters['pairs_pruned'] += total_pairs - len(pairs)
+            else:
+                pairs = ((i, j) for i in range(n) for j in range(i + 1, n))
+
+            if position is not None:
+                # 从检查点继续本轮迭代：跳过已经检查过的子句对（子句对按字典序生成）
+                new_clauses = resume['new_clauses']
+                pairs = itertools.dropwhile(position[:2].__gt__, pairs)
+                if len(position) > 2:
+                    resumed_pair = position
+                    if prefilter is None:
+                        counters['pairs_examined'] -= 1  # 停在其中的子句对在写入检查点之前已经计数
+                position = None
 
             # 两两遍历子句对
-            for i in range(n):
-                for j in range(i + 1, n):
-                    clause1 = self.clauses[i]
-                    clause2 = self.clauses[j]
+            for i, j in pairs:
+                # 定期写入检查点（在检查这个子句对之前，恢复时从它开始）
+                if checkpoint is not None:
+                    pairs_checked += 1
+                    if pairs_checked % checkpoint.PAIR_INTERVAL == 0 and checkpoint.due():
+                        checkpoint.write(self.checkpoint_state(iteration, (i, j), new_clauses, clause_set,
+                                                               answer_keys))
+
+                clause1 = self.clauses[order[i]]
+                clause2 = self.clauses[order[j]]
+                if prefilter is None:
+                    counters['pairs_examined'] += 1
+
+                # 定期检查资源预算，避免单次迭代内长时间运行
+                if budget is not None:
+                    if checkpoint is None:
+                        pairs_checked += 1
+                    if pairs_checked % check_interval == 0:
+                        exceeded = budget.exceeded(n + len(new_clauses))
+                        if exceeded:
+                            return stop(exceeded, (i, j))
+
+                # 支持集策略：两个子句都不在支持集中时跳过
+                if use_support and clause1.id not in self.support and clause2.id not in self.support:
+                    counters['pairs_pruned'] += 1
+                    continue
+
+                # 快速检查：如果子句没有互补谓词，跳过（位集预筛选已经做过谓词检查；推断了类型时两种筛选方式都比较等式的类型）
+                if prefilter is not None:
+                    complementary = sorts is None or sorts.complementary(clause1, clause2)
+                elif sorts is not None:
+                    complementary = sorts.complementary(clause1, clause2)
+                elif timer is not None:
+                    t0 = perf()
+                    complementary = self.has_complementary_predicates(clause1, clause2)
+                    timer.add('screening', perf() - t0)
+                else:
+                    complementary = self.has_complementary_predicates(clause1, clause2)
+                if not complementary:
+                    counters['pairs_pruned'] += 1
+                    continue
+
+                if resumed_pair is None:
+                    # 两个子句共享变量名时（归结式沿用父子句的变量），合一前临时重命名 clause2
+                    literals2 = clause2.literals
+                    variables1 = clause1.variables()
+                    if variables1 and not variables1.isdisjoint(clause2.variables()):
+                        literals2 = clause2.rename_apart(var_counter)
+                        counters['renamings'] += 1
+                    literal_pairs = itertools.product(clause1.literals, literals2)
+                    counters['literal_pairs_examined'] += len(clause1.literals) * len(literals2)
+                else:
+                    # 从检查点继续：使用当时重命名的文字，跳过已经处理过的文字对
+                    _, _, skip, literals2 = resumed_pair
+                    literal_pairs = itertools.islice(itertools.product(clause1.literals, literals2), skip, None)
+                    resumed_pair = None
+
+                for literal1, literal2 in literal_pairs:
+                    # 检查文字是否可能互补
+                    if literal1.predicate != literal2.predicate or literal1.negated == literal2.negated:
+                        continue
+
+                    # 尝试合一
+                    if timer is not None:
+                        t0 = perf()
+                        substitution = Unifier.unify_literals(literal1, literal2, sorts)
+                        timer.add('unification', perf() - t0)
+                    else:
+                        substitution = Unifier.unify_literals(literal1, literal2, sorts)
+                    if substitution is None:
+                        counters['unifications_failed'] += 1
+                        continue
+                    counters['unifications_succeeded'] += 1
+
+                    # 计算归结式的文字，重言式和重复检查在创建子句之前完成
+                    if timer is not None:
+                        t0 = perf()
+                        literals = self.resolvent_literals(clause1.literals, literals2, literal1, literal2,
+                                                           substitution)
+                        if demodulator is not None:
+                            literals = demodulator.normalize_literals(literals)
+                        t1 = perf()
+                        tautology = literals is None or self.is_tautology_literals(literals)
+                        timer.add('resolvent', t1 - t0)
+                        timer.add('tautology', perf() - t1)
+                    else:
+                        literals = self.resolvent_literals(clause1.literals, literals2, literal1, literal2,
+                                                           substitution)
+                        if demodulator is not None:
+                            literals = demodulator.normalize_literals(literals)
+                        tautology = literals is None or self.is_tautology_literals(literals)
 
-                    # 快速检查：如果子句没有互补谓词，跳过
-                    if not self.has_complementary_predicates(clause1, clause2):
+                    # 跳过重言式
+                    counters['tautology_checks'] += 1
+                    if tautology:
+                        counters['discarded_tautology'] += 1
+                        if observers:
+                            emit(ClauseDiscarded(self.make_resolvent(
+                                literals or [], clause1, clause2, literal1, literal2, substitution),
+                                'tautology'))
                         continue
 
-                    for literal1 in clause1.literals:
-                        for literal2 in clause2.literals:
-                            # 检查文字是否可能互补
-                            if literal1.predicate == literal2.predicate and literal1.negated != literal2.negated:
-                                # 尝试合一
-                                substitution = Unifier.unify_literals(literal1, literal2)
-                                if substitution is not None:
-                                    # 执行归结
-                                    resolvent = self.resolve(clause1, clause2, literal1, literal2, substitution)
-
-                                    # 跳过重言式
-                                    if self.is_tautology(resolvent):
-                                        continue
-
-                                    # 记录推理步骤
-                                    step_info = {
-                                        'step': self.steps + 1,
-                                        'clause1': str(clause1),
-                                        'clause2': str(clause2),
-                                        'literal1': str(literal1),
-                                        'literal2': str(literal2),
-                                        'substitution': substitution,
-                                        'resolvent': str(resolvent),
-                                        'is_empty': resolvent.is_empty()
-                                    }
-                                    self.history.append(step_info)
-                                    self.steps += 1
-
-                                    # 显示重要归结步骤（只有在用户选择显示详细步骤时才显示）
-                                    if self.show_detailed_steps and (resolvent.is_empty() or
-                                            len(resolvent.literals) <= 2 or  # 短子句
-                                            ("SearchedBy" in str(resolvent) and any(
-                                                c in str(resolvent) for c in ['o', 'd'])) or
-                                            ("DrugDealer" in str(resolvent) and 'o' in str(resolvent))):
-                                        print(f"\n步骤 {self.steps}: 重要归结")
-                                        print(f"  子句1: {clause1}")
-                                        print(f"  子句2: {clause2}")
-                                        print(f"  文字1: {literal1}")
-                                        print(f"  文字2: {literal2}")
-                                        if substitution:
-                                            subst_str = ", ".join(f"{k}→{v}" for k, v in substitution.items())
-                                            print(f"  替换: {subst_str}")
-                                        print(f"  结果: {resolvent}")
-
-                                    # 如果得到空子句，返回成功
-                                    if resolvent.is_empty():
-                                        print(f"🎉 找到矛盾！在第 {self.steps} 步推导出空子句")
-                                        return True
-
-                                    # 如果新子句不在已知子句集中，添加它
-                                    resolvent_str = str(resolvent)
-                                    if resolvent_str not in clause_set:
-                                        clause_set.add(resolvent_str)
-                                        new_clauses.append(resolvent)
-
-                                    # 检查步数限制
-                                    if self.steps >= self.max_steps:
-                                        print(f"达到最大步数限制 {self.max_steps}")
-                                        return False
+                    self.steps += 1
+
+                    # 如果得到空子句，返回成功
+                    if not literals:
+                        resolvent = self.make_resolvent(literals, clause1, clause2,
+                                                        literal1, literal2, substitution)
+                        self.empty_clause = resolvent
+                        if observers:
+                            emit(ResolventProduced(self.steps, clause1, clause2,
+                                                   literal1, literal2, substitution, resolvent))
+                            emit(ProofFound(self.steps, resolvent))
+                        return self._finish(ProofResult.PROVED, None, start_time, budget)
+
+                    # 只剩回答文字：得到一个回答，回答子句不再参与归结
+                    if answer_mode and is_answer_clause(literals):
+                        key = answer_key(literals)
+                        if observers:
+                            resolvent = self.make_resolvent(literals, clause1, clause2,
+                                                            literal1, literal2, substitution)
+                            emit(ResolventProduced(self.steps, clause1, clause2,
+                                                   literal1, literal2, substitution, resolvent))
+                            emit(ClauseDiscarded(resolvent, 'answer'))
+                        if key not in answer_keys:
+                            answer_keys.add(key)
+                            answers = [dict(zip(self.answer_names, literal.terms)) for literal in literals]
+                            if len(answers) > 1:
+                                self.disjunctive_answers.append(answers)
+                            else:
+                                self.answers.append(answers[0])
+                                yield answers[0]
+                                if answer_limit is not None and len(self.answers) >= answer_limit:
+                                    return stop('answer_limit', after(literal1, literal2))
+                        if self.steps >= self.max_steps:
+                            return stop('max_steps', after(literal1, literal2))
+                        continue
+
+                    # 如果新子句不在已知子句集中，添加它
+                    if timer is not None:
+                        t0 = perf()
+                        key = clause_key(literals)
+                        is_new = key not in clause_set
+                        timer.add('dedup', perf() - t0)
+                    else:
+                        key = clause_key(literals)
+                        is_new = key not in clause_set
+
+                    # 拆分不共享变量的文字组：主子句代替归结式，新的定义子句直接保留
+                    if is_new and splitter is not None:
+                        split = splitter.split(literals)
+                        if split is not None:
+                            clause_set.add(key)  # 再次推出同一个归结式时按重复子句丢弃
+                            literals, definitions = split
+                            for definition in definitions:
+                                clause = Clause(definition, {'split': definition[0].predicate})
+                                clause_set.add(clause_key(definition))
+                                new_clauses.append(clause)
+                                if use_support:
+                                    self.support.add(clause.id)
+                                if retention is not None:
+                                    retention.track(clause)
+                            key = clause_key(literals)
+                            is_new = key not in clause_set
+
+                    # 超过保留上限或被存活子句包含的新子句不保留
+                    rejected = None
+                    if is_new and retention is not None:
+                        rejected = retention.rejection(literals, (self.clauses, new_clauses))
+                        if rejected is not None:
+                            # 记住被拒绝的子句，之后再次生成时按重复子句快速丢弃
+                            clause_set.add(key)
+                            is_new = False
+
+                    # 只有新子句或有观察者时才创建子句对象
+                    if is_new or observers:
+                        resolvent = self.make_resolvent(literals, clause1, clause2,
+                                                        literal1, literal2, substitution)
+                        if observers:
+                            emit(ResolventProduced(self.steps, clause1, clause2,
+                                                   literal1, literal2, substitution, resolvent))
+
+                    if is_new:
+                        clause_set.add(key)
+                        new_clauses.append(resolvent)
+                        counters['clauses_retained'] += 1
+                        if use_support:
+                            self.support.add(resolvent.id)
+                        if retention is not None:
+                            retention.track(resolvent)
+                        if observers:
+                            emit(ClauseKept(resolvent))
+
+                        # 存活子句数超出预算时立即停止
+                        if budget is not None and budget.max_clauses is not None and \
+                                n + len(new_clauses) > budget.max_clauses:
+                            return stop('clauses', after(literal1, literal2))
+                    elif rejected is not None:
+                        if observers:
+                            emit(ClauseDiscarded(resolvent, rejected))
+                    else:
+                        counters['discarded_duplicate'] += 1
+                        if observers:
+                            emit(ClauseDiscarded(resolvent, 'duplicate'))
+
+                    # 检查步数限制
+                    if self.steps >= self.max_steps:
+                        return stop('max_steps', after(literal1, literal2))
 
             # 如果没有新子句产生，停止
             if not new_clauses:
-                print(f"在 {self.steps} 步后未产生新子句，无法证明")
-                return False
+                if use_support:
+                    # 支持集策略只在非目标子句可满足时完备，饱和不能说明定理不成立
+                    return self._finish(ProofResult.UNKNOWN, 'set_of_support', start_time, budget)
+                if retention is not None and not retention.policy.is_complete and \
+                        (retention.statistics['discarded_weight'] or retention.statistics['discarded_length']):
+                    # 丢弃过超过上限的子句后饱和同样不能说明定理不成立
+                    return self._finish(ProofResult.UNKNOWN, 'retention', start_time, budget)
+                if demodulator is not None:
+                    # 单元等式只用来重写，没有调解（paramodulation），饱和不能说明定理不成立
+                    return self._finish(ProofResult.UNKNOWN, 'equality', start_time, budget)
+                return self._finish(ProofResult.SATURATED, None, start_time, budget)
 
             # 添加新子句到子句集
             self.clauses.extend(new_clauses)
-            print(f"迭代 {iteration}: 生成 {len(new_clauses)} 个新子句，总子句数: {len(self.clauses)}")
+            if retention is not None and retention.due(iteration):
+                self.compact_clauses(retention, clause_set, prefilter)
+            if observers:
+                emit(IterationDone(iteration, len(new_clauses), len(self.clauses),
+                                   self.steps, time.time() - start_time))
             iteration += 1
+            self.iterations = iteration
+            if checkpoint is not None and checkpoint.due():
+                checkpoint.write(self.checkpoint_state(iteration, None, [], clause_set, answer_keys))
 
-            # 性能监控
-            if iteration % 10 == 0:
-                current_time = time.time()
-                elapsed = current_time - start_time
-                print(f"进度: {iteration}次迭代, {self.steps}步, 耗时: {elapsed:.2f}秒")
+        # 恢复后没有提高 max_steps 时原样保留检查点中的位置
+        new_clauses = resume['new_clauses'] if position is not None else []
+        return stop('max_steps', position)
 
-        print(f"达到最大步数限制 {self.max_steps}，未找到证明")
-        return False
+    CHECKPOINT_SETTINGS = ('max_steps', 'selection', 'set_of_support', 'equality_rules', 'tautology_mode',
+                           'pair_filter', 'retention_policy', 'splitting', 'sort_inference')  # 检查点中保存的搜索配置
+
+    def split_clauses(self, splitter, clause_set):
+        """拆分输入子句：主子句和新的定义子句代替原子句，目标子句的支持集身份传给它们"""
+        clauses = []
+        for clause in self.clauses:
+            split = splitter.split(clause.literals)
+            if split is None:
+                clauses.append(clause)
+                continue
+            literals, definitions = split
+            parts = [Clause(literals, clause.source)]
+            parts.extend(Clause(definition, {'split': definition[0].predicate}) for definition in definitions)
+            for part in parts:
+                key = self.clause_key(part.literals)
+                if key in clause_set:
+                    continue
+                clause_set.add(key)
+                clauses.append(part)
+                if clause.id in self.support:
+                    self.support.add(part.id)
+        self.clauses = clauses
+
+    def checkpoint_state(self, iteration, position, new_clauses, clause_set, answer_keys):
+        """
+        当前搜索状态（写入检查点）
+        参数: iteration 当前迭代；position 本轮下一个要检查的子句对 (i, j)，None 表示从下一轮开始；
+              new_clauses 本轮已经保留的新子句
+        """
+        retention = self.retention
+        return {
+            'clauses': self.clauses,
+            'new_clauses': new_clauses,
+            'support': self.support,
+            'var_counter': self.var_counter,
+            'clause_set': clause_set,
+            'answer_names': self.answer_names,
+            'answer_keys': answer_keys,
+            'answers': self.answers,
+            'disjunctive_answers': self.disjunctive_answers,
+            'rewrite_rules': self.rewrite_rules,
+            'steps': self.steps,
+            'iteration': iteration,
+            'position': position,
+            'counters': self.counters,
+            'splitter': self.splitter,
+            'retention': None if retention is None else {
+                'fresh': [clause.id for clause in retention.fresh],
+                'statistics': retention.statistics
+            },
+            'configuration': {name: getattr(self, name) for name in self.CHECKPOINT_SETTINGS}
+        }
+
+    def load_checkpoint(self, path):
+        """
+        从检查点文件恢复搜索状态，之后调用 two_pointer_resolution() 或 find_answers() 继续同一次搜索
+        （不再做预处理、相关性过滤和 Horn 引擎检查）；可以在恢复后用 configure(max_steps=...) 提高步数上限
+        """
+        from checkpoint import read_checkpoint
+        state = read_checkpoint(path)
+        for name, value in state['configuration'].items():
+            setattr(self, name, value)
+
+        # 子句 id 是写入时进程中的对象地址，改为当前对象的地址，避免与之后新建的子句冲突
+        clauses, new_clauses = state['clauses'], state['new_clauses']
+        renumber = {}
+        for clause in itertools.chain(clauses, new_clauses):
+            renumber[clause.id] = id(clause)
+            clause.id = id(clause)
+        for clause in itertools.chain(clauses, new_clauses):
+            if isinstance(clause.source, dict) and 'parent1' in clause.source:
+                clause.source['parent1'] = renumber.get(clause.source['parent1'], clause.source['parent1'])
+                clause.source['parent2'] = renumber.get(clause.source['parent2'], clause.source['parent2'])
+
+        self.clauses = clauses
+        self.support = {renumber[clause_id] for clause_id in state['support'] if clause_id in renumber}
+        self.var_counter = state['var_counter']
+        self.answer_names = state['answer_names']
+        self.answers = state['answers']
+        self.disjunctive_answers = state['disjunctive_answers']
+        self.rewrite_rules = state['rewrite_rules']
+        self.demodulator = Demodulator(self.rewrite_rules)
+        self.steps = state['steps']
+        self.iterations = state['iteration']
+        self.counters = state['counters']
+
+        retention = None
+        if state['retention'] is not None:
+            retention = ClauseRetention(self.retention_policy)
+            live = {}
+            for clause in itertools.chain(clauses, new_clauses):
+                retention.track(clause, fresh=False)
+                live[clause.id] = clause
+            retention.fresh = [live[renumber[clause_id]] for clause_id in state['retention']['fresh']
+                               if renumber.get(clause_id) in live]
+            retention.statistics = state['retention']['statistics']
+        self.resume_state = {
+            'iteration': state['iteration'],
+            'position': state['position'],
+            'new_clauses': new_clauses,
+            'clause_set': state['clause_set'],
+            'answer_keys': state['answer_keys'],
+            'splitter': state['splitter'],
+            'retention': retention
+        }
+        self.result = None
+
+    def forward_chain(self, budget, start_time):
+        """
+        把子句集编译成 Rete 网络并传播事实（调用者已经确认子句集是值域受限的 Horn 子句集）
+        推出目标子句的实例时记录一个空子句，来源中包含目标子句和变量绑定；推理步数是推出的新事实数
+        """
+        from rete import ReteNetwork
+        network = self.rete = ReteNetwork()
+        for clause in self.clauses:
+            network.add_clause(clause)
+        outcome = network.run(self.max_steps, budget)
+        self.steps = network.statistics['facts_derived']
+
+        if network.proof is not None:
+            goal, bindings = network.proof
+            self.empty_clause = Clause([], {'engine': 'rete', 'goal': goal.id, 'substitution': bindings})
+            if self.observers:
+                self._emit(ProofFound(self.steps, self.empty_clause))
+            return self._finish(ProofResult.PROVED, None, start_time, budget)
+        if outcome == 'saturated':
+            return self._finish(ProofResult.SATURATED, None, start_time, budget)
+        return self._finish(ProofResult.UNKNOWN, outcome, start_time, budget)
+
+    def backward_chain(self, budget, start_time):
+        """
+        从目标子句出发做带表格化的 SLD 反向链接（调用者已经确认子句集是 Horn 子句集）
+        证明结构与前向链接相同；推理步数是与子句头的归结次数
+        """
+        from sld import TabledSLD
+        engine = self.sld = TabledSLD(self.clauses, self.var_counter, self.max_steps, budget)
+        outcome = engine.prove()
+        self.steps = engine.statistics['resolutions']
+
+        if engine.proof is not None:
+            goal, bindings = engine.proof
+            self.empty_clause = Clause([], {'engine': 'sld', 'goal': goal.id, 'substitution': bindings})
+            if self.observers:
+                self._emit(ProofFound(self.steps, self.empty_clause))
+            return self._finish(ProofResult.PROVED, None, start_time, budget)
+        if outcome == 'saturated':
+            return self._finish(ProofResult.SATURATED, None, start_time, budget)
+        return self._finish(ProofResult.UNKNOWN, outcome, start_time, budget)
+
+    def instance_generation(self, budget, start_time):
+        """
+        用实例生成引擎判定子句集：命题抽象不可满足时记录一个空子句，来源中包含生成的实例数；
+        推理步数是生成的实例数，子句集换成输入子句和所有实例
+        """
+        from instgen import InstGen
+        engine = self.instgen = InstGen(self.clauses, self.var_counter, self.max_steps, budget)
+        outcome = engine.prove()
+        self.steps = engine.statistics['instances']
+        self.clauses = list(engine.clauses)
+
+        if outcome == 'proved':
+            self.empty_clause = Clause([], {'engine': 'instgen', 'instances': self.steps})
+            if self.observers:
+                self._emit(ProofFound(self.steps, self.empty_clause))
+            return self._finish(ProofResult.PROVED, None, start_time, budget)
+        if outcome == 'saturated':
+            return self._finish(ProofResult.SATURATED, None, start_time, budget)
+        return self._finish(ProofResult.UNKNOWN, outcome, start_time, budget)
+
+    def compact_clauses(self, retention, clause_set, prefilter=None):
+        """
+        删除被新子句包含的子句，并从去重集合、支持集和预筛选签名中移除它们
+        被删除的支持集子句由包含它的子句继承支持集身份
+        """
+        evicted, subsumers = retention.collect(self.clauses)
+        if not evicted:
+            retention.release(evicted)
+            return
+        for clause in evicted:
+            clause_set.discard(self.clause_key(clause.literals))
+            if prefilter is not None:
+                prefilter.discard(clause)
+
+        # 所有删除确定后再转移支持集身份：包含者本身也被删除时，沿包含关系找到存活的子句
+        for clause in evicted:
+            if clause.id in self.support:
+                self.support.discard(clause.id)
+                subsumer = subsumers[clause.id]
+                while subsumer.id in subsumers:
+                    subsumer = subsumers[subsumer.id]
+                self.support.add(subsumer.id)
+        self.clauses = [clause for clause in self.clauses if clause.id not in subsumers]
+        retention.release(evicted)
+
+    def _finish(self, status, reason, start_time, budget):
+        """结束推理，构造带统计信息的结果并通知观察者"""
+        self.elapsed = time.time() - start_time
+        statistics = self.get_statistics()
+        statistics['iterations'] = self.iterations
+        statistics['duration'] = self.elapsed
+        if self.rete is not None:
+            statistics['facts_per_second'] = statistics['facts_derived'] / self.elapsed if self.elapsed > 0 else 0.0
+        if budget is not None:
+            statistics['budget'] = budget.to_dict()
+            statistics['peak_memory'] = budget.peak_memory
+        result = self.result = ProofResult(status, reason, statistics)
+        if self.observers:
+            self._emit(SearchFinished(result, self.max_steps))
+        return result
+
+    def add_observer(self, observer):
+        """注册推理事件观察者"""
+        self.observers.append(observer)
+        return observer
+
+    def remove_observer(self, observer):
+        """注销推理事件观察者"""
+        self.observers.remove(observer)
+
+    def _emit(self, event):
+        """向所有观察者发送事件"""
+        for observer in self.observers:
+            observer.notify(event)
 
     def print_resolution_history(self):
         """打印详细的推理历史"""
@@ -217,10 +1103,59 @@ class ResolutionProver:
                 print(f"      替换: {subst_str}")
 
     def get_statistics(self):
-        """获取推理统计信息"""
-        return {
+        """获取推理统计信息（含计数器；开启 instrument 时含分阶段耗时）"""
+        counters = self.counters
+        statistics = {
             'total_steps': self.steps,
             'total_clauses': len(self.clauses),
-            'empty_clause_found': any(clause.is_empty() for clause in self.clauses),
-            'history_length': len(self.history)
-        }
\ No newline at end of file
+            'empty_clause_found': self.empty_clause is not None,
+            'history_length': len(self.history),
+            'clause_width_mean': (sum(len(clause.literals) for clause in self.clauses) / len(self.clauses)
+                                  if self.clauses else 0.0)
+        }
+        statistics.update(counters)
+
+        unifications = counters['unifications_succeeded'] + counters['unifications_failed']
+        statistics['unification_success_rate'] = (
+            counters['unifications_succeeded'] / unifications if unifications else 0.0)
+        statistics['tautology_hit_rate'] = (
+            counters['discarded_tautology'] / counters['tautology_checks'] if counters['tautology_checks'] else 0.0)
+        statistics['pair_prune_rate'] = (
+            counters['pairs_pruned'] / counters['pairs_examined'] if counters['pairs_examined'] else 0.0)
+
+        if len(self.rewrite_rules):
+            statistics.update(self.demodulator.get_statistics())
+        if self.prefilter is not None:
+            statistics.update(self.prefilter.get_statistics())
+        if self.retention is not None:
+            statistics.update(self.retention.get_statistics())
+        if self.checkpoint is not None:
+            statistics.update(self.checkpoint.get_statistics())
+        if self.splitter is not None:
+            statistics.update(self.splitter.get_statistics())
+        if self.sorts is not None:
+            statistics.update(self.sorts.get_statistics())
+        if self.relevance is not None:
+            statistics.update(self.relevance)
+        if self.answer_names is not None:
+            statistics['answers'] = len(self.answers)
+            statistics['disjunctive_answers'] = len(self.disjunctive_answers)
+        if self.rete is not None:
+            statistics['engine'] = 'rete'
+            statistics.update(self.rete.get_statistics())
+        elif self.sld is not None:
+            statistics['engine'] = 'sld'
+            statistics.update(self.sld.get_statistics())
+        elif self.instgen is not None:
+            statistics['engine'] = 'instgen'
+            statistics.update(self.instgen.get_statistics())
+        if self.horn_rejection is not None:
+            statistics['horn_rejected'] = self.horn_rejection
+        if self.instgen_rejection is not None:
+            statistics['instgen_rejected'] = self.instgen_rejection
+        if self.preprocessing is not None:
+            statistics['preprocessing'] = self.preprocessing
+            statistics['preprocess_removed'] = sum(step['removed'] for step in self.preprocessing.values())
+        if self.phase_timer is not None:
+            statistics['phases'] = self.phase_timer.to_dict()
+        return statistics
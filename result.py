@@ -0,0 +1,50 @@
+# result.py
+"""
+推理结果定义
+所有推理引擎统一返回 ProofResult
+"""
+
+
+class ProofResult:
+    """推理结果（证明成功 / 子句集饱和 / 未知）"""
+
+    PROVED = 'proved'  # 推导出空子句
+    SATURATED = 'saturated'  # 没有新子句产生，无法证明
+    UNKNOWN = 'unknown'  # 预算或步数耗尽，结论未知
+
+    def __init__(self, status, reason=None, statistics=None):
+        self.status = status
+        self.reason = reason  # unknown 时的原因：'max_steps', 'time', 'memory', 'clauses', 'set_of_support', 'cancelled', 'retention', 'depth', 'answer_limit', 'equality', 'relevance'
+        self.statistics = statistics if statistics is not None else {}  # 部分统计信息
+
+    def __bool__(self):
+        """只有找到证明时为真，兼容原来返回 True/False 的用法"""
+        return self.status == ProofResult.PROVED
+
+    def __eq__(self, other):
+        """按状态和原因比较；不与 bool 比较（与 __hash__ 一致），判断是否证明成功用 bool(result)"""
+        if not isinstance(other, ProofResult):
+            return False
+        return self.status == other.status and self.reason == other.reason
+
+    def __hash__(self):
+        return hash((self.status, self.reason))
+
+    def __repr__(self):
+        if self.reason:
+            return f"ProofResult({self.status}, reason={self.reason})"
+        return f"ProofResult({self.status})"
+
+    @property
+    def is_definitive(self):
+        """结论是否确定（证明成功或饱和）"""
+        return self.status != ProofResult.UNKNOWN
+
+    def to_dict(self):
+        """导出为可JSON序列化的字典"""
+        return {
+            'status': self.status,
+            'proved': bool(self),
+            'reason': self.reason,
+            'statistics': self.statistics
+        }
@@ -0,0 +1,308 @@
+# rete.py
+"""
+Horn 子句的前向链接（Rete 风格的匹配网络）
+Horn 子句集（每个子句至多一个正文字）不需要一般的两两归结：事实是基原子，规则体编译成连接网络，
+新事实只沿网络增量传播，直到推导出某个目标子句（全部为负文字）的实例或达到不动点。
+
+网络结构：
+- alpha 内存：按规则体文字的模式（谓词、常量和重复变量）过滤事实，模式相同的文字共享同一个 alpha 内存
+- 连接节点：把父 beta 内存中的部分匹配（变量绑定）与 alpha 内存中的事实按共享变量连接，
+  两边都按连接变量的值建立哈希索引
+- beta 内存：保存规则体前若干个文字的部分匹配
+- 产生式节点：规则体全部匹配后实例化规则头得到新事实；目标子句的产生式表示推出矛盾
+"""
+
+from collections import deque
+from clause import Clause, Literal
+from rewriting import EQUALITY_PREDICATE
+from unification import Unifier
+
+
+def horn_obstacle(clauses, range_restricted=True):
+    """
+    检查子句集能否用 Horn 引擎求解
+    参数: range_restricted 是否要求事实是基原子、规则头的变量都出现在规则体中（前向链接需要，反向链接不需要）
+    返回: 不能时的原因 'non_horn'、'non_ground_fact'、'range_restriction' 或 'equality'，可以时返回 None
+    """
+    for clause in clauses:
+        positive = [literal for literal in clause.literals if not literal.negated]
+        if len(positive) > 1:
+            return 'non_horn'
+        if any(literal.predicate == EQUALITY_PREDICATE for literal in clause.literals):
+            return 'equality'
+        if positive and range_restricted:
+            head_variables = Clause(positive).variables()
+            body_variables = Clause([literal for literal in clause.literals if literal.negated]).variables()
+            if not head_variables <= body_variables:
+                # 事实必须是基原子，规则头的变量必须出现在规则体中，推出的事实才都是基原子
+                return 'non_ground_fact' if len(clause.literals) == 1 else 'range_restriction'
+    return None
+
+
+def _pattern_key(literal):
+    """alpha 内存的共享键：变量按出现顺序重命名后的原子"""
+    return Clause([literal]).standardize_variables({'x': 0}).literals[0].atom()
+
+
+def _match(condition, fact, bindings):
+    """在已有绑定下把条件文字匹配到基事实，返回扩展后的新绑定，失败返回 None"""
+    extended = dict(bindings)
+    for pattern, term in zip(condition.terms, fact.terms):
+        if Unifier.match(pattern, term, extended) is None:
+            return None
+    return extended
+
+
+class AlphaMemory:
+    """匹配某个文字模式的事实，以及按参数位置建立的哈希索引"""
+
+    def __init__(self, pattern):
+        self.pattern = pattern
+        self.facts = []
+        self.indexes = {}  # 参数位置元组 -> {参数值元组: [事实]}
+        self.successors = []  # 连接节点
+
+    def matches(self, fact):
+        return len(fact.terms) == len(self.pattern.terms) and _match(self.pattern, fact, {}) is not None
+
+    def index(self, positions):
+        """按参数位置建立（或取得已有的）索引"""
+        index = self.indexes.get(positions)
+        if index is None:
+            index = self.indexes[positions] = {}
+            for fact in self.facts:
+                index.setdefault(tuple(fact.terms[p] for p in positions), []).append(fact)
+        return index
+
+    def add(self, fact):
+        self.facts.append(fact)
+        for positions, index in self.indexes.items():
+            index.setdefault(tuple(fact.terms[p] for p in positions), []).append(fact)
+        for node in self.successors:
+            node.right_activate(fact)
+
+
+class BetaMemory:
+    """部分匹配（变量绑定字典）及按连接变量建立的哈希索引"""
+
+    def __init__(self):
+        self.tokens = []
+        self.indexes = {}  # 变量名元组 -> {变量值元组: [绑定]}
+        self.children = []  # 连接节点
+
+    def index(self, variables):
+        index = self.indexes.get(variables)
+        if index is None:
+            index = self.indexes[variables] = {}
+            for token in self.tokens:
+                index.setdefault(tuple(token[v] for v in variables), []).append(token)
+        return index
+
+    def activate(self, token):
+        self.tokens.append(token)
+        for variables, index in self.indexes.items():
+            index.setdefault(tuple(token[v] for v in variables), []).append(token)
+        for child in self.children:
+            child.left_activate(token)
+
+
+class JoinNode:
+    """把父 beta 内存的部分匹配与 alpha 内存的事实按共享变量连接"""
+
+    def __init__(self, network, parent, alpha, condition, bound):
+        self.network = network
+        self.parent = parent
+        self.alpha = alpha
+        self.condition = condition
+        self.child = None  # BetaMemory 或 ProductionNode
+        # 连接变量：条件文字中已经被前面的文字绑定的变量
+        self.variables = tuple(sorted(Clause([condition]).variables() & bound))
+        # 连接变量都直接作为参数出现时，按这些参数位置索引 alpha 内存
+        positions = {}
+        for position, term in enumerate(condition.terms):
+            if term.is_variable and term.name in self.variables:
+                positions.setdefault(term.name, position)
+        self.positions = tuple(positions[v] for v in self.variables) if len(positions) == len(self.variables) else None
+        self.alpha_index = alpha.index(self.positions) if self.positions else None
+        self.beta_index = parent.index(self.variables)
+
+    def left_activate(self, token):
+        """新的部分匹配：与 alpha 内存中连接变量取值相同的事实连接"""
+        if self.alpha_index is not None:
+            facts = self.alpha_index.get(tuple(token[v] for v in self.variables), ())
+        else:
+            facts = self.alpha.facts
+        for fact in facts:
+            self.network.statistics['join_activations'] += 1
+            extended = _match(self.condition, fact, token)
+            if extended is not None:
+                self.child.activate(extended)
+
+    def right_activate(self, fact):
+        """新事实：与父 beta 内存中连接变量取值相同的部分匹配连接"""
+        bindings = _match(self.condition, fact, {})
+        if bindings is None:
+            return
+        for token in self.beta_index.get(tuple(bindings[v] for v in self.variables), ()):
+            self.network.statistics['join_activations'] += 1
+            extended = dict(token)
+            extended.update(bindings)
+            self.child.activate(extended)
+
+
+class ProductionNode:
+    """规则体全部匹配：实例化规则头；目标子句（没有规则头）表示推出矛盾"""
+
+    def __init__(self, network, clause, head):
+        self.network = network
+        self.clause = clause
+        self.head = head
+
+    def activate(self, token):
+        network = self.network
+        network.statistics['rule_firings'] += 1
+        if self.head is None:
+            if network.proof is None:
+                network.proof = (self.clause, token)
+            return
+        terms = [Unifier.apply_substitution(term, token) for term in self.head.terms]
+        if network.add_fact(Literal(self.head.predicate, terms), self.clause):
+            network.statistics['facts_derived'] += 1
+
+
+class ReteNetwork:
+    """Horn 规则的 Rete 匹配网络和待传播事实队列"""
+
+    def __init__(self):
+        self.alpha_memories = {}  # 模式键 -> AlphaMemory
+        self.alpha_by_predicate = {}  # (谓词, 参数个数) -> [AlphaMemory]
+        self.join_nodes = 0
+        self.facts = {}  # 原子 -> 推出它的子句（输入事实为子句本身）
+        self.queue = deque()  # 已知但还没有传播的事实
+        self.propagated = {}  # (谓词, 参数个数) -> 已经传播过的事实
+        self.proof = None  # (目标子句, 绑定)
+        self.statistics = dict.fromkeys(('facts_derived', 'rule_firings', 'join_activations'), 0)
+        self.root = BetaMemory()
+        self.root.tokens.append({})  # 第一个条件文字与空绑定连接
+
+    def alpha_memory(self, literal):
+        key = _pattern_key(literal)
+        memory = self.alpha_memories.get(key)
+        if memory is None:
+            memory = self.alpha_memories[key] = AlphaMemory(Literal(literal.predicate, literal.terms))
+            self.alpha_by_predicate.setdefault((literal.predicate, len(literal.terms)), []).append(memory)
+            # 已经传播过的事实补充进新的 alpha 内存（队列中的事实之后会正常传播）
+            for fact in self.propagated.get((literal.predicate, len(literal.terms)), ()):
+                if memory.matches(fact):
+                    memory.facts.append(fact)
+        return memory
+
+    def add_clause(self, clause):
+        """加入 Horn 子句：单个正文字是事实，否则编译规则体（目标子句没有规则头）"""
+        head = next((literal for literal in clause.literals if not literal.negated), None)
+        body = [literal for literal in clause.literals if literal.negated]
+        if not body:
+            if head is None:
+                self.proof = (clause, {})  # 输入中的空子句
+            else:
+                self.add_fact(head, clause)
+            return
+
+        # 条件顺序：每次优先选择与已绑定变量共享最多、自身变量最少的文字
+        remaining = list(body)
+        bound = frozenset()
+        parent = self.root
+        while remaining:
+            condition = max(remaining, key=lambda literal: (
+                len(Clause([literal]).variables() & bound), -len(Clause([literal]).variables())))
+            remaining.remove(condition)
+            alpha = self.alpha_memory(condition)
+            node = JoinNode(self, parent, alpha, condition, bound)
+            self.join_nodes += 1
+            bound = bound | Clause([condition]).variables()
+            node.child = BetaMemory() if remaining else ProductionNode(self, clause, head)
+            # 先连接已有的部分匹配和事实，再挂到网络上接收之后的激活
+            for token in list(parent.tokens):
+                node.left_activate(token)
+            parent.children.append(node)
+            alpha.successors.append(node)
+            if remaining:
+                parent = node.child
+
+    def add_fact(self, fact, clause=None):
+        """
+        登记基事实，等待传播
+        返回: 是否是新事实（已知的事实被忽略）
+        """
+        atom = fact.atom()
+        if atom in self.facts:
+            return False
+        self.facts[atom] = clause
+        self.queue.append(fact)
+        return True
+
+    def run(self, max_facts=None, budget=None):
+        """
+        按先进先出顺序传播事实，直到推出矛盾、达到不动点或超出限制
+        返回: 'proved'、'saturated'、'max_steps' 或预算超出的原因
+        """
+        check_interval = budget.check_interval if budget is not None else None
+        processed = 0
+        while self.queue and self.proof is None:
+            fact = self.queue.popleft()
+            key = (fact.predicate, len(fact.terms))
+            self.propagated.setdefault(key, []).append(fact)
+            for memory in self.alpha_by_predicate.get(key, ()):
+                if memory.matches(fact):
+                    memory.add(fact)
+            processed += 1
+            if max_facts is not None and self.statistics['facts_derived'] >= max_facts:
+                return 'proved' if self.proof is not None else 'max_steps'
+            if budget is not None and processed % check_interval == 0:
+                exceeded = budget.exceeded(len(self.facts))
+                if exceeded:
+                    return exceeded
+        return 'proved' if self.proof is not None else 'saturated'
+
+    def get_statistics(self):
+        """网络规模和传播计数"""
+        statistics = dict(self.statistics)
+        statistics['facts_total'] = len(self.facts)
+        statistics['alpha_memories'] = len(self.alpha_memories)
+        statistics['join_nodes'] = self.join_nodes
+        return statistics
+
+
+def benchmark_engines(length=40, time_limit=2.0):
+    """
+    在传递闭包链上比较前向链接、表格化反向链接和归结循环的吞吐量
+    返回: {'rete': {...}, 'sld': {...}, 'resolution': {...}}，每项包含状态、耗时、
+    新事实/新答案/新子句数和每秒吞吐量
+    """
+    from budget import Budget
+    from problems import ProblemBuilder
+    from resolution import ResolutionProver
+
+    report = {}
+    derived_counter = {'rete': 'facts_derived', 'sld': 'answers', 'resolution': 'clauses_retained'}
+    for engine, counter in derived_counter.items():
+        prover = ResolutionProver()
+        prover.configure(horn=engine != 'resolution' and engine, max_steps=10 ** 7)
+        for clause in ProblemBuilder.create_transitive_chain(length):
+            prover.add_clause(clause)
+        result = prover.two_pointer_resolution(Budget(time_limit=time_limit))
+        statistics = result.statistics
+        derived = statistics[counter]
+        report[engine] = {
+            'status': result.status,
+            'duration': statistics['duration'],
+            'derived': derived,
+            'per_second': derived / statistics['duration'] if statistics['duration'] > 0 else 0.0
+        }
+    return report
+
+
+if __name__ == "__main__":
+    for engine, row in benchmark_engines().items():
+        print(f"{engine:<10} {row['status']:<9} {row['duration']:.3f}s  "
+              f"推出 {row['derived']} 个  {row['per_second']:.0f}/s")
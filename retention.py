@@ -0,0 +1,139 @@
+# retention.py
+"""
+子句集保留策略与垃圾回收
+新子句超过权重/长度上限或被已有子句包含时不保留；每隔若干轮迭代删除被新子句包含的旧子句，
+并压缩子句集和相关索引（去重集合、支持集、预筛选签名），统计删除的子句数和估计回收的字节数
+"""
+
+import sys
+from rewriting import term_weight
+from subsumption import clause_features, subsumes
+
+
+def literals_weight(literals):
+    """文字列表的权重：谓词和项中符号的总数（与 ResolutionProver.clause_weight 一致）"""
+    return sum(1 + sum(term_weight(term) for term in literal.terms) for literal in literals)
+
+
+def clause_size(clause):
+    """
+    估计子句占用的字节数（子句、文字和项对象，不含模块级共享的常量）
+    项可能被多个子句共享，所以这是上限估计
+    """
+    def term_size(term):
+        size = sys.getsizeof(term) + sys.getsizeof(term.__dict__)
+        if term.args:
+            size += sys.getsizeof(term.args) + sum(term_size(arg) for arg in term.args)
+        return size
+
+    size = sys.getsizeof(clause) + sys.getsizeof(clause.__dict__) + sys.getsizeof(clause.literals)
+    for literal in clause.literals:
+        size += sys.getsizeof(literal) + sys.getsizeof(literal.__dict__) + sys.getsizeof(literal.terms)
+        size += sum(term_size(term) for term in literal.terms)
+    return size
+
+
+class RetentionPolicy:
+    """子句保留策略配置"""
+
+    def __init__(self, max_weight=None, max_literals=None, subsumption=True, compact_interval=1):
+        self.max_weight = max_weight  # 新子句的权重上限（超过则丢弃，不完备）
+        self.max_literals = max_literals  # 新子句的文字数上限（超过则丢弃，不完备）
+        self.subsumption = subsumption  # 是否做前向/后向包含删除（保持完备）
+        self.compact_interval = compact_interval  # 每多少轮迭代做一次后向包含删除和压缩
+
+    @property
+    def is_complete(self):
+        """没有权重/长度上限时，保留策略不影响完备性"""
+        return self.max_weight is None and self.max_literals is None
+
+    def to_dict(self):
+        """导出策略配置"""
+        return {
+            'max_weight': self.max_weight,
+            'max_literals': self.max_literals,
+            'subsumption': self.subsumption,
+            'compact_interval': self.compact_interval
+        }
+
+
+class ClauseRetention:
+    """一次推理中的保留状态：存活子句的特征、待做后向包含检查的新子句和统计"""
+
+    def __init__(self, policy):
+        self.policy = policy
+        self.features = {}  # 子句 id -> (谓词, 符号) 集合
+        self.fresh = []  # 上次压缩后保留的新子句
+        self.statistics = dict.fromkeys(
+            ('discarded_weight', 'discarded_length', 'discarded_subsumed', 'clauses_evicted',
+             'bytes_reclaimed', 'compactions'), 0)
+
+    def track(self, clause, fresh=True):
+        """登记存活子句"""
+        self.features[clause.id] = clause_features(clause.literals)
+        if fresh:
+            self.fresh.append(clause)
+
+    def rejection(self, literals, live_clauses):
+        """
+        检查新子句是否应该丢弃
+        参数: live_clauses 存活子句列表的列表（子句集和本轮保留的新子句）
+        返回: 丢弃原因 'weight'、'length' 或 'subsumed'，保留时返回 None
+        """
+        policy = self.policy
+        if policy.max_literals is not None and len(literals) > policy.max_literals:
+            self.statistics['discarded_length'] += 1
+            return 'length'
+        if policy.max_weight is not None and literals_weight(literals) > policy.max_weight:
+            self.statistics['discarded_weight'] += 1
+            return 'weight'
+        if policy.subsumption:
+            features = clause_features(literals)
+            for group in live_clauses:
+                for clause in group:
+                    # 特征不是子集的子句不可能包含新子句，先用集合比较过滤
+                    candidate = self.features.get(clause.id)
+                    if candidate is not None and candidate <= features and \
+                            len(clause.literals) <= len(literals) and subsumes(clause.literals, literals):
+                        self.statistics['discarded_subsumed'] += 1
+                        return 'subsumed'
+        return None
+
+    def due(self, iteration):
+        """本轮迭代后是否需要压缩"""
+        return self.policy.subsumption and (iteration + 1) % self.policy.compact_interval == 0
+
+    def collect(self, clauses):
+        """
+        后向包含删除：找出被上次压缩后的新子句包含的存活子句
+        返回: (被删除的子句列表, {被删除子句 id: 包含它的子句})
+        """
+        victims = {}
+        for subsumer in self.fresh:
+            if subsumer.id in victims:
+                continue
+            features = self.features[subsumer.id]
+            for clause in clauses:
+                if clause is subsumer or clause.id in victims:
+                    continue
+                if features <= self.features[clause.id] and \
+                        len(subsumer.literals) <= len(clause.literals) and \
+                        subsumes(subsumer.literals, clause.literals):
+                    victims[clause.id] = subsumer
+        self.fresh = []
+        evicted = [clause for clause in clauses if clause.id in victims]
+        return evicted, victims
+
+    def release(self, evicted):
+        """记录删除的子句并释放它们的特征"""
+        self.statistics['compactions'] += 1
+        for clause in evicted:
+            self.statistics['clauses_evicted'] += 1
+            self.statistics['bytes_reclaimed'] += clause_size(clause)
+            del self.features[clause.id]
+
+    def get_statistics(self):
+        """保留统计"""
+        statistics = dict(self.statistics)
+        statistics['live_clauses'] = len(self.features)
+        return statistics
@@ -0,0 +1,181 @@
+# rewriting.py
+"""
+等式重写（demodulation）
+有向重写规则存放在判别树索引中，把新子句中的项化简为范式
+"""
+
+from clause import Term, Literal
+from term_index import DiscriminationTree
+from unification import Unifier
+
+
+EQUALITY_PREDICATE = "Equal"  # 等式谓词 Equal(s, t)
+
+
+def term_weight(term):
+    """项的权重：符号个数"""
+    return 1 + sum(term_weight(arg) for arg in term.args)
+
+
+def variable_occurrences(term, counts=None):
+    """统计项中每个变量出现的次数"""
+    if counts is None:
+        counts = {}
+    if term.is_variable:
+        counts[term.name] = counts.get(term.name, 0) + 1
+    for arg in term.args:
+        variable_occurrences(arg, counts)
+    return counts
+
+
+def term_greater(s, t):
+    """
+    简化的 Knuth-Bendix 序：s > t 当且仅当 t 中每个变量在 s 中出现次数不少于 t，
+    且 s 权重更大，或两者都是基项、权重相同时按字符串比较更大
+    满足这个条件的规则 s -> t 保证重写会终止
+    """
+    s_vars = variable_occurrences(s)
+    for name, count in variable_occurrences(t).items():
+        if s_vars.get(name, 0) < count:
+            return False
+    s_weight, t_weight = term_weight(s), term_weight(t)
+    if s_weight != t_weight:
+        return s_weight > t_weight
+    # 权重相同的非基项（如交换律）无法安全定向
+    return not s_vars and str(s) > str(t)
+
+
+def instantiate(term, substitution):
+    """把替换应用到规则右部（只替换一次，不递归展开绑定的项）"""
+    if term.is_variable:
+        return substitution.get(term.name, term)
+    if not term.args:
+        return term
+    return Term(term.name, False, [instantiate(arg, substitution) for arg in term.args])
+
+
+class RewriteRule:
+    """有向重写规则 lhs -> rhs"""
+
+    def __init__(self, lhs, rhs):
+        if lhs.is_variable:
+            raise ValueError(f"重写规则左部不能是变量: {lhs}")
+        if not set(variable_occurrences(rhs)) <= set(variable_occurrences(lhs)):
+            raise ValueError(f"重写规则右部含有左部没有的变量: {lhs} -> {rhs}")
+        self.lhs = lhs
+        self.rhs = rhs
+
+    def __str__(self):
+        return f"{self.lhs} → {self.rhs}"
+
+
+class RuleSet:
+    """带判别树索引的重写规则集合"""
+
+    def __init__(self):
+        self.rules = []
+        self.index = DiscriminationTree()
+
+    def __len__(self):
+        return len(self.rules)
+
+    def add_rule(self, lhs, rhs):
+        """添加有向规则 lhs -> rhs"""
+        rule = RewriteRule(lhs, rhs)
+        self.rules.append(rule)
+        self.index.insert(lhs, rule)
+        return rule
+
+    def add_equation(self, s, t):
+        """
+        按项序给等式 s = t 定向后添加
+        返回: 添加的规则，无法定向时返回 None
+        """
+        if term_greater(s, t):
+            return self.add_rule(s, t)
+        if term_greater(t, s):
+            return self.add_rule(t, s)
+        return None
+
+    def copy(self):
+        """复制规则集（规则对象共享，索引重建）"""
+        other = RuleSet()
+        for rule in self.rules:
+            other.rules.append(rule)
+            other.index.insert(rule.lhs, rule)
+        return other
+
+    def candidates(self, term):
+        """通过索引找出左部可能匹配 term 的规则"""
+        return self.index.generalizations(term)
+
+
+class Demodulator:
+    """用规则集把项、文字和子句化简为范式"""
+
+    def __init__(self, rule_set):
+        self.rule_set = rule_set
+        self.normal_forms = {}  # 项 -> 范式 的缓存（规则集变化时清空）
+        self._rule_count = len(rule_set)
+        self.rewrites = 0  # 规则应用次数
+        self.match_attempts = 0  # 索引返回的候选规则匹配次数
+
+    def normalize_term(self, term):
+        """最内层优先重写直到没有规则可用"""
+        if self._rule_count != len(self.rule_set):
+            self.normal_forms.clear()
+            self._rule_count = len(self.rule_set)
+
+        cached = self.normal_forms.get(term)
+        if cached is not None:
+            return cached
+
+        result = term
+        if term.args:
+            new_args = [self.normalize_term(arg) for arg in term.args]
+            if any(new is not old for new, old in zip(new_args, term.args)):
+                result = Term(term.name, False, new_args)
+
+        if not result.is_variable:
+            for rule in self.rule_set.candidates(result):
+                self.match_attempts += 1
+                substitution = Unifier.match(rule.lhs, result)
+                if substitution is not None:
+                    self.rewrites += 1
+                    result = self.normalize_term(instantiate(rule.rhs, substitution))
+                    break
+
+        self.normal_forms[term] = result
+        return result
+
+    def normalize_literal(self, literal):
+        """化简文字的所有参数，没有变化时返回原文字"""
+        new_terms = [self.normalize_term(term) for term in literal.terms]
+        if all(new is old for new, old in zip(new_terms, literal.terms)):
+            return literal
+        return Literal(literal.predicate, new_terms, literal.negated)
+
+    def normalize_literals(self, literals):
+        """
+        化简文字列表并做等式化简
+        返回: 化简后的文字列表；含 Equal(t, t) 的子句恒真，返回 None
+        """
+        unique_literals = {}
+        for literal in literals:
+            literal = self.normalize_literal(literal)
+            if literal.predicate == EQUALITY_PREDICATE and len(literal.terms) == 2 and \
+                    literal.terms[0] == literal.terms[1]:
+                if not literal.negated:
+                    return None  # Equal(t, t) 恒真
+                continue  # ¬Equal(t, t) 恒假，直接删除
+            unique_literals[literal] = None
+        return list(unique_literals)
+
+    def get_statistics(self):
+        """重写统计"""
+        return {
+            'rewrite_rules': len(self.rule_set),
+            'rewrites': self.rewrites,
+            'rule_match_attempts': self.match_attempts,
+            'normal_form_cache': len(self.normal_forms)
+        }
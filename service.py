@@ -0,0 +1,219 @@
+# service.py
+"""
+asyncio 推理服务
+在有界线程池中运行推理，共享同一组公理的查询合并成一批，公理只添加和标准化一次
+等待队列满时 prove() 会等待（背压）；取消和超时通过 Budget.cancel() 真正停止推理
+"""
+
+import asyncio
+import collections
+import concurrent.futures
+import os
+from budget import Budget
+from resolution import ResolutionProver
+from result import ProofResult
+
+
+class _ProofRequest:
+    """等待中的查询"""
+
+    __slots__ = ('goals', 'budget', 'future')
+
+    def __init__(self, goals, budget, future):
+        self.goals = goals
+        self.budget = budget
+        self.future = future
+
+
+def axiom_key(axioms):
+    """公理集的键：与子句顺序无关的子句键集合"""
+    return frozenset(ResolutionProver.clause_key(clause.literals) for clause in axioms)
+
+
+def split_goals(clauses):
+    """把子句分为公理和目标（source == 'goal'）"""
+    axioms, goals = [], []
+    for clause in clauses:
+        (goals if clause.source == 'goal' else axioms).append(clause)
+    return axioms, goals
+
+
+def prove_batch(axioms, queries, configuration, deliver):
+    """
+    在工作线程中运行一批共享公理的查询
+    参数: queries 为 (目标子句列表, Budget) 列表；deliver(index, result, error) 在每个查询完成时调用
+    """
+    base = ResolutionProver()
+    base.configure(**configuration)
+    for clause in axioms:
+        base.add_clause(clause, goal=False)
+
+    for index, (goals, budget) in enumerate(queries):
+        if budget.cancelled:
+            deliver(index, ProofResult(ProofResult.UNKNOWN, 'cancelled'), None)
+            continue
+        try:
+            prover = base.fork()
+            for clause in goals:
+                prover.add_clause(clause, goal=True)
+            deliver(index, prover.two_pointer_resolution(budget), None)
+        except Exception as e:
+            deliver(index, None, e)
+
+
+class ProverService:
+    """
+    异步推理服务
+
+        async with ProverService(workers=4) as service:
+            result = await service.prove(clauses, budget=Budget(time_limit=5), timeout=10)
+    """
+
+    def __init__(self, workers=None, max_pending=64, max_batch=16, configuration=None):
+        self.workers = workers or os.cpu_count() or 1  # 同时运行的批次数（线程数）
+        self.max_pending = max_pending  # 等待队列容量，满时 prove() 等待
+        self.max_batch = max_batch  # 每批最多合并的查询数
+        self.configuration = dict(configuration or {})  # 传给 ResolutionProver.configure() 的参数
+        self.statistics = dict.fromkeys(('requests', 'batches', 'batched_requests', 'cancelled', 'timeouts'), 0)
+        self.running = 0  # 正在运行的批次数
+        self._waiting = collections.OrderedDict()  # 公理键 -> (公理, 等待的查询列表)，按到达顺序
+        self._running_budgets = set()  # 正在运行的批次中查询的预算
+        self._loop = None
+        self._executor = None
+        self._dispatcher = None
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc, traceback):
+        await self.close()
+
+    @property
+    def pending(self):
+        """等待中的查询数"""
+        return sum(len(requests) for _, requests in self._waiting.values())
+
+    async def start(self):
+        """启动工作线程池和调度任务"""
+        if self._dispatcher is not None:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._capacity = asyncio.Semaphore(self.max_pending)
+        self._idle_workers = asyncio.Semaphore(self.workers)
+        self._ready = asyncio.Event()
+        self._executor = concurrent.futures.ThreadPoolExecutor(self.workers, thread_name_prefix='prover')
+        self._dispatcher = self._loop.create_task(self._dispatch())
+
+    async def close(self):
+        """停止服务：取消等待中的查询，停止正在运行的推理"""
+        if self._dispatcher is None:
+            return
+        self._dispatcher.cancel()
+        try:
+            await self._dispatcher
+        except asyncio.CancelledError:
+            pass
+        self._dispatcher = None
+
+        for _, requests in self._waiting.values():
+            for request in requests:
+                request.future.cancel()
+        self._waiting.clear()
+        for budget in list(self._running_budgets):
+            budget.cancel()
+        await self._loop.run_in_executor(None, self._executor.shutdown)
+        self._executor = None
+
+    async def prove(self, clauses, budget=None, timeout=None):
+        """
+        证明子句集（目标子句以 source == 'goal' 标记）
+        参数: budget 推理预算（会被取消操作修改，不要在并发查询间共享）；timeout 包括排队时间的总超时（秒）
+        返回: ProofResult
+        超时抛出 asyncio.TimeoutError，调用方取消时抛出 asyncio.CancelledError，两种情况下推理都会停止
+        """
+        if self._dispatcher is None:
+            raise RuntimeError("推理服务未启动")
+        budget = budget if budget is not None else Budget()
+        self.statistics['requests'] += 1
+        if timeout is None:
+            return await self._submit(clauses, budget)
+        try:
+            return await asyncio.wait_for(self._submit(clauses, budget), timeout)
+        except asyncio.TimeoutError:
+            self.statistics['timeouts'] += 1
+            raise
+
+    async def _submit(self, clauses, budget):
+        # 等待队列满时在这里等待，背压传递给调用方
+        await self._capacity.acquire()
+        axioms, goals = split_goals(clauses)
+        key = axiom_key(axioms)
+        request = _ProofRequest(goals, budget, self._loop.create_future())
+        if key not in self._waiting:
+            self._waiting[key] = (axioms, [])
+        self._waiting[key][1].append(request)
+        self._ready.set()
+
+        try:
+            return await request.future
+        except asyncio.CancelledError:
+            # 超时或调用方取消：还在排队就移出队列，已经在运行就让推理在下一次预算检查时停止
+            budget.cancel()
+            self.statistics['cancelled'] += 1
+            entry = self._waiting.get(key)
+            if entry is not None and request in entry[1]:
+                entry[1].remove(request)
+                if not entry[1]:
+                    del self._waiting[key]
+                self._capacity.release()
+            raise
+
+    async def _dispatch(self):
+        """调度循环：有空闲工作线程时取出最早到达的公理集的一批查询"""
+        while True:
+            await self._idle_workers.acquire()
+            while not self._waiting:
+                self._ready.clear()
+                await self._ready.wait()
+
+            key = next(iter(self._waiting))
+            axioms, requests = self._waiting[key]
+            batch = requests[:self.max_batch]
+            del requests[:self.max_batch]
+            if not requests:
+                del self._waiting[key]
+            for _ in batch:
+                self._capacity.release()
+
+            self.statistics['batches'] += 1
+            self.statistics['batched_requests'] += len(batch)
+            self.running += 1
+            self._running_budgets.update(request.budget for request in batch)
+            queries = [(request.goals, request.budget) for request in batch]
+            future = self._loop.run_in_executor(
+                self._executor, prove_batch, axioms, queries, self.configuration,
+                lambda index, result, error, batch=batch: self._loop.call_soon_threadsafe(
+                    self._deliver, batch[index], result, error))
+            future.add_done_callback(lambda done, batch=batch: self._batch_done(done, batch))
+
+    @staticmethod
+    def _deliver(request, result, error):
+        """在事件循环线程中设置查询结果（已取消的查询忽略）"""
+        if request.future.done():
+            return
+        if error is not None:
+            request.future.set_exception(error)
+        else:
+            request.future.set_result(result)
+
+    def _batch_done(self, future, batch):
+        """批次结束：释放工作线程；批次本身出错（如配置错误）时让未完成的查询抛出同样的异常"""
+        error = None if future.cancelled() else future.exception()
+        if error is not None:
+            for request in batch:
+                if not request.future.done():
+                    request.future.set_exception(error)
+        self.running -= 1
+        self._running_budgets.difference_update(request.budget for request in batch)
+        self._idle_workers.release()
@@ -0,0 +1,192 @@
+# sld.py
+"""
+Horn 查询的反向链接（带表格化的 SLD 归结）
+从目标子句（结论的否定）出发，用子句头索引找出可以归结的规则，每个子目标的答案按变体记录在表中：
+同一个子目标（只差变量名）只求解一次，递归调用只读取表中已有的答案，
+由强连通分量的首个子目标反复求值直到不再产生新答案（不动点），然后整组表标记为完成。
+这样左递归规则（如 Path(x, z) ← Path(x, y) ∧ Edge(y, z)）不会无限循环，重复的子目标也不会重复求解
+"""
+
+from clause import Clause, Literal, Term
+from subsumption import match_literal
+from term_index import DiscriminationTree
+from unification import Unifier
+
+
+def _variant_key(literal):
+    """子目标/答案的变体键：变量按出现顺序重命名后的原子"""
+    return Clause([literal]).standardize_variables({'x': 0}).literals[0].atom()
+
+
+def _atom_term(literal):
+    """把原子当作以谓词为函数符号的项，用于判别树索引"""
+    return Term(literal.predicate, False, literal.terms)
+
+
+def _positive(literal):
+    return Literal(literal.predicate, literal.terms)
+
+
+class _Stop(Exception):
+    """超出步数或预算时中止求值"""
+
+    def __init__(self, reason):
+        super().__init__(reason)
+        self.reason = reason
+
+
+class Table:
+    """一个子目标（按变体）的答案表"""
+
+    def __init__(self, atom):
+        self.atom = atom
+        self.answers = []  # 子目标的实例（正文字）
+        self.keys = set()  # 答案的变体键
+        self.general = []  # 含变量的答案，它们的实例不再加入表中
+        self.complete = False
+        self.index = None  # 求值期间在调用栈中的位置
+        self.lowlink = None  # 求值时依赖的栈中最早的子目标位置
+
+
+class TabledSLD:
+    """带表格化的 SLD 反向链接引擎"""
+
+    def __init__(self, clauses, var_counter=None, max_steps=None, budget=None):
+        self.heads = DiscriminationTree()  # 规则头 -> 子句
+        self.goals = []  # 目标子句（全部为负文字）
+        for clause in clauses:
+            head = next((literal for literal in clause.literals if not literal.negated), None)
+            if head is None:
+                self.goals.append(clause)
+            else:
+                self.heads.insert(_atom_term(head), clause)
+        self.var_counter = var_counter if var_counter is not None else {'x': 0}
+        self.max_steps = max_steps
+        self.budget = budget
+        self.tables = {}  # 变体键 -> Table
+        self.stack = []  # 正在求值的表
+        self.scc = []  # 已经返回但还依赖栈中子目标、等待首个子目标完成的表
+        self.incomplete_reads = 0  # 读取未完成的表的次数
+        self.proof = None  # (目标子句, 目标变量的绑定)
+        self.statistics = dict.fromkeys(('resolutions', 'answers', 'table_hits', 'reevaluations'), 0)
+
+    def prove(self):
+        """
+        依次求解每个目标子句
+        返回: 'proved'、'saturated'（所有目标都没有解）、'max_steps'、'depth' 或预算超出的原因
+        """
+        try:
+            for goal in self.goals:
+                body = [_positive(literal) for literal in goal.literals]
+                for bindings in self.solve_body(body, {}):
+                    self.proof = (goal, {name: Unifier.apply_substitution(Term(name, True), bindings)
+                                         for name in goal.variables()})
+                    return 'proved'
+        except _Stop as stop:
+            return stop.reason
+        except RecursionError:
+            return 'depth'
+        return 'saturated'
+
+    def solve_body(self, body, bindings):
+        """逐个求解合取的子目标，生成所有满足整个合取的绑定"""
+        if not body:
+            yield bindings
+            return
+        atom = _positive(Unifier.apply_substitution_to_literal(body[0], bindings))
+        for answer in self.solve(atom):
+            if Clause([answer]).variables():
+                answer = Literal(answer.predicate, Clause([answer]).rename_apart(self.var_counter)[0].terms)
+            extended = dict(bindings)
+            for term1, term2 in zip(atom.terms, answer.terms):
+                extended = Unifier.unify(term1, term2, extended)
+                if extended is None:
+                    break
+            if extended is not None:
+                yield from self.solve_body(body[1:], extended)
+
+    def solve(self, atom):
+        """返回子目标的答案；完成的表直接返回，正在求值的表返回目前已有的答案"""
+        key = _variant_key(atom)
+        table = self.tables.get(key)
+        if table is not None and table.complete:
+            self.statistics['table_hits'] += 1
+            return table.answers
+        if table is not None and table.index is not None:
+            # 递归调用：调用者依赖栈中更早的子目标，由那个子目标负责反复求值
+            caller = self.stack[-1]
+            caller.lowlink = min(caller.lowlink, table.index)
+            self.incomplete_reads += 1
+            return list(table.answers)
+        if table is None:
+            table = self.tables[key] = Table(atom)
+
+        table.index = len(self.stack)
+        self.stack.append(table)
+        scc_start = len(self.scc)
+        while True:
+            table.lowlink = table.index
+            answers, reads = self.statistics['answers'], self.incomplete_reads
+            self.evaluate(table)
+            # 这一轮只用到完成的表，或者没有产生新答案，就到达了不动点
+            if table.lowlink < table.index or self.statistics['answers'] == answers or \
+                    self.incomplete_reads == reads:
+                break
+            self.statistics['reevaluations'] += 1
+        self.stack.pop()
+        index, table.index = table.index, None
+
+        if table.lowlink < index:
+            # 依赖栈中更早的子目标：答案可能还不完整，由那个子目标负责完成
+            caller = self.stack[-1]
+            caller.lowlink = min(caller.lowlink, table.lowlink)
+            self.scc.append(table)
+        else:
+            # 强连通分量的首个子目标到达不动点，分量中的表都已完整
+            table.complete = True
+            for member in self.scc[scc_start:]:
+                member.complete = True
+            del self.scc[scc_start:]
+        return list(table.answers)
+
+    def evaluate(self, table):
+        """用每个头部可合一的子句求解一次子目标，把新答案加入表中"""
+        atom = table.atom
+        for clause in self.heads.unifiable(_atom_term(atom)):
+            self.statistics['resolutions'] += 1
+            self.check_limits()
+            literals = clause.rename_apart(self.var_counter)
+            head = next(literal for literal in literals if not literal.negated)
+            bindings = Unifier.unify_literals(atom, head)
+            if bindings is None:
+                continue
+            body = [_positive(literal) for literal in literals if literal.negated]
+            for solution in self.solve_body(body, bindings):
+                answer = _positive(Unifier.apply_substitution_to_literal(atom, solution))
+                key = _variant_key(answer)
+                if key in table.keys or any(match_literal(general, answer, {}) is not None
+                                            for general in table.general):
+                    continue
+                table.keys.add(key)
+                table.answers.append(answer)
+                if Clause([answer]).variables():
+                    table.general.append(answer)
+                self.statistics['answers'] += 1
+
+    def check_limits(self):
+        """检查步数和预算"""
+        resolutions = self.statistics['resolutions']
+        if self.max_steps is not None and resolutions > self.max_steps:
+            raise _Stop('max_steps')
+        budget = self.budget
+        if budget is not None and resolutions % budget.check_interval == 0:
+            exceeded = budget.exceeded(self.statistics['answers'])
+            if exceeded:
+                raise _Stop(exceeded)
+
+    def get_statistics(self):
+        """表和求值计数"""
+        statistics = dict(self.statistics)
+        statistics['tables'] = len(self.tables)
+        statistics['tables_complete'] = sum(1 for table in self.tables.values() if table.complete)
+        return statistics
@@ -0,0 +1,231 @@
+# sorts.py
+"""
+多类型推断（many-sorted sort inference）
+输入子句集没有声明类型，但谓词和函数的参数位置隐含着不同的种类（人 / 狗 / 品种）。
+把每个参数位置、常量和函数结果、以及每个子句中的变量看作一个节点，同一个项出现的位置合并（并查集），
+得到的等价类就是类型：同一个变量出现的两个位置、同一个常量出现的两个位置属于同一类型。
+
+推断出的类型对普通谓词自动成立（互补文字的参数在同一位置），只有多态的等式 Equal(s, t) 把
+不同类型的文字放在同一个谓词下：Equal 的两个参数只与彼此合并，不与 Equal 的参数位置合并。
+归结前先比较两个等式文字的类型（由参数的函数符号或常量决定），类型不同的文字对不做合一。
+
+有正等式文字的某个参数是变量（例如 Equal(x, c)）时，它限制了论域的大小，按类型分开不再保持可满足性，
+这时等式按普通谓词处理（不剪枝）。没有这样的文字时，被剪掉的文字对在同一参数位置上的函数符号或常量不同，
+合一本来也会失败，剪枝不改变推理结果，只省去合一
+"""
+
+from rewriting import EQUALITY_PREDICATE
+
+
+class _UnionFind:
+    """并查集（节点是任意可哈希的键）"""
+
+    def __init__(self):
+        self.parent = {}
+
+    def find(self, node):
+        parent = self.parent.setdefault(node, node)
+        if parent == node:
+            return node
+        root = self.find(parent)
+        self.parent[node] = root
+        return root
+
+    def union(self, node1, node2):
+        root1, root2 = self.find(node1), self.find(node2)
+        if root1 != root2:
+            self.parent[root2] = root1
+
+
+def _has_variable_equation(clauses):
+    """是否有参数为变量的正等式文字"""
+    return any(not literal.negated and literal.predicate == EQUALITY_PREDICATE and
+               any(term.is_variable for term in literal.terms)
+               for clause in clauses for literal in clause.literals)
+
+
+def infer_sorts(clauses, equations=()):
+    """
+    推断子句集的类型
+    参数: equations 额外的等式 (s, t)，例如已经变成重写规则的单元等式
+    返回: SortSignature
+    """
+    clauses = list(clauses)
+    polymorphic = not _has_variable_equation(clauses)
+    sets = _UnionFind()
+
+    def visit(term, node, scope):
+        """项 term 出现在节点 node 代表的位置"""
+        if term.is_variable:
+            sets.union(node, ('var', scope, term.name))
+            return
+        sets.union(node, ('symbol', term.name))
+        for k, arg in enumerate(term.args):
+            visit(arg, ('position', term.name, k), scope)
+
+    for scope, clause in enumerate(clauses):
+        for number, literal in enumerate(clause.literals):
+            if polymorphic and literal.predicate == EQUALITY_PREDICATE and len(literal.terms) == 2:
+                node = ('equation', scope, number)
+                for term in literal.terms:
+                    visit(term, node, scope)
+                continue
+            for k, term in enumerate(literal.terms):
+                visit(term, ('position', literal.predicate, k), scope)
+    for number, (s, t) in enumerate(equations):
+        # 重写规则的变量只出现在这一条等式中
+        node = ('equation', -1, number)
+        visit(s, node, -1 - number)
+        visit(t, node, -1 - number)
+
+    # 类型按第一次出现的顺序编号
+    numbers = {}
+    position_sorts = {}
+    symbol_sorts = {}
+    for node in list(sets.parent):
+        if node[0] == 'position':
+            position_sorts[node[1:]] = numbers.setdefault(sets.find(node), len(numbers))
+        elif node[0] == 'symbol':
+            symbol_sorts[node[1]] = numbers.setdefault(sets.find(node), len(numbers))
+    return SortSignature(position_sorts, symbol_sorts, polymorphic)
+
+
+class SortSignature:
+    """推断出的类型和类型检查统计"""
+
+    def __init__(self, position_sorts, symbol_sorts, polymorphic_equality=True):
+        self.position_sorts = position_sorts  # (谓词或函数符号, 参数位置) -> 类型编号
+        self.symbol_sorts = symbol_sorts  # 常量或函数符号 -> 结果的类型编号
+        self.polymorphic_equality = polymorphic_equality  # 等式是否按类型分开（可以剪枝）
+        self.keys = {}  # 子句 id -> (子句, 类型键, 互补类型键)
+        self.statistics = dict.fromkeys(('sort_checks', 'sort_pruned', 'sort_pairs_pruned'), 0)
+
+    @property
+    def sort_count(self):
+        """类型数"""
+        return len(set(self.position_sorts.values()) | set(self.symbol_sorts.values()))
+
+    def term_sort(self, term):
+        """项的类型：变量和推断时没有出现的符号返回 None"""
+        if term.is_variable:
+            return None
+        return self.symbol_sorts.get(term.name)
+
+    def literal_sort(self, literal):
+        """等式文字的类型（由第一个不是变量的参数决定），其他文字返回 None"""
+        if literal.predicate != EQUALITY_PREDICATE:
+            return None
+        for term in literal.terms:
+            if not term.is_variable:
+                return self.symbol_sorts.get(term.name)
+        return None
+
+    def _clash(self, literal1, literal2):
+        sort1 = self.literal_sort(literal1)
+        if sort1 is None:
+            return False
+        sort2 = self.literal_sort(literal2)
+        return sort2 is not None and sort1 != sort2
+
+    def compatible(self, literal1, literal2):
+        """合一前的类型检查：谓词相同的两个文字类型是否相容"""
+        if not self.polymorphic_equality or literal1.predicate != EQUALITY_PREDICATE:
+            return True
+        self.statistics['sort_checks'] += 1
+        if self._clash(literal1, literal2):
+            self.statistics['sort_pruned'] += 1
+            return False
+        return True
+
+    def clause_keys(self, clause):
+        """
+        子句的 (谓词, 是否否定, 类型) 集合及其互补形式，按子句缓存
+        缓存中保留子句对象，推理期间子句 id 不会被复用
+        """
+        cached = self.keys.get(clause.id)
+        if cached is None or cached[0] is not clause:
+            keys = frozenset((literal.predicate, literal.negated, self.literal_sort(literal))
+                             for literal in clause.literals)
+            complements = frozenset((predicate, not negated, sort) for predicate, negated, sort in keys)
+            cached = self.keys[clause.id] = (clause, keys, complements)
+        return cached[1], cached[2]
+
+    def complementary(self, clause1, clause2):
+        """
+        候选子句对筛选（代替只比较谓词的检查）：两个子句是否有类型相容的互补文字
+        只因为等式的类型不同而没有候选文字对的子句对计入 sort_pairs_pruned
+        """
+        keys1, _ = self.clause_keys(clause1)
+        _, keys2 = self.clause_keys(clause2)
+        if not keys1.isdisjoint(keys2):
+            return True
+        # 互补的谓词只剩类型不同或类型未知（None，与任何类型相容）的等式
+        sorts2 = {}
+        for predicate, negated, sort in keys2:
+            sorts2.setdefault((predicate, negated), set()).add(sort)
+        shared = False
+        for predicate, negated, sort in keys1:
+            other = sorts2.get((predicate, negated))
+            if other is None:
+                continue
+            if sort is None or None in other:
+                return True
+            shared = True
+        if shared:
+            self.statistics['sort_pairs_pruned'] += 1
+        return False
+
+    def describe(self):
+        """每个类型包含的常量和函数符号 {类型编号: [符号]}"""
+        groups = {}
+        for symbol, sort in self.symbol_sorts.items():
+            groups.setdefault(sort, []).append(symbol)
+        return {sort: sorted(symbols) for sort, symbols in sorted(groups.items())}
+
+    def get_statistics(self):
+        """类型数、等式文字对的类型检查数和剪枝数"""
+        statistics = dict(self.statistics)
+        statistics['sorts'] = self.sort_count
+        statistics['sort_prune_rate'] = (
+            self.statistics['sort_pruned'] / self.statistics['sort_checks'] if self.statistics['sort_checks'] else 0.0)
+        return statistics
+
+
+def benchmark_sorts(max_steps=5000):
+    """
+    比较推断类型前后的剪枝：内置问题和带两类等式的宠物登记问题
+    返回: {工作负载: {'off': {...}, 'on': {...}}}，每项包含状态、步数、类型数、合一次数、剪枝数和耗时
+    """
+    from problems import ProblemBuilder, get_all_problems
+    from resolution import ResolutionProver
+
+    workloads = {name: info['builder'] for name, info in get_all_problems().items()}
+    workloads['pet_registry'] = lambda: ProblemBuilder.create_pet_registry(12)
+    report = {}
+    for name, builder in workloads.items():
+        report[name] = {}
+        for mode, sorts in (('off', False), ('on', True)):
+            prover = ResolutionProver()
+            prover.configure(max_steps=max_steps, sorts=sorts)
+            for clause in builder():
+                prover.add_clause(clause)
+            result = prover.two_pointer_resolution()
+            statistics = result.statistics
+            report[name][mode] = {
+                'status': result.status,
+                'steps': statistics['total_steps'],
+                'sorts': statistics.get('sorts'),
+                'unifications': statistics['unifications_succeeded'] + statistics['unifications_failed'],
+                'sort_pruned': statistics.get('sort_pruned', 0),
+                'sort_pairs_pruned': statistics.get('sort_pairs_pruned', 0),
+                'duration': statistics['duration']
+            }
+    return report
+
+
+if __name__ == "__main__":
+    for name, modes in benchmark_sorts().items():
+        for mode, row in modes.items():
+            print(f"{name:<15} {mode:<4} {row['status']:<8} 步数 {row['steps']:<5} 类型 {row['sorts'] or '-':<3} "
+                  f"合一 {row['unifications']:<6} 剪枝文字对 {row['sort_pruned']:<4} "
+                  f"剪枝子句对 {row['sort_pairs_pruned']:<5} {row['duration']:.4f}s")
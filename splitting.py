@@ -0,0 +1,153 @@
+# splitting.py
+"""
+子句拆分（不回溯的命名拆分）
+子句中不共享变量的文字组（例如 VIP(y) ∨ CustomsOfficial(x)）彼此独立，作为一个宽子句参与归结会让
+每个子句对的 文字 × 文字 循环和之后的归结式都变宽。把子句 C = K1 ∨ K2 ∨ ... ∨ Kk 按共享变量分成连通分量后，
+保留最大的分量（和所有基文字），其余每个分量 Ki 用一个新的命题符号 p 代替：
+    K1 ∨ p2 ∨ ... ∨ pk     以及定义子句     ¬pi ∨ Ki
+分量的变量互不相交，所以 p 可以解释为 ∀Ki，拆分前后可满足性相同（不需要回溯）。
+只差变量名的分量在所有子句中共用同一个名字，定义子句只加入一次，分量的推论只推导一次
+"""
+
+from answers import ANSWER_PREDICATE
+from clause import Clause, Literal
+
+
+SPLIT_PREFIX = '$split'
+
+
+def is_split_literal(literal):
+    """是否是拆分引入的命题符号"""
+    return literal.predicate.startswith(SPLIT_PREFIX) and not literal.terms
+
+
+def literal_variables(literal):
+    """文字中的变量名集合"""
+    names = set()
+    stack = list(literal.terms)
+    while stack:
+        term = stack.pop()
+        if term.is_variable:
+            names.add(term.name)
+        else:
+            stack.extend(term.args)
+    return names
+
+
+def variable_components(literals):
+    """
+    按共享变量把文字分组（保持文字顺序）
+    返回: (含变量的分量列表, 基文字列表)
+    """
+    components = []  # [(文字列表, 变量集合)]
+    ground = []
+    for literal in literals:
+        names = literal_variables(literal)
+        if not names:
+            ground.append(literal)
+            continue
+        group = [literal]
+        remaining = []
+        for component in components:
+            if names.isdisjoint(component[1]):
+                remaining.append(component)
+            else:
+                group = component[0] + group
+                names |= component[1]
+        remaining.append((group, names))
+        components = remaining
+    return [group for group, _ in components], ground
+
+
+def component_key(literals):
+    """分量的缓存键：变量按出现顺序重命名后的文字集合（与变量名无关）"""
+    return frozenset(Clause(list(literals)).standardize_variables({'x': 0}).literals)
+
+
+class ClauseSplitter:
+    """一次推理中的分量名字缓存和拆分统计"""
+
+    def __init__(self, min_literals=2):
+        self.min_literals = min_literals  # 分量至少有几个文字才用名字代替（单个文字换成名字不会变窄）
+        self.names = {}  # 分量键 -> 名字（正的命题文字）
+        self.statistics = dict.fromkeys(('split_clauses', 'split_components', 'split_reused'), 0)
+
+    def split(self, literals):
+        """
+        拆分文字列表
+        返回: 不需要拆分时返回 None；否则返回 (主子句的文字, [新定义子句的文字])，
+              已经有名字的分量不会再产生定义子句
+        """
+        if len(literals) <= self.min_literals or \
+                any(literal.predicate == ANSWER_PREDICATE for literal in literals):
+            return None
+        components, ground = variable_components(literals)
+        if len(components) < 2:
+            return None
+
+        kept = max(components, key=len)
+        main = list(kept) + ground
+        definitions = []
+        named = 0
+        for component in components:
+            if component is kept:
+                continue
+            if len(component) < self.min_literals:
+                main.extend(component)
+                continue
+            named += 1
+            key = component_key(component)
+            name = self.names.get(key)
+            if name is None:
+                name = self.names[key] = Literal(f"{SPLIT_PREFIX}{len(self.names) + 1}", [])
+                definitions.append([Literal(name.predicate, [], negated=True)] + component)
+                self.statistics['split_components'] += 1
+            else:
+                self.statistics['split_reused'] += 1
+            main.append(name)
+        if not named:
+            return None
+        self.statistics['split_clauses'] += 1
+        return main, definitions
+
+    def get_statistics(self):
+        """拆分的子句数、新命名的分量数和复用已有名字的次数"""
+        return dict(self.statistics)
+
+
+def benchmark_splitting(max_steps=3000):
+    """
+    比较拆分前后的子句宽度和文字对检查数：内置问题，以及去掉目标的毒贩问题公理（饱和到 max_steps）
+    返回: {工作负载: {'off': {...}, 'on': {...}}}，每项包含状态、步数、平均子句宽度、文字对检查数和耗时
+    """
+    from problems import ProblemBuilder, get_all_problems
+    from resolution import ResolutionProver
+
+    workloads = {name: info['builder'] for name, info in get_all_problems().items()}
+    workloads['drug_dealer_axioms'] = lambda: [clause for clause in ProblemBuilder.create_drug_dealer_optimized()
+                                               if clause.source != 'goal']
+    report = {}
+    for name, builder in workloads.items():
+        report[name] = {}
+        for mode, splitting in (('off', False), ('on', 2)):
+            prover = ResolutionProver()
+            prover.configure(max_steps=max_steps, splitting=splitting)
+            for clause in builder():
+                prover.add_clause(clause)
+            result = prover.two_pointer_resolution()
+            statistics = result.statistics
+            report[name][mode] = {
+                'status': result.status,
+                'steps': statistics['total_steps'],
+                'width': statistics['clause_width_mean'],
+                'literal_pairs': statistics['literal_pairs_examined'],
+                'duration': statistics['duration']
+            }
+    return report
+
+
+if __name__ == "__main__":
+    for name, modes in benchmark_splitting().items():
+        for mode, row in modes.items():
+            print(f"{name:<20} {mode:<4} {row['status']:<9} 步数 {row['steps']:<5} 平均宽度 {row['width']:.2f}  "
+                  f"文字对 {row['literal_pairs']:<7} {row['duration']:.3f}s")
@@ -0,0 +1,55 @@
+# subsumption.py
+"""
+子句包含（θ-subsumption）
+子句 C 包含子句 D：存在替换 σ 使 Cσ 的每个文字都出现在 D 中，这时 D 是冗余的，删除它不影响完备性
+只考虑文字数不多于 D 的 C（不需要因子化的包含）
+"""
+
+from unification import Unifier
+
+
+def clause_features(literals):
+    """子句的 (谓词, 符号) 集合：C 包含 D 的必要条件是 C 的特征是 D 的特征的子集"""
+    return frozenset((literal.predicate, literal.negated) for literal in literals)
+
+
+def match_literal(pattern, literal, substitution):
+    """
+    单向匹配文字（只绑定 pattern 中的变量）
+    返回: 扩展后的新替换，失败返回 None（不修改传入的替换）
+    """
+    if pattern.predicate != literal.predicate or pattern.negated != literal.negated or \
+            len(pattern.terms) != len(literal.terms):
+        return None
+    extended = dict(substitution)
+    for pattern_term, term in zip(pattern.terms, literal.terms):
+        if Unifier.match(pattern_term, term, extended) is None:
+            return None
+    return extended
+
+
+def subsumes(literals1, literals2):
+    """检查文字列表 literals1 是否包含 literals2（回溯搜索每个文字的匹配对象）"""
+    if len(literals1) > len(literals2):
+        return False
+    if not clause_features(literals1) <= clause_features(literals2):
+        return False
+
+    # 参数多的文字约束强，先匹配它们可以更早剪枝
+    ordered = sorted(literals1, key=lambda literal: -len(literal.terms))
+
+    def search(index, substitution):
+        if index == len(ordered):
+            return True
+        for literal in literals2:
+            extended = match_literal(ordered[index], literal, substitution)
+            if extended is not None and search(index + 1, extended):
+                return True
+        return False
+
+    return search(0, {})
+
+
+def is_variant(literals1, literals2):
+    """两个子句互相包含（只差变量重命名）"""
+    return subsumes(literals1, literals2) and subsumes(literals2, literals1)
@@ -0,0 +1,137 @@
+# term_index.py
+"""
+项索引（判别树）
+按项的前序符号序列建立前缀树，用于快速找出可能与查询项匹配或合一的候选项
+"""
+
+VARIABLE = '*'  # 判别树中变量的符号
+
+
+def preorder(term):
+    """项的前序符号序列：变量记为 '*'，函数/常量记为 (名称, 参数个数)"""
+    symbols = []
+
+    def walk(t):
+        if t.is_variable:
+            symbols.append(VARIABLE)
+            return
+        symbols.append((t.name, len(t.args)))
+        for arg in t.args:
+            walk(arg)
+
+    walk(term)
+    return symbols
+
+
+def _skip_table(symbols):
+    """skip[i] 为从位置 i 开始的子项结束后的位置"""
+    skip = [0] * len(symbols)
+    for i in range(len(symbols) - 1, -1, -1):
+        symbol = symbols[i]
+        end = i + 1
+        if symbol != VARIABLE:
+            for _ in range(symbol[1]):
+                end = skip[end]
+        skip[i] = end
+    return skip
+
+
+class DiscriminationTree:
+    """判别树：键为项，值为任意对象（同一个项可以对应多个值）"""
+
+    def __init__(self):
+        self.root = {}
+        self.size = 0
+
+    def __len__(self):
+        return self.size
+
+    def insert(self, term, value):
+        """插入 term -> value"""
+        node = self.root
+        for symbol in preorder(term):
+            node = node.setdefault(symbol, {})
+        node.setdefault(None, []).append(value)
+        self.size += 1
+
+    def remove(self, term, value):
+        """删除 term -> value，返回是否删除成功"""
+        path = [self.root]
+        node = self.root
+        symbols = preorder(term)
+        for symbol in symbols:
+            node = node.get(symbol)
+            if node is None:
+                return False
+            path.append(node)
+
+        values = node.get(None)
+        if not values or value not in values:
+            return False
+        values.remove(value)
+        self.size -= 1
+
+        # 清理空节点
+        if not values:
+            del node[None]
+        for depth in range(len(symbols), 0, -1):
+            if path[depth]:
+                break
+            del path[depth - 1][symbols[depth - 1]]
+        return True
+
+    def generalizations(self, term):
+        """返回键可能匹配（一般化）查询项的所有值：树中的变量可以匹配任意子项"""
+        symbols = preorder(term)
+        skip = _skip_table(symbols)
+        results = []
+
+        def walk(node, pos):
+            if pos == len(symbols):
+                results.extend(node.get(None, ()))
+                return
+            child = node.get(symbols[pos])
+            if child is not None:
+                walk(child, pos + 1)
+            if symbols[pos] != VARIABLE:
+                child = node.get(VARIABLE)
+                if child is not None:
+                    walk(child, skip[pos])
+
+        walk(self.root, 0)
+        return results
+
+    def unifiable(self, term):
+        """返回键可能与查询项合一的所有值：树中和查询中的变量都可以匹配任意子项"""
+        symbols = preorder(term)
+        skip = _skip_table(symbols)
+        results = []
+
+        def skip_tree(node, remaining, pos):
+            # 在树中跳过 remaining 个完整子项后继续匹配查询的 pos 位置
+            if remaining == 0:
+                walk(node, pos)
+                return
+            for symbol, child in node.items():
+                if symbol is None:
+                    continue
+                extra = 0 if symbol == VARIABLE else symbol[1]
+                skip_tree(child, remaining - 1 + extra, pos)
+
+        def walk(node, pos):
+            if pos == len(symbols):
+                results.extend(node.get(None, ()))
+                return
+            symbol = symbols[pos]
+            if symbol == VARIABLE:
+                skip_tree(node, 1, pos + 1)
+                return
+            child = node.get(symbol)
+            if child is not None:
+                walk(child, pos + 1)
+            child = node.get(VARIABLE)
+            if child is not None:
+                walk(child, skip[pos])
+
+        walk(self.root, 0)
+        return results
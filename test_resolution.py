@@ -6,6 +6,8 @@
 import unittest
 import time
 from resolution import ResolutionProver
+from budget import Budget
+from result import ProofResult
 from problems import ProblemBuilder, get_all_problems
 
 
@@ -115,7 +117,7 @@ class TestResolutionProver(unittest.TestCase):
         print(f"推理统计: {stats['total_steps']} 步, {stats['total_clauses']} 子句")
 
         # 这个测试主要验证算法不会崩溃
-        self.assertIsInstance(result, bool)
+        self.assertIsInstance(result, ProofResult)
         print("✅ Drug Dealer测试通过")
 
     def test_unification_functionality(self):
@@ -140,6 +142,1091 @@ class TestResolutionProver(unittest.TestCase):
         self.assertIsNotNone(substitution)
         print("✅ 文字合一测试通过")
 
+    def test_resolvent_construction(self):
+        """测试归结式只移除被归结的文字并共享未改变的文字"""
+        print("\n=== 测试归结式构造 ===")
+
+        from clause import Term, Literal, Clause
+        from unification import Unifier
+
+        x = Term("x", is_variable=True)
+        a = Term("a")
+        r_a = Literal("R", [a])
+        clause1 = Clause([Literal("P", [x], negated=True), Literal("Q", [x]), r_a])
+        clause2 = Clause([Literal("P", [a]), r_a])
+
+        literal1, literal2 = clause1.literals[0], clause2.literals[0]
+        substitution = Unifier.unify_literals(literal1, literal2)
+        resolvent = self.prover.resolve(clause1, clause2, literal1, literal2, substitution)
+
+        self.assertEqual(str(resolvent), "Q(a) ∨ R(a)")
+        self.assertIs(resolvent.literals[1], r_a, "未改变的文字应该直接共享")
+        self.assertIs(resolvent.source['substitution'], substitution)
+
+        # 被归结文字的相同副本一起删除：S(a) ∨ S(a) 与 ¬S(x) 得到空子句
+        from retention import RetentionPolicy
+        s_a = Clause([Literal("S", [a]), Literal("S", [a])])
+        not_s = Clause([Literal("S", [x], negated=True)])
+        substitution = Unifier.unify_literals(s_a.literals[1], not_s.literals[0])
+        self.assertTrue(self.prover.resolve(s_a, not_s, s_a.literals[1], not_s.literals[0], substitution).is_empty())
+        for options in ({}, {'retention': RetentionPolicy()}):
+            prover = ResolutionProver()
+            prover.configure(**options)
+            prover.add_clause(s_a)
+            prover.add_clause(not_s)
+            self.assertEqual(len(prover.clauses[0].literals), 1, "输入子句的重复文字应该合并")
+            self.assertTrue(prover.two_pointer_resolution())
+        print("✅ 归结式构造测试通过")
+
+    def test_tautology_modes(self):
+        """测试结构化重言式检测和扩展模式"""
+        print("\n=== 测试重言式检测模式 ===")
+
+        from clause import Term, Literal, Clause
+
+        x = Term("x", is_variable=True)
+        f_a = Term("f", False, [Term("a")])
+        exact = Clause([
+            Literal("P", [f_a]),
+            Literal("Q", [x]),
+            Literal("P", [Term("f", False, [Term("a")])], negated=True)
+        ])
+        unifiable = Clause([Literal("P", [x]), Literal("P", [f_a], negated=True)])
+
+        self.assertTrue(self.prover.is_tautology(exact))
+        self.assertFalse(self.prover.is_tautology(unifiable))
+
+        self.prover.configure(tautology_mode='extended')
+        self.assertTrue(self.prover.is_tautology(unifiable))
+
+        for clause in ProblemBuilder.create_drug_dealer_optimized():
+            self.prover.add_clause(clause)
+        result = self.prover.two_pointer_resolution()
+        stats = result.statistics
+        self.assertEqual(stats['tautology_checks'], stats['total_steps'] + stats['discarded_tautology'])
+        self.assertGreaterEqual(stats['tautology_hit_rate'], 0.0)
+        print("✅ 重言式检测模式测试通过")
+
+    def test_pair_prefilter(self):
+        """测试位集预筛选与逐对扫描得到相同的搜索，且不漏掉可归结的子句对"""
+        print("\n=== 测试子句对位集预筛选 ===")
+
+        from prefilter import PairFilter
+        from unification import Unifier
+
+        results = {}
+        for pair_filter in ResolutionProver.PAIR_FILTERS:
+            prover = ResolutionProver()
+            prover.configure(pair_filter=pair_filter)
+            for clause in ProblemBuilder.create_drug_dealer_optimized():
+                prover.add_clause(clause)
+            result = prover.two_pointer_resolution()
+            self.assertTrue(result)
+            results[pair_filter] = result.statistics
+        self.assertEqual(results['bitset']['total_steps'], results['scan']['total_steps'])
+        self.assertGreater(results['bitset']['prefilter_rejected'], 0)
+
+        # 候选子句对必须覆盖所有有互补谓词、且对应文字可能合一的子句对
+        clauses = ProblemBuilder.create_howling_hounds_optimized()
+        candidates = set(PairFilter(use_numpy=False).candidate_pairs(clauses))
+        for i in range(len(clauses)):
+            for j in range(i + 1, len(clauses)):
+                if any(lit1.predicate == lit2.predicate and lit1.negated != lit2.negated and
+                       Unifier.unify_literals(lit1, lit2) is not None
+                       for lit1 in clauses[i].literals for lit2 in clauses[j].literals):
+                    self.assertIn((i, j), candidates)
+
+        # 推断了类型时位集筛选同样按等式类型剪枝，Python 和 NumPy 实现的统计相同（没有 NumPy 时两次都用 Python）
+        from unittest import mock
+        import prefilter
+
+        def run_sorted(**patches):
+            prover = ResolutionProver()
+            prover.configure(sorts=True, pair_filter='bitset')
+            for clause in ProblemBuilder.create_pet_registry():
+                prover.add_clause(clause)
+            with mock.patch.multiple(prefilter, **patches):
+                statistics = prover.two_pointer_resolution().statistics
+            return {name: statistics[name] for name in ResolutionProver.COUNTERS + (
+                'total_steps', 'sort_checks', 'sort_pruned', 'sort_pairs_pruned', 'prefilter_candidates')}
+
+        python_stats = run_sorted(load_numpy=lambda: None)
+        vector_stats = run_sorted(NUMPY_MIN_CLAUSES=0)
+        self.assertEqual(vector_stats, python_stats)
+        self.assertGreater(python_stats['sort_pairs_pruned'], 0)
+
+        with self.assertRaises(ValueError):
+            self.prover.configure(pair_filter='simd')
+        print("✅ 位集预筛选测试通过")
+
+    def test_clause_retention(self):
+        """测试包含删除、长度/权重上限和回收统计"""
+        print("\n=== 测试子句保留策略 ===")
+
+        from clause import Term, Literal, Clause
+        from retention import RetentionPolicy
+        from subsumption import subsumes
+
+        x = Term("x", is_variable=True)
+        y = Term("y", is_variable=True)
+        a = Term("a")
+        self.assertTrue(subsumes([Literal("P", [x, y])], [Literal("P", [a, a]), Literal("Q", [a])]))
+        self.assertFalse(subsumes([Literal("P", [x, x])], [Literal("P", [a, y])]))
+        self.assertFalse(subsumes([Literal("P", [x]), Literal("Q", [x])], [Literal("P", [a]), Literal("Q", [y])]))
+
+        # 包含删除保持完备：仍然能证明，且会删除冗余子句
+        prover = ResolutionProver()
+        prover.configure(retention=RetentionPolicy())
+        for clause in ProblemBuilder.create_howling_hounds_optimized():
+            prover.add_clause(clause)
+        result = prover.two_pointer_resolution()
+        self.assertTrue(result)
+        self.assertGreater(result.statistics['clauses_evicted'], 0)
+        self.assertGreater(result.statistics['bytes_reclaimed'], 0)
+
+        # 包含者在同一次压缩中也被删除时，支持集身份传给最终存活的子句
+        from retention import ClauseRetention
+        b = Term("b")
+        goal = Clause([Literal("P", [b]), Literal("Q", [b]), Literal("R", [b])])
+        middle = Clause([Literal("P", [b]), Literal("Q", [b])])
+        unit = Clause([Literal("P", [b])])
+        prover = ResolutionProver()
+        prover.clauses = [middle, goal, unit]
+        prover.support = {goal.id}
+        retention = ClauseRetention(RetentionPolicy())
+        retention.track(goal, fresh=False)
+        retention.track(middle)
+        retention.track(unit)
+        prover.compact_clauses(retention, set())
+        self.assertEqual(prover.clauses, [unit])
+        self.assertEqual(prover.support, {unit.id})
+
+        # 支持集策略和包含删除一起使用仍然能证明
+        prover = ResolutionProver()
+        prover.configure(selection='shortest', set_of_support=True, retention=RetentionPolicy())
+        for clause in ProblemBuilder.create_drug_dealer_optimized():
+            prover.add_clause(clause)
+        self.assertTrue(prover.two_pointer_resolution())
+
+        # 权重上限让无限链饱和，但结论是 unknown 而不是 saturated
+        self._add_infinite_chain()
+        self.prover.configure(retention=RetentionPolicy(max_weight=8), max_steps=10 ** 6)
+        result = self.prover.two_pointer_resolution()
+        self.assertEqual(result.status, ProofResult.UNKNOWN)
+        self.assertEqual(result.reason, 'retention')
+        self.assertGreater(result.statistics['discarded_weight'], 0)
+        print("✅ 子句保留策略测试通过")
+
+    def test_variable_standardization(self):
+        """测试输入子句变量互不相交，共享变量的子句在合一时才重命名"""
+        print("\n=== 测试变量标准化 ===")
+
+        from clause import Term, Literal, Clause
+
+        x = Term("x", is_variable=True)
+        a = Term("a")
+        self.prover.add_clause(Clause([Literal("P", [x], negated=True), Literal("Q", [x, a])]))
+        self.prover.add_clause(Clause([Literal("Q", [x, a], negated=True), Literal("R", [x])]))
+
+        clause1, clause2 = self.prover.clauses
+        self.assertTrue(clause1.variables().isdisjoint(clause2.variables()))
+        self.assertIs(clause1.literals[1].terms[1], a, "常量不应被复制")
+
+        # 归结式沿用父子句的变量，与父子句再次合一时临时重命名
+        literals2 = clause1.rename_apart(self.prover.var_counter)
+        self.assertTrue(clause1.variables().isdisjoint(Clause(literals2).variables()))
+        self.assertEqual(len(clause1.variables()), len(Clause(literals2).variables()))
+
+        # ¬Q(y) ∨ P(y) 与 ¬P(x) ∨ P(f(x)) 的归结式 ¬Q(x) ∨ P(f(x)) 与后者共享变量
+        prover = ResolutionProver()
+        y = Term("y", is_variable=True)
+        prover.add_clause(Clause([Literal("Q", [y], negated=True), Literal("P", [y])]))
+        prover.add_clause(Clause([Literal("P", [x], negated=True), Literal("P", [Term("f", False, [x])])]))
+        prover.add_clause(Clause([Literal("Q", [a])]))
+        prover.add_clause(Clause([Literal("P", [Term("f", False, [Term("f", False, [a])])], negated=True)]))
+        result = prover.two_pointer_resolution()
+        self.assertTrue(result)
+        self.assertGreater(result.statistics['renamings'], 0)
+        print("✅ 变量标准化测试通过")
+
+    def test_term_index(self):
+        """测试判别树的一般化和可合一检索"""
+        print("\n=== 测试项索引 ===")
+
+        from clause import Term
+        from term_index import DiscriminationTree
+
+        x = Term("x", is_variable=True)
+        a, b = Term("a"), Term("b")
+        f = lambda *args: Term("f", False, list(args))
+
+        index = DiscriminationTree()
+        index.insert(f(x, a), 'f(x,a)')
+        index.insert(f(b, a), 'f(b,a)')
+        index.insert(f(b, b), 'f(b,b)')
+        index.insert(x, 'x')
+
+        self.assertEqual(set(index.generalizations(f(b, a))), {'f(x,a)', 'f(b,a)', 'x'})
+        self.assertEqual(set(index.generalizations(f(a, b))), {'x'})
+        self.assertEqual(set(index.unifiable(f(x, b))), {'f(b,b)', 'x'})
+        self.assertEqual(set(index.unifiable(f(f(a, a), x))), {'f(x,a)', 'x'})
+
+        self.assertTrue(index.remove(f(b, a), 'f(b,a)'))
+        self.assertFalse(index.remove(f(b, a), 'f(b,a)'))
+        self.assertEqual(len(index), 3)
+        print("✅ 项索引测试通过")
+
+    def test_demodulation(self):
+        """测试等式定向为重写规则并化简子句"""
+        print("\n=== 测试等式重写 ===")
+
+        from clause import Term, Literal, Clause
+
+        x = Term("x", is_variable=True)
+        john, bob = Term("John"), Term("Bob")
+        father = lambda t: Term("father", False, [t])
+        grandfather = lambda t: Term("grandfather", False, [t])
+
+        # father(John) = Bob，father(father(x)) = grandfather(x)
+        self.prover.configure(equality_rules=True)
+        self.prover.add_clause(Clause([Literal("Equal", [father(john), bob])]))
+        self.prover.add_clause(Clause([Literal("Equal", [grandfather(x), father(father(x))])]))
+        self.assertEqual(len(self.prover.rewrite_rules), 2)
+        self.assertEqual(len(self.prover.clauses), 0, "可定向的等式不参与归结")
+
+        self.prover.add_clause(Clause([Literal("Rich", [father(x)], negated=True), Literal("Happy", [x])]))
+        self.prover.add_clause(Clause([Literal("Rich", [father(bob)])]))
+        self.prover.add_clause(Clause([Literal("Happy", [father(john)], negated=True)], source='goal'))
+
+        result = self.prover.two_pointer_resolution()
+
+        self.assertTrue(result)
+        self.assertIn("¬Happy(Bob)", [str(c) for c in self.prover.clauses])
+        self.assertGreater(result.statistics['rewrites'], 0)
+
+        # 目标化简为 ¬Equal(t, t) 时直接得到空子句
+        prover = ResolutionProver()
+        prover.configure(equality_rules=True)
+        prover.add_clause(Clause([Literal("Equal", [father(john), bob])]))
+        prover.add_clause(Clause([Literal("Equal", [father(john), bob], negated=True)]))
+        self.assertTrue(prover.two_pointer_resolution())
+
+        # 默认不定向：目标直接与等式归结；开启重写时饱和不是确定的结论
+        from clause_parser import parse_clauses
+        clauses = parse_clauses("Equal(f(a), b)\ngoal: ¬Equal(x, b)")
+        prover = ResolutionProver()
+        for clause in clauses:
+            prover.add_clause(clause)
+        self.assertTrue(prover.two_pointer_resolution())
+        prover = ResolutionProver()
+        prover.configure(equality_rules=True)
+        for clause in clauses:
+            prover.add_clause(clause)
+        result = prover.two_pointer_resolution()
+        self.assertEqual(result.status, ProofResult.UNKNOWN)
+        self.assertEqual(result.reason, 'equality')
+        print("✅ 等式重写测试通过")
+
+    def _add_infinite_chain(self):
+        """添加不会终止的子句集: P(a), ¬P(x) ∨ P(f(x))"""
+        from clause import Term, Literal, Clause
+        x = Term("x", is_variable=True)
+        self.prover.add_clause(Clause([Literal("P", [Term("a")])]))
+        self.prover.add_clause(Clause([
+            Literal("P", [x], negated=True),
+            Literal("P", [Term("f", False, [x])])
+        ]))
+
+    def test_budget_max_clauses(self):
+        """测试存活子句数预算"""
+        print("\n=== 测试子句数预算 ===")
+
+        self._add_infinite_chain()
+        result = self.prover.two_pointer_resolution(Budget(max_clauses=10))
+
+        self.assertFalse(result)
+        self.assertEqual(result.status, ProofResult.UNKNOWN)
+        self.assertEqual(result.reason, 'clauses')
+        self.assertLessEqual(result.statistics['total_clauses'], 10)
+        print("✅ 子句数预算测试通过")
+
+    def test_budget_time_limit(self):
+        """测试墙钟时间预算"""
+        print("\n=== 测试时间预算 ===")
+
+        self._add_infinite_chain()
+        result = self.prover.two_pointer_resolution(Budget(time_limit=0, check_interval=1))
+
+        self.assertEqual(result.status, ProofResult.UNKNOWN)
+        self.assertEqual(result.reason, 'time')
+        self.assertIn('duration', result.statistics)
+        print("✅ 时间预算测试通过")
+
+    def test_saturation_result(self):
+        """测试无法证明时返回饱和状态"""
+        print("\n=== 测试饱和结果 ===")
+
+        from clause import Literal, Clause
+        self.prover.add_clause(Clause([Literal("P", [])]))
+        self.prover.add_clause(Clause([Literal("Q", [])]))
+
+        result = self.prover.two_pointer_resolution()
+
+        self.assertEqual(result.status, ProofResult.SATURATED)
+        self.assertTrue(result.is_definitive)
+
+        # 相等的结果哈希相同，可以作为集合元素；结果不与 bool 相等
+        self.assertEqual(len({result, ProofResult(ProofResult.SATURATED), ProofResult(ProofResult.PROVED)}), 2)
+        self.assertNotEqual(ProofResult(ProofResult.PROVED), True)
+
+        # 每轮迭代重新检查共享变量的子句对时会重命名，只差变量名的归结式按重复子句丢弃
+        from clause_parser import parse_clauses
+        prover = ResolutionProver()
+        for clause in parse_clauses("P(x) ∨ Q(x)\n¬P(y) ∨ R(y)\n¬Q(z) ∨ R(z)\n¬R(a) ∨ S(a)\n¬S(w) ∨ T(w, u)"):
+            prover.add_clause(clause)
+        result = prover.two_pointer_resolution()
+        self.assertEqual(result.status, ProofResult.SATURATED)
+        self.assertGreater(result.statistics['renamings'], 0)
+        self.assertEqual(ResolutionProver.clause_key(parse_clauses("T(a, x) ∨ T(a, y)")[0].literals),
+                         ResolutionProver.clause_key(parse_clauses("T(a, v4) ∨ T(a, v6)")[0].literals))
+        print("✅ 饱和结果测试通过")
+
+    def test_set_of_support(self):
+        """测试支持集策略"""
+        print("\n=== 测试支持集策略 ===")
+
+        clauses = ProblemBuilder.create_drug_dealer_optimized()
+        self.prover.configure(selection='shortest', set_of_support=True)
+        for clause in clauses:
+            self.prover.add_clause(clause)
+
+        result = self.prover.two_pointer_resolution()
+
+        self.assertTrue(result, "支持集策略应该能证明Drug Dealer问题")
+        # 支持集策略下生成的子句都属于支持集
+        for clause in self.prover.clauses[len(clauses):]:
+            self.assertIn(clause.id, self.prover.support)
+        print("✅ 支持集策略测试通过")
+
+    def test_horn_forward_chaining(self):
+        """测试 Horn 子句集的 Rete 前向链接"""
+        print("\n=== 测试 Horn 前向链接 ===")
+
+        from clause import Term, Literal, Clause
+        from rete import ReteNetwork
+
+        prover = ResolutionProver()
+        prover.configure(horn=True)
+        for clause in ProblemBuilder.create_transitive_chain(15):
+            prover.add_clause(clause)
+        result = prover.two_pointer_resolution()
+        self.assertTrue(result)
+        self.assertEqual(result.statistics['engine'], 'rete')
+        self.assertLessEqual(result.statistics['facts_derived'], 15 * 16 // 2)
+        self.assertEqual(prover.empty_clause.source['engine'], 'rete')
+
+        # 目标不可达时到达不动点：所有 Path 事实都被推出
+        clauses = ProblemBuilder.create_transitive_chain(15)
+        clauses[-1].literals[0].terms.reverse()
+        prover = ResolutionProver()
+        prover.configure(horn=True)
+        for clause in clauses:
+            prover.add_clause(clause)
+        result = prover.two_pointer_resolution()
+        self.assertEqual(result.status, ProofResult.SATURATED)
+        self.assertEqual(result.statistics['facts_derived'], 15 * 16 // 2)
+
+        # 非 Horn 子句集回到归结
+        self.prover.configure(horn=True)
+        for clause in ProblemBuilder.create_drug_dealer_optimized():
+            self.prover.add_clause(clause)
+        result = self.prover.two_pointer_resolution()
+        self.assertTrue(result)
+        self.assertEqual(result.statistics['horn_rejected'], 'non_horn')
+
+        # 事实传播之后再加入的规则也能匹配已有事实
+        x = Term("x", is_variable=True)
+        network = ReteNetwork()
+        network.add_fact(Literal("Hound", [Term("a")]))
+        network.run()
+        network.add_clause(Clause([Literal("Hound", [x], negated=True), Literal("Howl", [x])]))
+        network.add_clause(Clause([Literal("Howl", [Term("a")], negated=True)]))
+        self.assertEqual(network.run(), 'proved')
+        print("✅ Horn 前向链接测试通过")
+
+    def test_sld_tabling(self):
+        """测试带表格化的 SLD 反向链接"""
+        print("\n=== 测试表格化反向链接 ===")
+
+        from clause_parser import parse_clauses
+
+        # 与归结和前向链接得到相同的结论和证明结构
+        for engine in ('sld', 'rete'):
+            prover = ResolutionProver()
+            prover.configure(horn=engine)
+            for clause in ProblemBuilder.create_howling_hounds_optimized():
+                prover.add_clause(clause)
+            result = prover.two_pointer_resolution()
+            self.assertTrue(result)
+            self.assertEqual(result.statistics['engine'], engine)
+            self.assertTrue(prover.empty_clause.is_empty())
+            goal = prover.empty_clause.source['goal']
+            self.assertTrue(any(clause.id == goal and all(literal.negated for literal in clause.literals)
+                                for clause in prover.clauses))
+
+        # 左递归和循环图：表格化保证终止，目标变量的绑定记录在证明中
+        text = """
+            Edge(a, b)
+            Edge(b, c)
+            Edge(c, a)
+            Edge(c, d)
+            Stop(d)
+            ~Edge(x, y) | Path(x, y)
+            ~Path(x, y) | ~Edge(y, z) | Path(x, z)
+            goal: ~Path(a, w) | ~Stop(w)
+        """
+        self.prover.configure(horn='sld')
+        for clause in parse_clauses(text):
+            self.prover.add_clause(clause)
+        result = self.prover.two_pointer_resolution()
+        self.assertTrue(result)
+        self.assertEqual([str(term) for term in self.prover.empty_clause.source['substitution'].values()], ['d'])
+        self.assertEqual(result.statistics['tables'], result.statistics['tables_complete'])
+
+        # 目标不可达时所有表完成后饱和
+        prover = ResolutionProver()
+        prover.configure(horn='sld')
+        for clause in parse_clauses(text.replace("Stop(d)", "Stop(e)")):
+            prover.add_clause(clause)
+        self.assertEqual(prover.two_pointer_resolution().status, ProofResult.SATURATED)
+
+        with self.assertRaises(ValueError):
+            prover.configure(horn='magic')
+        print("✅ 表格化反向链接测试通过")
+
+    def test_answer_extraction(self):
+        """测试回答文字：流式生成去重的回答、回答上限和析取回答"""
+        print("\n=== 测试回答提取 ===")
+
+        from clause_parser import parse_clauses
+
+        text = """
+            CustomsOfficial(O1)
+            CustomsOfficial(O2)
+            CustomsOfficial(O3)
+            DrugDealer(O1)
+            DrugDealer(D)
+            ~Smuggler(x) | DrugDealer(x)
+            Smuggler(O2)
+            Smuggler(O3)
+            goal: ~CustomsOfficial(x) | ~DrugDealer(x) | $answer(x)
+        """
+        for clause in parse_clauses(text):
+            self.prover.add_clause(clause)
+        answers = [str(answer['x']) for answer in self.prover.find_answers()]
+        self.assertEqual(sorted(answers), ['O1', 'O2', 'O3'])
+        self.assertEqual(self.prover.result.status, ProofResult.SATURATED)
+        self.assertEqual(self.prover.result.statistics['answers'], 3)
+
+        # 得到 limit 个回答后立即停止
+        stream = self.prover.find_answers(limit=1)
+        self.assertEqual(len(list(stream)), 1)
+        self.assertEqual(self.prover.result.reason, 'answer_limit')
+
+        # 析取回答不作为确定回答生成
+        prover = ResolutionProver()
+        for clause in parse_clauses("P(A) | P(B)\ngoal: ~P(x) | $answer(x)"):
+            prover.add_clause(clause)
+        self.assertEqual(list(prover.find_answers()), [])
+        self.assertEqual([sorted(str(answer['x']) for answer in disjunction)
+                          for disjunction in prover.disjunctive_answers], [['A', 'B']])
+        print("✅ 回答提取测试通过")
+
+    def test_incremental_knowledge_base(self):
+        """测试增量知识库：只饱和新事实的推论，撤销事实时按推导依赖删除子句"""
+        print("\n=== 测试增量知识库 ===")
+
+        from clause_parser import parse_clauses
+        from knowledge_base import KnowledgeBase
+
+        rules = """
+            ~CustomsOfficial(x) | ~Entered(y) | VIP(y) | SearchedBy(x, y)
+            ~VIP(D)
+            CustomsOfficial(O)
+            ~SearchedBy(x, y) | Alarm(x)
+        """
+        goal = parse_clauses("~SearchedBy(O, D)")
+        kb = KnowledgeBase()
+        self.assertEqual(kb.add(parse_clauses(rules))['status'], 'saturated')
+        self.assertEqual(kb.ask(goal).status, ProofResult.SATURATED)
+
+        # 新事实只与已处理的子句归结，查询结束后目标及其推论被撤销
+        report = kb.add(parse_clauses("Entered(D)"))
+        self.assertEqual(report['added'], 1)
+        self.assertGreater(report['derived'], 0)
+        before = len(kb.clauses())
+        self.assertTrue(kb.ask(goal))
+        self.assertEqual(len(kb.clauses()), before)
+
+        # 另一条推导依据支持的子句在撤销 Entered(D) 后保留
+        kb.add(parse_clauses("Suspect(D)\n~Suspect(y) | SearchedBy(O, y)"))
+        self.assertGreater(kb.retract(parse_clauses("Entered(D)"))['removed'], 1)
+        searched = ResolutionProver.clause_key(parse_clauses("SearchedBy(O, D)")[0].literals)
+        self.assertIn(searched, {ResolutionProver.clause_key(clause.literals) for clause in kb.clauses()})
+        self.assertTrue(kb.ask(goal))
+        kb.retract(parse_clauses("Suspect(D)"))
+        self.assertEqual(kb.ask(goal).status, ProofResult.SATURATED)
+
+        # 撤销后的子句集与从头饱和剩余输入子句的结果相同
+        fresh = KnowledgeBase()
+        fresh.add(parse_clauses(rules + "\n~Suspect(y) | SearchedBy(O, y)"))
+        self.assertEqual({ResolutionProver.clause_key(clause.literals) for clause in kb.clauses()},
+                         {ResolutionProver.clause_key(clause.literals) for clause in fresh.clauses()})
+        with self.assertRaises(ValueError):
+            kb.retract(parse_clauses("Entered(D)"))
+
+        statistics = kb.get_statistics()
+        self.assertEqual(statistics['add_updates'], 3)
+        self.assertEqual(statistics['retract_updates'], 2)
+        self.assertGreater(statistics['add_latency_mean'], 0)
+        self.assertGreaterEqual(statistics['retract_latency_max'], statistics['retract_latency_mean'])
+        print(f"  每个事实的平均加入延迟: {statistics['add_latency_mean'] * 1000:.3f}ms，"
+              f"撤销延迟: {statistics['retract_latency_mean'] * 1000:.3f}ms")
+        print("✅ 增量知识库测试通过")
+
+    def test_checkpoint_resume(self):
+        """测试检查点：在步数上限处停止后恢复，继续的搜索与一次完成的搜索相同"""
+        print("\n=== 测试检查点与恢复 ===")
+
+        import os
+        import tempfile
+        from checkpoint import Checkpoint
+
+        reference = ResolutionProver()
+        reference.configure(selection='shortest')
+        for clause in ProblemBuilder.create_drug_dealer_optimized():
+            reference.add_clause(clause)
+        expected = reference.two_pointer_resolution().statistics
+        self.assertTrue(reference.empty_clause is not None)
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'drug_dealer.ckpt')
+            prover = ResolutionProver()
+            prover.configure(selection='shortest', max_steps=expected['total_steps'] // 2,
+                             checkpoint=Checkpoint(path, interval=None))
+            for clause in ProblemBuilder.create_drug_dealer_optimized():
+                prover.add_clause(clause)
+            result = prover.two_pointer_resolution()
+            self.assertEqual(result.reason, 'max_steps')
+            self.assertEqual(result.statistics['checkpoint_writes'], 1)
+            self.assertGreater(result.statistics['checkpoint_bytes'], 0)
+
+            # 恢复到新的证明器（配置来自检查点），提高步数上限后继续
+            resumed = ResolutionProver()
+            resumed.load_checkpoint(path)
+            self.assertEqual(resumed.selection, 'shortest')
+            resumed.configure(max_steps=2000)
+            result = resumed.two_pointer_resolution()
+            self.assertTrue(result)
+            for name in ('total_steps', 'total_clauses', 'pairs_examined', 'unifications_succeeded'):
+                self.assertEqual(result.statistics[name], expected[name], name)
+
+            with open(path, 'wb') as handle:
+                handle.write(b'not a checkpoint')
+            with self.assertRaises(ValueError):
+                ResolutionProver().load_checkpoint(path)
+        print("✅ 检查点与恢复测试通过")
+
+    def test_clause_splitting(self):
+        """测试子句拆分：不共享变量的文字组被命名，证明结果不变，饱和时子句变窄"""
+        print("\n=== 测试子句拆分 ===")
+
+        import os
+        import tempfile
+        from checkpoint import Checkpoint
+        from clause_parser import parse_clauses
+        from splitting import ClauseSplitter, is_split_literal
+
+        first, second = parse_clauses("""
+            P(x) | Q(x) | R(y) | S(y) | T(a)
+            R(z) | S(z) | U(w) | U(f(w)) | V(w)
+        """)
+        splitter = ClauseSplitter()
+        main, definitions = splitter.split(first.literals)
+        self.assertEqual([str(literal) for literal in main], ['P(x)', 'Q(x)', 'T(a)', '$split1()'])
+        self.assertEqual(len(definitions), 1)
+        self.assertEqual([str(literal) for literal in definitions[0]], ['¬$split1()', 'R(y)', 'S(y)'])
+        # 只差变量名的分量复用同一个名字，不再产生定义子句
+        main, definitions = splitter.split(second.literals)
+        self.assertEqual(definitions, [])
+        self.assertTrue(is_split_literal(main[-1]) and main[-1].predicate == '$split1')
+        self.assertEqual(splitter.get_statistics(), {'split_clauses': 2, 'split_components': 1, 'split_reused': 1})
+        self.assertIsNone(splitter.split(parse_clauses("P(x) | Q(x, y) | R(y)")[0].literals))
+
+        # 拆分不改变证明结果
+        prover = ResolutionProver()
+        prover.configure(splitting=True)
+        for clause in ProblemBuilder.create_drug_dealer_optimized():
+            prover.add_clause(clause)
+        self.assertTrue(prover.two_pointer_resolution())
+        self.assertGreater(prover.get_statistics()['split_clauses'], 0)
+
+        # 去掉目标饱和公理：同样的步数下子句更窄
+        def saturate(splitting):
+            prover = ResolutionProver()
+            prover.configure(max_steps=1500, splitting=splitting)
+            for clause in ProblemBuilder.create_drug_dealer_optimized():
+                if clause.source != 'goal':
+                    prover.add_clause(clause)
+            return prover.two_pointer_resolution().statistics
+
+        plain, split = saturate(False), saturate(True)
+        self.assertLess(split['clause_width_mean'], plain['clause_width_mean'])
+        self.assertGreater(split['split_reused'], 0)
+        print(f"平均子句宽度: {plain['clause_width_mean']:.2f} -> {split['clause_width_mean']:.2f}")
+
+        # 拆分的名字缓存随检查点保存，恢复后的搜索与一次完成的搜索相同
+        expected = saturate(True)
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'split.ckpt')
+            prover = ResolutionProver()
+            prover.configure(max_steps=700, splitting=True, checkpoint=Checkpoint(path, interval=None))
+            for clause in ProblemBuilder.create_drug_dealer_optimized():
+                if clause.source != 'goal':
+                    prover.add_clause(clause)
+            prover.two_pointer_resolution()
+            resumed = ResolutionProver()
+            resumed.load_checkpoint(path)
+            resumed.configure(max_steps=1500)
+            statistics = resumed.two_pointer_resolution().statistics
+            for name in ('total_clauses', 'split_clauses', 'split_components', 'clause_width_mean'):
+                self.assertEqual(statistics[name], expected[name], name)
+        print("✅ 子句拆分测试通过")
+
+    def test_instance_generation(self):
+        """测试实例生成引擎：命题求解器、证明、可满足子句集的饱和和引擎对比"""
+        print("\n=== 测试实例生成引擎 ===")
+
+        from clause_parser import parse_clauses
+        from instgen import SatSolver
+
+        solver = SatSolver()
+        p, q, r = (solver.new_var() for _ in range(3))
+        for clause in ([p, q], [-p, r], [-q, r]):
+            solver.add_clause(clause)
+        model = solver.solve()
+        self.assertTrue(model[r])
+        solver.add_clause([-r])  # 增量加入子句后不可满足
+        self.assertIsNone(solver.solve())
+
+        for name, info in get_all_problems().items():
+            prover = ResolutionProver()
+            prover.configure(engine='instgen')
+            for clause in info['builder']():
+                prover.add_clause(clause)
+            result = prover.two_pointer_resolution()
+            self.assertTrue(result, name)
+            self.assertEqual(result.statistics['engine'], 'instgen')
+            self.assertEqual(prover.empty_clause.source['engine'], 'instgen')
+
+        # 毒贩问题的公理可满足：实例生成很快饱和，两两归结在步数上限前停不下来
+        def axioms(engine):
+            prover = ResolutionProver()
+            prover.configure(engine=engine, max_steps=1000)
+            for clause in ProblemBuilder.create_drug_dealer_optimized():
+                if clause.source != 'goal':
+                    prover.add_clause(clause)
+            return prover.two_pointer_resolution()
+
+        self.assertEqual(axioms('instgen').status, ProofResult.SATURATED)
+        self.assertEqual(axioms('resolution').reason, 'max_steps')
+
+        # 有回答文字时退回两两归结
+        prover = ResolutionProver()
+        prover.configure(engine='instgen')
+        for clause in parse_clauses("""
+            P(a)
+            goal: ~P(x) | $answer(x)
+        """):
+            prover.add_clause(clause)
+        result = prover.two_pointer_resolution()
+        self.assertEqual(result.statistics['instgen_rejected'], 'answer_literals')
+        self.assertEqual([str(answer['x']) for answer in prover.answers], ['a'])
+        with self.assertRaises(ValueError):
+            prover.configure(engine='tableau')
+        print("✅ 实例生成引擎测试通过")
+
+    def test_sort_inference(self):
+        """测试类型推断：参数位置和常量的类型，等式文字对的剪枝不改变推理结果"""
+        print("\n=== 测试类型推断 ===")
+
+        from clause_parser import parse_clauses
+        from sorts import infer_sorts
+        from unification import Unifier
+
+        signature = infer_sorts(ProblemBuilder.create_pet_registry(3))
+        self.assertEqual(signature.sort_count, 3)
+        groups = signature.describe()
+        self.assertIn(['D0', 'D1', 'D2'], groups.values())
+        self.assertIn(['O0', 'O1', 'O2', 'owner'], groups.values())
+        self.assertIn(['Hound', 'Terrier', 'breed'], groups.values())
+        self.assertEqual(signature.position_sorts[('Owns', 0)], signature.symbol_sorts['O0'])
+        self.assertEqual(signature.position_sorts[('owner', 0)], signature.symbol_sorts['D0'])
+
+        # 类型不同的等式文字不合一；参数为变量的正等式限制论域大小，等式不再按类型分开
+        owner, breed = parse_clauses("""
+            Equal(owner(D0), O0)
+            ~Equal(breed(x), z) | HasBreed(x, z)
+        """)
+        self.assertIsNone(Unifier.unify_literals(owner.literals[0], breed.literals[0], signature))
+        self.assertEqual(signature.statistics['sort_pruned'], 1)
+        self.assertFalse(infer_sorts(parse_clauses("Equal(x, c)")).polymorphic_equality)
+
+        def run(sorts):
+            prover = ResolutionProver()
+            prover.configure(sorts=sorts)
+            for clause in ProblemBuilder.create_pet_registry():
+                prover.add_clause(clause)
+            return prover.two_pointer_resolution()
+
+        plain, sorted_run = run(False), run(True)
+        self.assertTrue(sorted_run)
+        self.assertEqual(sorted_run.statistics['total_steps'], plain.statistics['total_steps'])
+        self.assertGreater(sorted_run.statistics['sort_pruned'], 0)
+        self.assertGreater(sorted_run.statistics['sort_pairs_pruned'], 0)
+        self.assertGreater(sorted_run.statistics['sort_prune_rate'], 0.0)
+        unifications = [result.statistics['unifications_succeeded'] + result.statistics['unifications_failed']
+                        for result in (plain, sorted_run)]
+        self.assertLess(unifications[1], unifications[0])
+        print(f"合一次数: {unifications[0]} -> {unifications[1]}，"
+              f"剪枝率 {sorted_run.statistics['sort_prune_rate']:.1%}")
+
+        # 没有等式的问题中互补文字的类型自动相同，不剪枝
+        prover = ResolutionProver()
+        prover.configure(sorts=True)
+        for clause in ProblemBuilder.create_drug_dealer_optimized():
+            prover.add_clause(clause)
+        result = prover.two_pointer_resolution()
+        self.assertTrue(result)
+        self.assertEqual(result.statistics['sort_pruned'], 0)
+        print("✅ 类型推断测试通过")
+
+    def test_preprocessing(self):
+        """测试预处理流水线：重复、包含、纯文字和阻塞子句消除"""
+        print("\n=== 测试子句集预处理 ===")
+
+        from clause_parser import parse_clauses
+        from preprocess import Preprocessor
+
+        clauses = parse_clauses("""
+            P(a)
+            ~P(x) | Q(x)
+            goal: ~Q(a)
+            R(b)                # 纯文字
+            P(a) | S(c)         # 被 P(a) 包含
+            ~P(y) | Q(y)        # 与第二个子句只差变量名
+            U(x) | ~V(x)        # 在 U(x) 上被阻塞
+            ~U(y) | V(y)
+        """)
+        self.prover.configure(preprocess=True)
+        for clause in clauses:
+            self.prover.add_clause(clause)
+        result = self.prover.two_pointer_resolution()
+
+        self.assertTrue(result)
+        steps = result.statistics['preprocessing']
+        self.assertEqual({name: step['removed'] for name, step in steps.items()},
+                         {'duplicates': 1, 'subsumption': 1, 'pure_literal': 1, 'blocked': 2})
+        self.assertEqual(result.statistics['preprocess_removed'], 5)
+        self.assertEqual(len(self.prover.support), 1)
+
+        with self.assertRaises(ValueError):
+            Preprocessor(passes=('unknown',))
+        print("✅ 子句集预处理测试通过")
+
+    def test_relevance_filter(self):
+        """测试 SInE 相关性过滤和回退到完整子句集"""
+        print("\n=== 测试相关性过滤 ===")
+
+        from clause import Term, Literal, Clause
+        from relevance import RelevanceFilter
+
+        # Drug Dealer 加上与目标无关的公理链
+        x = Term("x", is_variable=True)
+        clauses = ProblemBuilder.create_drug_dealer_optimized()
+        relevant = len(clauses)
+        for k in range(20):
+            clauses.append(Clause([Literal(f"D{k}", [Term(f"c{k}")])]))
+            clauses.append(Clause([Literal(f"D{k}", [x], negated=True), Literal(f"E{k}", [x])]))
+
+        prover = ResolutionProver()
+        prover.configure(relevance=RelevanceFilter(tolerance=2.0))
+        for clause in clauses:
+            prover.add_clause(clause)
+        result = prover.two_pointer_resolution()
+        self.assertTrue(result)
+        self.assertEqual(result.statistics['relevance_input_clauses'], len(clauses))
+        self.assertEqual(result.statistics['relevance_selected_clauses'], relevant)
+        self.assertFalse(result.statistics['relevance_fallback'])
+
+        # 只保留目标子句时推理失败，回退到完整子句集后证明成功
+        prover = ResolutionProver()
+        prover.configure(relevance=RelevanceFilter(depth=0))
+        for clause in clauses:
+            prover.add_clause(clause)
+        result = prover.two_pointer_resolution()
+        self.assertTrue(result)
+        self.assertEqual(result.statistics['relevance_selected_clauses'], 1)
+        self.assertTrue(result.statistics['relevance_fallback'])
+        self.assertGreaterEqual(result.statistics['total_clauses'], len(clauses))
+
+        # 不回退时子集饱和不是确定的结论；回退与过滤推理共用步数上限
+        from clause_parser import parse_clauses
+        chain = parse_clauses("Q(x) | ~R(x)\nR(x) | ~S(x)\nS(x)\ngoal: ~Q(c)")
+        for fallback, max_steps, status, reason in ((False, 2000, ProofResult.UNKNOWN, 'relevance'),
+                                                    (True, 2000, ProofResult.PROVED, None),
+                                                    (True, 1, ProofResult.UNKNOWN, 'max_steps')):
+            prover = ResolutionProver()
+            prover.configure(relevance=RelevanceFilter(depth=1, fallback=fallback), max_steps=max_steps)
+            for clause in chain:
+                prover.add_clause(clause)
+            result = prover.two_pointer_resolution()
+            self.assertEqual((result.status, result.reason), (status, reason))
+            self.assertLessEqual(result.statistics['total_steps'], max_steps)
+        print("✅ 相关性过滤测试通过")
+
+    def test_distributed_saturation(self):
+        """测试按谓词分片的多进程饱和"""
+        print("\n=== 测试分布式饱和 ===")
+
+        import pickle
+        from clause import Term, Literal, Clause
+        from distributed import DistributedProver, assign_shards
+
+        clauses = ProblemBuilder.create_drug_dealer_optimized()
+        owner = assign_shards(clauses, 2)
+        self.assertEqual(set(owner.values()), {0, 1})
+        self.assertEqual(set(owner), {lit.predicate for clause in clauses for lit in clause.literals})
+
+        for builder in (ProblemBuilder.create_howling_hounds_optimized, ProblemBuilder.create_drug_dealer_optimized):
+            prover = DistributedProver(workers=2)
+            for clause in builder():
+                prover.add_clause(clause)
+            result = prover.prove()
+            self.assertTrue(result)
+            self.assertEqual(len(result.statistics['shards']), 2)
+
+        # 可满足的子句集在分片之间饱和
+        x = Term("x", is_variable=True)
+        prover = DistributedProver(workers=2)
+        prover.add_clause(Clause([Literal("P", [Term("a")])]))
+        prover.add_clause(Clause([Literal("P", [x], negated=True), Literal("Q", [x])]))
+        self.assertEqual(prover.prove().status, ProofResult.SATURATED)
+
+        # 所有分片共用一个步数上限，输入子句的 id 不被修改
+        prover = DistributedProver(workers=2, max_steps=3)
+        for clause in ProblemBuilder.create_howling_hounds_optimized():
+            prover.add_clause(clause)
+        ids = [clause.id for clause in prover.clauses]
+        result = prover.prove()
+        self.assertEqual(result.reason, 'max_steps')
+        self.assertLessEqual(result.statistics['total_steps'], 3)
+        self.assertEqual([clause.id for clause in prover.clauses], ids)
+
+        # 深层嵌套的项可以在进程间传递
+        term = Term("a")
+        for _ in range(3000):
+            term = Term("f", False, [term])
+        self.assertEqual(pickle.loads(pickle.dumps(Literal("P", [term]))).terms[0].name, "f")
+        print("✅ 分布式饱和测试通过")
+
+    def test_prover_service(self):
+        """测试异步推理服务的批处理、超时取消和背压"""
+        print("\n=== 测试异步推理服务 ===")
+
+        import asyncio
+        from service import ProverService
+        from clause import Term, Literal, Clause
+
+        x = Term("x", is_variable=True)
+        chain = [Clause([Literal("P", [Term("a")])]),
+                 Clause([Literal("P", [x], negated=True), Literal("P", [Term("f", False, [x])])])]
+        drug_dealer = ProblemBuilder.create_drug_dealer_optimized()
+
+        async def scenario():
+            async with ProverService(workers=1, max_pending=2, configuration={'max_steps': 10 ** 9}) as service:
+                # 共享公理的并发查询合并为一批
+                results = await asyncio.gather(*(service.prove(drug_dealer) for _ in range(2)))
+                self.assertTrue(all(results))
+                self.assertEqual(service.statistics['batches'], 1)
+
+                # 超时会停止不终止的推理，工作线程随后空闲
+                with self.assertRaises(asyncio.TimeoutError):
+                    await service.prove(chain, timeout=0.2)
+                for _ in range(100):
+                    if not service.running:
+                        break
+                    await asyncio.sleep(0.01)
+                self.assertEqual(service.running, 0)
+
+                result = await service.prove(chain, budget=Budget(time_limit=0.1))
+                self.assertEqual(result.reason, 'time')
+
+                # 一个查询在运行、两个在排队时，新的查询等待队列空位
+                tasks = [asyncio.ensure_future(service.prove(chain)) for _ in range(4)]
+                await asyncio.sleep(0.05)
+                self.assertEqual(service.pending, 2)
+                for task in tasks:
+                    task.cancel()
+                await asyncio.gather(*tasks, return_exceptions=True)
+                self.assertEqual(service.pending, 0)
+
+        asyncio.run(scenario())
+        print("✅ 异步推理服务测试通过")
+
+    def test_portfolio_runner(self):
+        """测试策略组合运行器"""
+        print("\n=== 测试策略组合 ===")
+
+        from portfolio import PortfolioRunner
+
+        configurations = [
+            {'name': 'fifo', 'selection': 'fifo', 'set_of_support': False, 'max_steps': 2000},
+            {'name': 'shortest-sos', 'selection': 'shortest', 'set_of_support': True, 'max_steps': 2000},
+        ]
+        clauses = ProblemBuilder.create_drug_dealer_optimized()
+        outcome = PortfolioRunner(configurations, processes=2).run(clauses)
+
+        self.assertTrue(outcome['result'])
+        self.assertIn(outcome['winner'], ('fifo', 'shortest-sos'))
+        self.assertEqual(set(outcome['results']), {'fifo', 'shortest-sos'})
+        print(f"✅ 策略组合测试通过，胜出配置: {outcome['winner']}")
+
+    def test_observers(self):
+        """测试推理核心不输出，事件发送给观察者"""
+        print("\n=== 测试事件观察者 ===")
+
+        import io
+        import contextlib
+        from events import MetricsObserver, HistoryRecorder
+
+        clauses = ProblemBuilder.create_drug_dealer_optimized()
+        for clause in clauses:
+            self.prover.add_clause(clause)
+
+        metrics = self.prover.add_observer(MetricsObserver())
+        self.prover.add_observer(HistoryRecorder(self.prover.history))
+
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            result = self.prover.two_pointer_resolution()
+
+        self.assertTrue(result)
+        self.assertEqual(output.getvalue(), "", "推理核心不应该输出")
+        counters = metrics.to_dict()
+        self.assertEqual(counters['resolvents'], self.prover.steps)
+        self.assertEqual(counters['proofs'], 1)
+        self.assertEqual(len(self.prover.history), self.prover.steps)
+        self.assertTrue(self.prover.history[-1]['is_empty'])
+
+        # 策略或预算提前停止时不报告为饱和
+        from events import ConsoleObserver, SearchFinished
+        for result, expected in ((ProofResult(ProofResult.SATURATED), "未产生新子句"),
+                                 (ProofResult(ProofResult.UNKNOWN, 'set_of_support'), "set_of_support"),
+                                 (ProofResult(ProofResult.UNKNOWN, 'cancelled'), "cancelled")):
+            output = io.StringIO()
+            with contextlib.redirect_stdout(output):
+                ConsoleObserver().notify(SearchFinished(result, 2000))
+            self.assertIn(expected, output.getvalue())
+        print("✅ 事件观察者测试通过")
+
+    def test_instrumentation(self):
+        """测试推理计数器和分阶段计时"""
+        print("\n=== 测试性能计数器 ===")
+
+        clauses = ProblemBuilder.create_drug_dealer_optimized()
+        for clause in clauses:
+            self.prover.add_clause(clause)
+        self.prover.instrument = True
+
+        self.prover.two_pointer_resolution()
+        stats = self.prover.get_statistics()
+
+        self.assertTrue(stats['empty_clause_found'])
+        self.assertGreater(stats['pairs_examined'], stats['pairs_pruned'])
+        self.assertEqual(stats['total_steps'], stats['clauses_retained'] + stats['discarded_duplicate'] + 1)
+        self.assertEqual(stats['phases']['unification']['calls'],
+                         stats['unifications_succeeded'] + stats['unifications_failed'])
+        print("✅ 性能计数器测试通过")
+
+    def test_startup_time(self):
+        """测试 prove() 入口和冷启动时不导入重量级模块（耗时预算由 python instrumentation.py 检查）"""
+        print("\n=== 测试冷启动 ===")
+
+        from instrumentation import measure_cold_start
+        from resolution import prove
+
+        result = prove("P(a)\n~P(x) | Q(x)\n~Q(a)", max_steps=100)
+        self.assertEqual(result.status, ProofResult.PROVED)
+
+        timing = measure_cold_start(runs=1)
+        self.assertEqual(timing['heavy_modules'], [])
+        print(f"冷启动额外开销 {timing['overhead'] * 1000:.1f}ms")
+        print("✅ 冷启动测试通过")
+
+    def test_clause_parser(self):
+        """测试子句文件解析与输出格式一致"""
+        print("\n=== 测试子句解析 ===")
+
+        from clause_parser import parse_clause, parse_clauses
+
+        for clause in ProblemBuilder.create_drug_dealer_optimized():
+            parsed = parse_clause(str(clause))
+            self.assertEqual(str(parsed), str(clause))
+            self.assertEqual(parsed, clause)
+
+        clauses = parse_clauses("P(f(x), a)  # 注释\n\ngoal: ~P(f(b), y) | Q")
+        self.assertEqual(len(clauses), 2)
+        self.assertTrue(clauses[0].literals[0].terms[0].args[0].is_variable)
+        self.assertFalse(clauses[0].literals[0].terms[1].is_variable)
+        self.assertEqual(clauses[1].source, 'goal')
+        self.assertTrue(clauses[1].literals[0].negated)
+        print("✅ 子句解析测试通过")
+
+    def test_batch_run(self):
+        """测试批量运行输出JSON结果"""
+        print("\n=== 测试批量运行 ===")
+
+        import io
+        import json
+        from batch import make_jobs, run_batch
+
+        output = io.StringIO()
+        jobs = make_jobs(['all'])
+        records = run_batch(jobs, {'budget': {'max_clauses': 1000}}, workers=2, output=output)
+
+        lines = [json.loads(line) for line in output.getvalue().splitlines()]
+        self.assertEqual(len(lines), len(get_all_problems()))
+        self.assertEqual({r['problem'] for r in records}, set(get_all_problems()))
+        self.assertTrue(all(r['proved'] for r in lines))
+        print("✅ 批量运行测试通过")
+
+    def test_experiment_step_sampling(self):
+        """测试实验记录器的步骤采样和紧凑记录"""
+        print("\n=== 测试实验步骤采样 ===")
+
+        from experiment_log import ExperimentLogger
+
+        logger = ExperimentLogger(verbose=False, step_sample=10, compact=True)
+        experiment = logger.run_problem_experiment('drug_dealer')
+
+        steps = experiment['resolution_steps']
+        self.assertTrue(steps[-1]['is_empty'])
+        self.assertTrue(all(step['step'] % 10 == 0 for step in steps[:-1]))
+        self.assertNotIn('clause1', steps[0])
+        self.assertLessEqual(len(steps), experiment['statistics']['total_steps'] // 10 + 1)
+        print("✅ 实验步骤采样测试通过")
+
     def test_performance_benchmark(self):
         """性能基准测试"""
         print("\n=== 性能基准测试 ===")
@@ -64,9 +64,34 @@ class Unifier:
         return False
 
     @staticmethod
-    def unify_literals(literal1, literal2):
+    def match(pattern, term, substitution=None):
+        """
+        单向匹配：只绑定 pattern 中的变量，使 pattern 在替换后等于 term
+        返回: 匹配成功返回 substitution dict，否则返回 None
+        """
+        if substitution is None:
+            substitution = {}
+
+        if pattern.is_variable:
+            bound = substitution.get(pattern.name)
+            if bound is None:
+                substitution[pattern.name] = term
+                return substitution
+            return substitution if bound == term else None
+
+        if term.is_variable or pattern.name != term.name or len(pattern.args) != len(term.args):
+            return None
+
+        for arg1, arg2 in zip(pattern.args, term.args):
+            if Unifier.match(arg1, arg2, substitution) is None:
+                return None
+        return substitution
+
+    @staticmethod
+    def unify_literals(literal1, literal2, sorts=None):
         """
         合一两个文字
+        参数: sorts 推断出的类型（sorts.SortSignature），给出时类型不相容的文字对不做合一
         返回: 如果可合一返回 substitution dict，否则返回 None
         """
         if literal1.predicate != literal2.predicate:
@@ -75,6 +100,9 @@ class Unifier:
         if len(literal1.terms) != len(literal2.terms):
             return None
 
+        if sorts is not None and not sorts.compatible(literal1, literal2):
+            return None
+
         substitution = {}
         for term1, term2 in zip(literal1.terms, literal2.terms):
             substitution = Unifier.unify(term1, term2, substitution)
@@ -85,7 +113,7 @@ class Unifier:
 
     @staticmethod
     def apply_substitution(term, substitution):
-        """应用替换到项上"""
+        """应用替换到项上（没有变化的项和子项直接返回原对象）"""
         if not substitution:
             return term
 
@@ -96,16 +124,37 @@ class Unifier:
         # 如果是函数，递归应用到参数
         if term.args:
             new_args = [Unifier.apply_substitution(arg, substitution) for arg in term.args]
+            if all(new is old for new, old in zip(new_args, term.args)):
+                return term
             return Term(term.name, term.is_variable, new_args)
 
         return term
 
     @staticmethod
     def apply_substitution_to_literal(literal, substitution):
-        """应用替换到文字上"""
+        """应用替换到文字上（没有变化时返回原文字）"""
+        if not substitution:
+            return literal
         new_terms = [Unifier.apply_substitution(term, substitution) for term in literal.terms]
+        if all(new is old for new, old in zip(new_terms, literal.terms)):
+            return literal
         return Literal(literal.predicate, new_terms, literal.negated)
 
+    @staticmethod
+    def rename_term(term, suffix):
+        """给项中的所有变量名加上后缀（用于把两个文字的变量分开）"""
+        if term.is_variable:
+            return Term(term.name + suffix, is_variable=True)
+        if term.args:
+            return Term(term.name, False, [Unifier.rename_term(arg, suffix) for arg in term.args])
+        return term
+
+    @staticmethod
+    def rename_literal(literal, suffix):
+        """给文字中的所有变量名加上后缀"""
+        return Literal(literal.predicate, [Unifier.rename_term(term, suffix) for term in literal.terms],
+                       literal.negated)
+
     @staticmethod
     def apply_substitution_to_clause(clause, substitution):
         """应用替换到子句上"""